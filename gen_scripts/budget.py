@@ -1,33 +1,28 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, Spacer
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
 from datetime import datetime
+from corpus_clock import now
+from corpus_runner import run_cli
+from doc_random import rng
+from manifest import annotate
+from pdf_buffer import new_pdf_buffer
+from style_registry import get_stylesheet, table_style
+from upload_queue import queue_upload
 
 # === Setup ===
 fake = Faker()
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 CATEGORY = "Financial_Documents"
 SUBTYPES = ["Operating Budget", "Financial Forecast", "Business Plan Financials"]
 
-# === Upload Function ===
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
-
 # === Document Generators ===
 def generate_operating_budget(style):
     rows = [["Department", "Budgeted Amount", "Actual Spend", "Variance"]]
     for _ in range(6):
-        budget = random.randint(10000, 100000)
-        actual = random.randint(int(budget * 0.8), int(budget * 1.2))
+        budget = rng.randint(10000, 100000)
+        actual = rng.randint(int(budget * 0.8), int(budget * 1.2))
         variance = actual - budget
         rows.append([
             fake.bs().title(),
@@ -38,9 +33,9 @@ def generate_operating_budget(style):
     return [
         Paragraph("Operating Budget Overview", style["Title"]),
         Spacer(1, 12),
-        Paragraph(f"Fiscal Year: {datetime.now().year}", style["Normal"]),
+        Paragraph(f"Fiscal Year: {now().year}", style["Normal"]),
         Spacer(1, 12),
-        Table(rows, colWidths=[180, 110, 110, 110], style=TableStyle([
+        Table(rows, colWidths=[180, 110, 110, 110], style=table_style([
             ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
             ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
             ('FONTSIZE', (0,0), (-1,-1), 9),
@@ -54,8 +49,8 @@ def generate_operating_budget(style):
 def generate_financial_forecast(style):
     rows = [["Month", "Revenue", "Expenses", "Net Profit"]]
     for month in range(1, 13):
-        revenue = random.randint(50000, 150000)
-        expenses = random.randint(30000, 130000)
+        revenue = rng.randint(50000, 150000)
+        expenses = rng.randint(30000, 130000)
         net = revenue - expenses
         rows.append([
             datetime(2025, month, 1).strftime('%B'),
@@ -66,7 +61,7 @@ def generate_financial_forecast(style):
     return [
         Paragraph("Financial Forecast - 12 Month Projection", style["Title"]),
         Spacer(1, 12),
-        Table(rows, colWidths=[120, 120, 120, 120], style=TableStyle([
+        Table(rows, colWidths=[120, 120, 120, 120], style=table_style([
             ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
             ('BACKGROUND', (0,0), (-1,0), colors.beige),
             ('FONTSIZE', (0,0), (-1,-1), 8),
@@ -78,16 +73,16 @@ def generate_financial_forecast(style):
 
 def generate_business_plan_financials(style):
     data = [
-        ["Initial Capital", f"${random.randint(100000, 500000):,.2f}"],
-        ["Projected Year 1 Revenue", f"${random.randint(200000, 800000):,.2f}"],
-        ["Projected Year 1 Net Profit", f"${random.randint(50000, 300000):,.2f}"],
-        ["Break-even Point", f"{random.randint(6, 18)} months"],
-        ["Cash Flow Reserve", f"${random.randint(20000, 100000):,.2f}"],
+        ["Initial Capital", f"${rng.randint(100000, 500000):,.2f}"],
+        ["Projected Year 1 Revenue", f"${rng.randint(200000, 800000):,.2f}"],
+        ["Projected Year 1 Net Profit", f"${rng.randint(50000, 300000):,.2f}"],
+        ["Break-even Point", f"{rng.randint(6, 18)} months"],
+        ["Cash Flow Reserve", f"${rng.randint(20000, 100000):,.2f}"],
     ]
     return [
         Paragraph("Business Plan - Key Financial Figures", style["Title"]),
         Spacer(1, 12),
-        Table(data, colWidths=[250, 250], style=TableStyle([
+        Table(data, colWidths=[250, 250], style=table_style([
             ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
             ('BACKGROUND', (0,0), (0,-1), colors.whitesmoke),
             ('FONTSIZE', (0,0), (-1,-1), 9),
@@ -95,7 +90,7 @@ def generate_business_plan_financials(style):
         ])),
         Spacer(1, 12),
         Paragraph("Prepared by: " + fake.name(), style["Normal"]),
-        Paragraph("Date: " + datetime.now().strftime("%Y-%m-%d"), style["Normal"]),
+        Paragraph("Date: " + now().strftime("%Y-%m-%d"), style["Normal"]),
         Spacer(1, 12),
         Paragraph("Notes:", style["Heading2"]),
         Paragraph(fake.paragraph(nb_sentences=4), style["Normal"])
@@ -103,45 +98,44 @@ def generate_business_plan_financials(style):
 
 # === Main Document Builder ===
 def generate_budget_document_file(filename):
-    styles = getSampleStyleSheet()
-    subtype = random.choice(SUBTYPES)
+    styles = get_stylesheet()
+    subtype = rng.choice(SUBTYPES)
+    annotate(subtype=subtype)
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4)
-        elements = []
+    pdf = new_pdf_buffer()
+    doc = SimpleDocTemplate(pdf, pagesize=A4)
+    elements = []
 
-        # Metadata Table
-        meta = [
-            ["Document Type", subtype],
-            ["Prepared For", fake.company()],
-            ["Prepared By", fake.name()],
-            ["Date", datetime.now().strftime("%Y-%m-%d")],
-        ]
-        meta_table = Table(meta, colWidths=[150, 330])
-        meta_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-        ]))
-        elements.append(meta_table)
-        elements.append(Spacer(1, 16))
+    # Metadata Table
+    meta = [
+        ["Document Type", subtype],
+        ["Prepared For", fake.company()],
+        ["Prepared By", fake.name()],
+        ["Date", now().strftime("%Y-%m-%d")],
+    ]
+    meta_table = Table(meta, colWidths=[150, 330])
+    meta_table.setStyle(table_style([
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
+    ]))
+    elements.append(meta_table)
+    elements.append(Spacer(1, 16))
 
-        # Subtype Content
-        if subtype == "Operating Budget":
-            elements += generate_operating_budget(styles)
-        elif subtype == "Financial Forecast":
-            elements += generate_financial_forecast(styles)
-        elif subtype == "Business Plan Financials":
-            elements += generate_business_plan_financials(styles)
+    # Subtype Content
+    if subtype == "Operating Budget":
+        elements += generate_operating_budget(styles)
+    elif subtype == "Financial Forecast":
+        elements += generate_financial_forecast(styles)
+    elif subtype == "Business Plan Financials":
+        elements += generate_business_plan_financials(styles)
 
-        doc.build(elements)
+    doc.build(elements)
 
-        upload_to_gcs(
-            BUCKET_NAME,
-            tmp.name,
-            f"{CATEGORY}/Budget_Planning_Documents/{subtype.replace(' ', '_')}/{filename}"
-        )
+    queue_upload(
+        pdf,
+        f"{CATEGORY}/Budget_Planning_Documents/{subtype.replace(' ', '_')}/{filename}"
+    )
 
-# === Run Batch Generation ===
+# === Generate and upload 300 documents ===
 if __name__ == "__main__":
-    for i in range(300):
-        generate_budget_document_file(f"budget_doc_{i+1}.pdf")
+    run_cli([(generate_budget_document_file, f"budget_doc_{i+1}.pdf") for i in range(300)], STORAGE_URI)
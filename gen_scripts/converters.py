@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Converters
+Extension-keyed registry of document-to-text converters for the organizer.
+Each converter reads a seekable binary source stream and writes its output
+to a binary target stream, so the organizer can pipe a stored object
+through it without temp files. A converter declares whether it is
+CPU-bound, which the organizer uses to run it on its process pool rather
+than on an I/O thread.
+
+    .csv   columns right-justified like DataFrame.to_string  (CPU, chunked)
+    .xlsx  every sheet, the same layout; needs openpyxl      (CPU)
+    .docx  paragraph text from word/document.xml            (I/O)
+    .json  pretty-printed                                    (I/O)
+    .html  visible text, one block element per line          (I/O)
+
+The I/O-bound ones are cheap next to their download and upload, so they
+run on the organizer's I/O threads rather than paying for a trip to the
+process pool. Rendering to PDF is always CPU-bound.
+
+A converter whose work splits into independent chunks (CSV rows) also
+declares a Chunked plan, so large files can be converted a chunk at a
+time on the pool while the source reader and target writer stay on the
+organizer's I/O thread (convert_in_chunks).
+
+Any text converter can also render its output to PDF (to_pdf=True).
+Optional libraries are imported only by the converters that need them.
+"""
+
+import codecs
+import io
+from collections import deque
+import json
+import zipfile
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Optional
+from xml.etree import ElementTree
+
+CSV_CHUNK_ROWS = 50_000
+CHUNK_BYTES = 4 * 1024 * 1024
+CHUNK_WINDOW = 4
+READ_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Chunked:
+    """
+    A two-pass conversion split into chunks. split(source) yields the
+    source's chunks; measure(chunk) runs on every chunk and merge() folds
+    the results into a layout; header(layout) is written first, then
+    render(chunk, layout) for every chunk. measure and render are module
+    functions, so they can run in another process.
+    """
+    split: Callable
+    measure: Callable
+    merge: Callable
+    header: Callable
+    render: Callable
+
+
+@dataclass(frozen=True)
+class Converter:
+    extension: str
+    convert: Callable
+    cpu_bound: bool
+    target_extension: str = ".txt"
+    content_type: str = "text/plain"
+    chunked: Optional[Chunked] = None
+
+
+_registry = {}
+
+
+def register_converter(extension, convert, cpu_bound, target_extension=".txt", content_type="text/plain",
+                       chunked=None):
+    """
+    Register convert(source, out) for files ending in extension, with an
+    optional Chunked plan producing the same output. Register before the
+    organizer starts its process pool; the pool's workers are handed the
+    registry (install_registry) when they start.
+    """
+    _registry[extension.lower()] = Converter(extension.lower(), convert, cpu_bound,
+                                             target_extension, content_type, chunked)
+
+
+def registry():
+    return dict(_registry)
+
+
+def install_registry(converters):
+    """
+    Process-pool initializer: adopt the parent's registry, including
+    converters registered after import.
+    """
+    _registry.update(converters)
+
+
+def get_converter(filename, to_pdf=False):
+    """
+    The converter for filename's extension (or a bare extension such as
+    ".csv"), or None. With to_pdf, a text converter is wrapped to render
+    its output as a PDF.
+    """
+    converter = _registry.get((Path(filename).suffix or filename).lower())
+    if converter is None or not to_pdf or converter.target_extension == ".pdf":
+        return converter
+    return Converter(converter.extension, _PdfRendering(converter.convert), True, ".pdf", "application/pdf")
+
+
+def convert_bytes(extension, to_pdf, data):
+    """
+    Convert a whole source held in memory; runs in the organizer's
+    conversion processes.
+    """
+    out = io.BytesIO()
+    get_converter(extension, to_pdf).convert(io.BytesIO(data), out)
+    return out.getvalue()
+
+
+def convert_object(storage, extension, to_pdf, source_name, output_path):
+    """
+    Stream a stored object through its converter into output_path on the
+    calling thread.
+    """
+    converter = get_converter(extension, to_pdf)
+    with storage.open_read(source_name) as source, \
+            storage.open_write(output_path, content_type=converter.content_type) as out:
+        converter.convert(source, out)
+
+
+def convert_in_chunks(chunked, source, out, submit, window=CHUNK_WINDOW):
+    """
+    Convert source into out with a Chunked plan. Reading and writing stay
+    on the calling thread; submit(fn, *args) runs each chunk's measure and
+    render (e.g. on a process pool) and returns a future. Up to window
+    chunks are in flight at a time, and outputs are written in order.
+    """
+    layout = None
+    for measured in _pipelined(submit, window, chunked.measure, chunked.split(source)):
+        layout = chunked.merge(layout, measured)
+    out.write(chunked.header(layout))
+    for rendered in _pipelined(submit, window, chunked.render, chunked.split(source), layout):
+        out.write(rendered)
+
+
+def _pipelined(submit, window, fn, chunks, *args):
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(submit(fn, chunk, *args))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class _Unflushed(io.RawIOBase):
+    """
+    Passes writes through to out but never flushes it: some targets (a
+    GCS BlobWriter, for one) refuse flush() until they are closed.
+    """
+    def __init__(self, out):
+        super().__init__()
+        self.out = out
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.out.write(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def _text_writer(out):
+    return io.TextIOWrapper(_Unflushed(out), encoding='utf-8', newline='', write_through=True)
+
+
+def _finish(writer):
+    writer.flush()
+    writer.detach()
+
+
+# === CSV and spreadsheets ===
+def _csv_chunks(source):
+    import pandas as pd
+    source.seek(0)
+    return pd.read_csv(source, dtype=str, keep_default_na=False, encoding='utf-8', chunksize=CSV_CHUNK_ROWS)
+
+
+def _write_table(chunks, text):
+    """
+    Lay out a table like DataFrame.to_string(index=False): every column
+    right-justified to its widest cell, one space apart. chunks() yields
+    the rows as string DataFrames and is called once to measure and once
+    to write.
+    """
+    columns, widths = None, None
+    for chunk in chunks():
+        if columns is None:
+            columns = [str(column) for column in chunk.columns]
+            widths = [len(column) for column in columns]
+        for i, column in enumerate(chunk.columns):
+            widths[i] = max(widths[i], _widest(chunk[column]))
+    text.write(" ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for chunk in chunks():
+        _write_rows(chunk, widths, text)
+
+
+def _cell_text(column):
+    """
+    A column's cells as they print: line breaks inside a quoted cell are
+    escaped, as DataFrame.to_string does, so every record stays on one line.
+    """
+    return column.str.replace("\n", "\\n", regex=False).str.replace("\r", "\\r", regex=False)
+
+
+def _widest(column):
+    return int(_cell_text(column).str.len().max()) if len(column) else 0
+
+
+def _write_rows(chunk, widths, text):
+    cells = [_cell_text(chunk[column]).str.rjust(width) for column, width in zip(chunk.columns, widths)]
+    lines = cells[0].str.cat(cells[1:], sep=" ") if len(cells) > 1 else cells[0]
+    if len(lines):
+        text.write("\n" + "\n".join(lines))
+
+
+def csv_to_text(source, out):
+    """
+    Two chunked passes over the CSV, so memory stays bounded whatever its
+    size. Cell values are written as they appear in the file, with line
+    breaks escaped.
+    """
+    text = _text_writer(out)
+    _write_table(lambda: _csv_chunks(source), text)
+    _finish(text)
+
+
+def _record_end(data):
+    """
+    Offset just past the last newline in data that ends a CSV record (one
+    outside quotes, given data starts at a record), or 0 if there is none.
+    """
+    end = len(data)
+    quotes = data.count(b'"')
+    while True:
+        newline = data.rfind(b"\n", 0, end)
+        if newline < 0:
+            return 0
+        quotes -= data.count(b'"', newline, end)
+        if quotes % 2 == 0:
+            return newline + 1
+        end = newline
+
+
+def split_csv(source, size=None):
+    """
+    The CSV's data records in blocks of about size bytes (CHUNK_BYTES), cut
+    only between records. Each block is prefixed with the header record,
+    so it parses on its own exactly as it would as part of the whole file.
+    """
+    size = size or CHUNK_BYTES
+    source.seek(0)
+    header = source.readline()
+    while header.count(b'"') % 2:
+        line = source.readline()
+        if not line:
+            break
+        header += line
+    buffer, blocks = b"", 0
+    while True:
+        data = source.read(size)
+        buffer += data
+        end = _record_end(buffer) if data else len(buffer)
+        if end:
+            yield header + buffer[:end]
+            buffer, blocks = buffer[end:], blocks + 1
+        if not data:
+            if not blocks:
+                yield header
+            return
+
+
+def measure_csv(chunk):
+    """
+    Column names and the width of each column's widest cell in one chunk.
+    """
+    import pandas as pd
+    df = pd.read_csv(io.BytesIO(chunk), dtype=str, keep_default_na=False, encoding='utf-8')
+    columns = [str(column) for column in df.columns]
+    widths = [max(len(name), _widest(df[column])) for name, column in zip(columns, df.columns)]
+    return columns, widths
+
+
+def merge_widths(layout, measured):
+    if layout is None:
+        return measured
+    columns, widths = layout
+    return columns, [max(a, b) for a, b in zip(widths, measured[1])]
+
+
+def table_header(layout):
+    columns, widths = layout
+    return " ".join(column.rjust(width) for column, width in zip(columns, widths)).encode('utf-8')
+
+
+def render_csv(chunk, layout):
+    """
+    One chunk's rows laid out to the merged widths, each on a new line.
+    """
+    import pandas as pd
+    df = pd.read_csv(io.BytesIO(chunk), dtype=str, keep_default_na=False, encoding='utf-8')
+    text = io.StringIO()
+    _write_rows(df, layout[1], text)
+    return text.getvalue().encode('utf-8')
+
+
+CSV_CHUNKS = Chunked(split_csv, measure_csv, merge_widths, table_header, render_csv)
+
+
+def xlsx_to_text(source, out):
+    import pandas as pd
+    sheets = pd.read_excel(source, sheet_name=None, dtype=str, keep_default_na=False)
+    text = _text_writer(out)
+    for i, (name, df) in enumerate(sheets.items()):
+        text.write(("" if i == 0 else "\n\n") + f"== {name} ==\n")
+        _write_table(lambda: [df], text)
+    _finish(text)
+
+
+# === Word documents ===
+_WORD = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def docx_to_text(source, out):
+    """
+    Paragraph text straight from word/document.xml, so python-docx is not
+    needed; tabs and line breaks inside a paragraph are kept.
+    """
+    text = _text_writer(out)
+    with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as document:
+        first = True
+        for _, element in ElementTree.iterparse(document):
+            if element.tag != f"{_WORD}p":
+                continue
+            parts = []
+            for node in element.iter():
+                if node.tag == f"{_WORD}t":
+                    parts.append(node.text or "")
+                elif node.tag == f"{_WORD}tab":
+                    parts.append("\t")
+                elif node.tag in (f"{_WORD}br", f"{_WORD}cr"):
+                    parts.append("\n")
+            text.write(("" if first else "\n") + "".join(parts))
+            first = False
+            element.clear()
+    _finish(text)
+
+
+# === JSON and HTML ===
+def json_to_text(source, out):
+    reader = io.TextIOWrapper(source, encoding='utf-8')
+    data = json.load(reader)
+    reader.detach()
+    out.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+
+
+class _HTMLText(HTMLParser):
+    BLOCKS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+              "table", "ul", "ol", "section", "article", "header", "footer", "title"}
+    HIDDEN = {"script", "style", "head"}
+
+    def __init__(self, text):
+        super().__init__(convert_charrefs=True)
+        self.text = text
+        self.hidden = 0
+        self.line = []
+        self.first = True
+
+    def _break(self):
+        line = " ".join("".join(self.line).split())
+        if line:
+            self.text.write(("" if self.first else "\n") + line)
+            self.first = False
+        self.line = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.HIDDEN:
+            self.hidden += 1
+        elif tag in self.BLOCKS:
+            self._break()
+
+    def handle_endtag(self, tag):
+        if tag in self.HIDDEN:
+            self.hidden = max(0, self.hidden - 1)
+        elif tag in self.BLOCKS:
+            self._break()
+
+    def handle_data(self, data):
+        if not self.hidden:
+            self.line.append(data)
+
+    def close(self):
+        super().close()
+        self._break()
+
+
+def html_to_text(source, out):
+    """
+    Visible text, one line per block element, parsed incrementally as the
+    source is read.
+    """
+    text = _text_writer(out)
+    parser = _HTMLText(text)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        data = source.read(READ_BYTES)
+        if not data:
+            break
+        parser.feed(decoder.decode(data))
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    _finish(text)
+
+
+# === Text to PDF ===
+class _PdfRendering:
+    """
+    Wraps a text converter to set its output in a monospaced PDF.
+    """
+    def __init__(self, convert):
+        self.convert = convert
+
+    def __call__(self, source, out):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import Preformatted, SimpleDocTemplate
+        from style_registry import get_stylesheet
+
+        text = io.BytesIO()
+        self.convert(source, text)
+        doc = SimpleDocTemplate(out, pagesize=A4)
+        doc.build([Preformatted(text.getvalue().decode('utf-8'), get_stylesheet()["Code"])])
+
+
+register_converter(".csv", csv_to_text, cpu_bound=True, chunked=CSV_CHUNKS)
+register_converter(".xlsx", xlsx_to_text, cpu_bound=True)
+register_converter(".docx", docx_to_text, cpu_bound=False)
+register_converter(".json", json_to_text, cpu_bound=False)
+register_converter(".html", html_to_text, cpu_bound=False)
+register_converter(".htm", html_to_text, cpu_bound=False)
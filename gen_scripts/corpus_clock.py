@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Corpus Clock
+The corpus reference datetime: the moment a corpus is generated "as of".
+Generators stamp report and issue dates with now() and today() from here
+instead of the wall clock, and Faker's relative dates (date_this_year,
+future_date, date_of_birth, ...) are anchored to the same moment, so a
+corpus seed rebuilds the same documents on any day.
+
+The corpus runner picks the reference when a run starts, records it in
+every manifest record next to the corpus seed, and adopts a manifest's or
+checkpoint's reference on --repair and resume. Outside a corpus run the
+clock is unset and everything falls back to the wall clock.
+"""
+
+from datetime import date, datetime
+
+import faker.providers.date_time as faker_dates
+
+_reference = None
+
+
+class _Anchored:
+    """
+    Stands in for datetime or date inside Faker's date provider:
+    construction, isinstance() and other class attributes go to the real
+    class, but now() and today() read the reference datetime.
+    """
+    def __init__(self, cls):
+        self._cls = cls
+
+    def __call__(self, *args, **kwargs):
+        return self._cls(*args, **kwargs)
+
+    def __instancecheck__(self, obj):
+        return isinstance(obj, self._cls)
+
+    def __getattr__(self, name):
+        return getattr(self._cls, name)
+
+    def now(self, tz=None):
+        if _reference is None:
+            return self._cls.now(tz)
+        return _reference if tz is None else _reference.replace(tzinfo=tz)
+
+    def today(self):
+        return today() if self._cls is date else now()
+
+
+def new_reference():
+    """
+    A reference for a fresh corpus: the current wall-clock second.
+    """
+    return datetime.now().replace(microsecond=0)
+
+
+def parse_reference(value):
+    """
+    A reference datetime from a datetime or an ISO 8601 string.
+    """
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def configure_clock(reference=None):
+    """
+    Set the reference datetime (a datetime or ISO string; None for the
+    wall clock) and anchor Faker's relative dates to it.
+    """
+    global _reference
+    _reference = parse_reference(reference)
+    if not isinstance(faker_dates.datetime, _Anchored):
+        faker_dates.datetime = _Anchored(datetime)
+        faker_dates.dtdate = _Anchored(date)
+
+
+def now():
+    return datetime.now() if _reference is None else _reference
+
+
+def today():
+    return now().date()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Corpus Runner
+Fans document builds out over a process pool so a generator script uses
+every core instead of one. Each document is seeded from the corpus seed, its
+document type and its index, and PDFs are rendered in reportlab's invariant
+mode, so a parallel run produces the same documents as a serial one.
+Dates are stamped from a corpus reference datetime instead of the wall
+clock (see corpus_clock), so the same seed also rebuilds them on a later
+day.
+
+With --manifest, every stored document is recorded (seed, reference
+datetime, subtype, key, size, MD5); --repair then rebuilds only the
+documents whose stored copy is missing or no longer matches the manifest.
+--checkpoint keeps the same records in a local state file as chunks
+finish, so a run that dies part way resumes with only the remaining
+documents.
+
+Workers never wait for their uploads between chunks: each chunk's uploads
+are tracked as one group, and its result (count, style stats and
+manifest records) is posted back to the runner when the last of them
+lands, while the worker is already rendering the next chunk.
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from faker import Faker
+from reportlab import rl_config
+
+from corpus_clock import configure_clock, new_reference, parse_reference
+from doc_random import seed_rng
+from manifest import (append_records, begin_document, end_document, is_intact, read_manifest,
+                      stored_objects, write_manifest)
+from pdf_buffer import configure_pdf_buffers
+from storage_backends import configure_storage, get_storage
+from style_registry import style_stats
+from upload_queue import MAX_PENDING, UPLOAD_THREADS, UploadError, configure_uploads, open_group
+from value_pools import POOL_SEED, POOL_SIZE, configure_pools
+
+DEFAULT_CHUNKSIZE = 8
+POLL_SECONDS = 0.5
+
+_results = None  # where finished chunks are posted, set per process
+
+
+def doc_type(build):
+    return build.__name__
+
+
+def derive_seed(corpus_seed, doc_type, index):
+    return zlib.crc32(f"{corpus_seed}:{doc_type}:{index}".encode("utf-8"))
+
+
+def seed_document(seed):
+    """
+    Seed every random source the generators draw from: doc_random's rng
+    and the shared Faker generator behind each module-level fake. Neither
+    is the global random module, which other threads draw from too.
+    """
+    seed_rng(seed)
+    Faker.seed(seed)
+
+
+def _init_worker(results, storage_uri, upload_threads, max_pending, spill_bytes, pool_size, pool_seed,
+                 reference):
+    global _results
+    _results = results
+    configure_clock(reference)
+    configure_storage(storage_uri)
+    configure_uploads(upload_threads, max_pending)
+    configure_pdf_buffers(spill_bytes)
+    configure_pools(pool_size, pool_seed)
+    # Fixed creation dates and document IDs, so equal seeds give equal bytes
+    rl_config.invariant = 1
+
+
+def _build_chunk(chunk):
+    """
+    Render a chunk and return without waiting for its uploads; the chunk's
+    result is posted to _results once they have all landed.
+    """
+    before = style_stats()
+    styles = Counter()
+
+    def posted(records, failures):
+        _results.put((len(chunk), styles, records, [key for key, _ in failures]))
+
+    group = open_group(posted)
+    for document, build in chunk:
+        seed_document(document["seed"])
+        begin_document(**document)
+        try:
+            build(document["filename"])
+        finally:
+            end_document()
+    after = style_stats()
+    styles.update({key: after[key] - before[key] for key in after})
+    group.close()
+
+
+def _completed(records, tasks):
+    """
+    Indices of documents whose records match this job list and whose
+    stored objects are all still intact, checked against one listing.
+    """
+    stored = stored_objects(get_storage(), (record["key"] for record in records))
+    types = {task["index"]: task["doc_type"] for task, _ in tasks}
+    done, damaged = set(), set()
+    for record in records:
+        intact = (types.get(record["index"]) == record["doc_type"]
+                  and is_intact(record, stored.get(record["key"])))
+        (done if intact else damaged).add(record["index"])
+    return done - damaged
+
+
+def run_corpus(jobs, storage_uri, workers=None, chunksize=DEFAULT_CHUNKSIZE, seed=None,
+               upload_threads=UPLOAD_THREADS, max_pending=MAX_PENDING, spill_bytes=None,
+               pool_size=POOL_SIZE, pool_seed=POOL_SEED, manifest=None, repair=False, checkpoint=None,
+               reference=None):
+    """
+    Build every (build_fn, filename) job into the storage backend at
+    storage_uri, fanning contiguous chunks of jobs out over a
+    ProcessPoolExecutor. workers=1 builds in-process. A chunk only counts
+    as built once all of its uploads have landed.
+
+    If manifest is a path, a record for every stored document is written
+    there. reference is the corpus reference datetime (ISO string; default
+    now) that generators stamp dates from. With repair=True the corpus
+    seed and reference are taken from that manifest, and only documents
+    that are missing or damaged in storage are rebuilt. checkpoint is a
+    local state file appended after every chunk; documents it records
+    that are still intact in storage are skipped.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and storage_uri.startswith("memory://"):
+        # Each worker process would fill its own store, not this one
+        print("memory:// storage lives in this process; building with 1 worker")
+        workers = 1
+    if reference is not None:
+        reference = parse_reference(reference).isoformat()
+    records = read_manifest(manifest) if manifest and repair else []
+    if checkpoint:
+        records = list({(r["index"], r["key"]): r for r in records + read_manifest(checkpoint)}.values())
+    if records:
+        seeds = {record["corpus_seed"] for record in records}
+        if len(seeds) != 1 or seed not in (None, *seeds):
+            source = manifest if repair else checkpoint
+            raise ValueError(f"{source} was built from corpus seed(s) {sorted(seeds)}, not {seed}")
+        seed = seeds.pop()
+        references = {record["reference_time"] for record in records if "reference_time" in record}
+        if len(references) > 1 or (references and reference not in (None, *references)):
+            source = manifest if repair else checkpoint
+            raise ValueError(f"{source} was built as of {sorted(references)}, not {reference}")
+        if references:
+            reference = references.pop()
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+    if reference is None:
+        reference = new_reference().isoformat()
+    results = queue.Queue() if workers == 1 else multiprocessing.Queue()
+    settings = (results, storage_uri, upload_threads, max_pending, spill_bytes, pool_size, pool_seed,
+                reference)
+    chunksize = max(1, chunksize)
+
+    tasks = [
+        ({"corpus_seed": seed, "reference_time": reference, "doc_type": doc_type(build), "index": i,
+          "filename": filename, "seed": derive_seed(seed, doc_type(build), i)}, build)
+        for i, (build, filename) in enumerate(jobs)
+    ]
+    if records:
+        _init_worker(*settings)
+        done = _completed(records, tasks)
+        records = [record for record in records if record["index"] in done]
+        tasks = [task for task in tasks if task[0]["index"] not in done]
+        print(f"⏭ Skipping {len(done)} of {len(jobs)} documents already stored intact")
+    chunks = [tasks[i:i + chunksize] for i in range(0, len(tasks), chunksize)]
+    print(f"🌱 Corpus seed {seed} as of {reference}: {len(tasks)} documents in {len(chunks)} chunks "
+          f"on {workers} worker(s)")
+
+    built = received = 0
+    styles = Counter()
+    futures = []
+    pool = None
+
+    def collect(result):
+        nonlocal built, received
+        done, style_counts, chunk_records, failed = result
+        received += 1
+        built += done
+        styles.update(style_counts)
+        records.extend(chunk_records)
+        if checkpoint:
+            append_records(checkpoint, chunk_records)
+        if failed:
+            raise UploadError(f"{len(failed)} upload(s) failed: {', '.join(failed)}")
+        print(f"📄 Built {built}/{len(tasks)}")
+
+    try:
+        if workers == 1:
+            _init_worker(*settings)
+            for chunk in chunks:
+                _build_chunk(chunk)
+                # Record chunks whose uploads landed while this one rendered
+                while not results.empty():
+                    collect(results.get())
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=settings)
+            futures = [pool.submit(_build_chunk, chunk) for chunk in chunks]
+        while received < len(chunks):
+            collect(_next_result(results, futures))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if manifest:
+            write_manifest(manifest, records)
+    print(f"🎨 Style cache: {styles['hits']} hits, {styles['misses']} misses, "
+          f"{styles['reused']} reused from compiled plans")
+    return built
+
+
+def _next_result(results, futures):
+    """
+    The next chunk whose uploads have all landed, in completion order.
+    Raises a worker's rendering error instead of waiting on a chunk that
+    will never be posted.
+    """
+    while True:
+        try:
+            return results.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            for future in futures:
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+
+
+def parse_args(storage_uri, argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic document corpus")
+    parser.add_argument("--storage", default=storage_uri,
+                        help=f"gs://bucket, file:///dir, memory:// or null:// (default: {storage_uri})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per core, 1 = serial)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="documents handed to a worker at a time")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="corpus seed; the same seed rebuilds the same documents")
+    parser.add_argument("--reference", type=parse_reference, default=None, metavar="DATETIME",
+                        help="ISO datetime the corpus is dated as of (default: now; recorded in --manifest)")
+    parser.add_argument("--upload-threads", type=int, default=UPLOAD_THREADS,
+                        help="concurrent uploads per worker process")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="rendered documents allowed to wait for upload per worker")
+    parser.add_argument("--spill-bytes", type=int, default=None,
+                        help="render in memory, spilling PDFs larger than this to a temp file")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE,
+                        help="pre-generated Faker values per provider for batched table rows")
+    parser.add_argument("--pool-seed", type=int, default=POOL_SEED,
+                        help="seed for the value pools, shared by every worker")
+    parser.add_argument("--manifest", default=None,
+                        help="JSONL file recording seed, subtype, key, size and MD5 of every document")
+    parser.add_argument("--repair", action="store_true",
+                        help="rebuild only documents missing from storage or not matching --manifest")
+    parser.add_argument("--checkpoint", default=None,
+                        help="local state file; rerunning with it skips documents already stored")
+    args = parser.parse_args(argv)
+    if args.repair and not args.manifest:
+        parser.error("--repair needs --manifest")
+    return args
+
+
+def run_cli(jobs, storage_uri, argv=None):
+    args = parse_args(storage_uri, argv)
+    return run_corpus(jobs, args.storage, workers=args.workers, chunksize=args.chunksize, seed=args.seed,
+                      upload_threads=args.upload_threads, max_pending=args.max_pending,
+                      spill_bytes=args.spill_bytes, pool_size=args.pool_size, pool_seed=args.pool_seed,
+                      manifest=args.manifest, repair=args.repair, checkpoint=args.checkpoint,
+                      reference=args.reference)
@@ -1,100 +1,76 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
-import os
+from corpus_runner import run_cli
+from doc_random import rng
+from doc_spec import compile_spec
+from value_pools import get_pools
 
 fake = Faker()
 
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 GCS_PATH = "Logistics Document Inventory (High‑Volume, High‑Velocity)/Warehouse & Inventory/Cycle‑Count & Stock‑take Records"
 
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
+CATEGORIES = ["Electronics", "Food & Beverage", "Stationery", "Hardware", "Apparel"]
 
-def generate_cycle_count_record(filename):
-    styles = getSampleStyleSheet()
-    wrap_style = ParagraphStyle("wrap", fontSize=8, leading=10)
-    
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-        elements = []
-
-        elements.append(Paragraph("Cycle‑Count & Stock‑take Record", styles["Title"]))
-        elements.append(Spacer(1, 10))
-
-        # Metadata
-        metadata = [
-            ["Stock-take ID", f"ST-{fake.random_int(10000,99999)}"],
-            ["Warehouse", f"{fake.company()} Regional DC"],
-            ["Supervisor", fake.name()],
-            ["Date of Count", fake.date_this_year().strftime("%Y-%m-%d")],
-            ["Count Type", random.choice(["Cycle Count", "Full Inventory", "Spot Check"])],
-            ["Shift", random.choice(["Morning", "Afternoon", "Night"])],
-        ]
-        table_meta = Table(metadata, colWidths=[130, 350])
-        table_meta.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-            ('VALIGN', (0,0), (-1,-1), 'TOP')
-        ]))
-        elements.append(table_meta)
-        elements.append(Spacer(1, 12))
+def count_metadata():
+    return [
+        ["Stock-take ID", f"ST-{fake.random_int(10000,99999)}"],
+        ["Warehouse", f"{fake.company()} Regional DC"],
+        ["Supervisor", fake.name()],
+        ["Date of Count", fake.date_this_year().strftime("%Y-%m-%d")],
+        ["Count Type", rng.choice(["Cycle Count", "Full Inventory", "Spot Check"])],
+        ["Shift", rng.choice(["Morning", "Afternoon", "Night"])],
+    ]
 
-        # Inventory Table
-        data = [[
-            "Category", "Item Code", "Item Description",
-            "System Qty", "Counted Qty", "Variance", "Location", "Remarks"
-        ]]
+def count_items(n):
+    batch = get_pools().batch(n)
+    categories = batch.choice(CATEGORIES)
+    item_codes = batch.integers(10000, 99999).tolist()
+    words = batch.draw("word")
+    color_names = batch.draw("color_name")
+    system_qtys = batch.integers(10, 200)
+    variances = batch.integers(-10, 10)
+    counted_qtys = (system_qtys + variances).tolist()
+    aisles = batch.integers(1, 10).tolist()
+    bins = batch.integers(100, 999).tolist()
 
-        categories = ["Electronics", "Food & Beverage", "Stationery", "Hardware", "Apparel"]
-        for _ in range(random.randint(20, 35)):
-            category = random.choice(categories)
-            item_code = f"SKU-{fake.random_int(10000,99999)}"
-            description = Paragraph(f"{fake.word().capitalize()} - {fake.color_name()}", wrap_style)
-            system_qty = random.randint(10, 200)
-            counted_qty = system_qty + random.randint(-10, 10)
-            variance = counted_qty - system_qty
-            location = f"Aisle {random.randint(1, 10)} - Bin {random.randint(100, 999)}"
-            remark_text = "OK" if variance == 0 else ("Over" if variance > 0 else "Short")
-            remarks = Paragraph(remark_text, wrap_style)
-            data.append([
-                category, item_code, description,
-                system_qty, counted_qty, variance,
-                location, remarks
-            ])
+    rows = []
+    for i, variance in enumerate(variances.tolist()):
+        remarks = "OK" if variance == 0 else ("Over" if variance > 0 else "Short")
+        rows.append([
+            categories[i], f"SKU-{item_codes[i]}", f"{words[i].capitalize()} - {color_names[i]}",
+            counted_qtys[i] - variance, counted_qtys[i], variance,
+            f"Aisle {aisles[i]} - Bin {bins[i]}", remarks
+        ])
+    return rows
 
-        inventory_table = Table(data, colWidths=[60, 60, 110, 50, 50, 50, 75, 65])
-        inventory_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
-            ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('FONTSIZE', (0,0), (-1,-1), 8),
-            ('ALIGN', (3,1), (-3,-1), 'CENTER')
-        ]))
-        elements.append(inventory_table)
-        elements.append(Spacer(1, 18))
+CYCLE_COUNT_SPEC = {
+    "destination": f"{GCS_PATH}/{{filename}}",
+    "margins": 30,
+    "sections": [
+        {"kind": "title", "text": "Cycle‑Count & Stock‑take Record"},
+        {"kind": "spacer", "height": 10},
+        {"kind": "fields", "rows": count_metadata, "widths": [130, 350], "valign": "TOP"},
+        {"kind": "spacer", "height": 12},
+        {"kind": "table", "batch": count_items, "count": [20, 35], "wrap": [2, 7],
+         "grid": 0.4, "valign": "TOP", "font_size": 8,
+         "style": [('ALIGN', (3,1), (-3,-1), 'CENTER')],
+         "columns": ["Category", "Item Code", "Item Description",
+                     "System Qty", "Counted Qty", "Variance", "Location", "Remarks"],
+         "widths": [60, 60, 110, 50, 50, 50, 75, 65]},
+        {"kind": "spacer", "height": 18},
+        {"kind": "paragraph", "text": "Verified by: ____________________________"},
+        {"kind": "spacer", "height": 6},
+        {"kind": "paragraph", "text": "Comments:"},
+        {"kind": "spacer", "height": 12},
+        {"kind": "paragraph", "generate": lambda: fake.paragraph(nb_sentences=3)},
+    ],
+}
 
-        # Footer/Notes
-        elements.append(Paragraph("Verified by: ____________________________", styles["Normal"]))
-        elements.append(Spacer(1, 6))
-        elements.append(Paragraph("Comments:", styles["Normal"]))
-        elements.append(Spacer(1, 12))
-        elements.append(Paragraph(fake.paragraph(nb_sentences=3), styles["Normal"]))
+CYCLE_COUNT_PLAN = compile_spec(CYCLE_COUNT_SPEC)
 
-        doc.build(elements)
-
-        upload_to_gcs(BUCKET_NAME, tmp.name, f"{GCS_PATH}/{filename}")
+def generate_cycle_count_record(filename):
+    CYCLE_COUNT_PLAN.build(filename)
 
-# === Generate and upload 150 records ===
+# === Generate and upload 300 documents ===
 if __name__ == "__main__":
-    for i in range(300):
-        generate_cycle_count_record(f"cycle_count_record_{i+1}.pdf")
+    run_cli([(generate_cycle_count_record, f"cycle_count_record_{i+1}.pdf") for i in range(300)], STORAGE_URI)
@@ -1,86 +1,62 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
-from datetime import datetime
+from corpus_clock import now
+from corpus_runner import run_cli
+from doc_random import rng
+from doc_spec import compile_spec
+from value_pools import get_pools
 
 fake = Faker()
 
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 GCS_PATH = "Logistics Document Inventory (High-Volume, High-Velocity)/Warehouse & Inventory/Non-Conformance or Damage Reports"
 
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
+ISSUES = ["Physical Damage", "Quantity Mismatch", "Packaging Tear", "Expired Item", "Incorrect Label"]
+ACTIONS = ["Return to Supplier", "Repack", "Dispose", "Re-inspect", "Hold in Quarantine"]
+
+def damage_header():
+    return [
+        ["Report Date", now().strftime("%Y-%m-%d")],
+        ["Reported By", fake.name()],
+        ["Department", rng.choice(["Receiving", "Inventory", "Shipping", "Quality Control"])],
+        ["Reference No.", f"NC-{rng.randint(10000,99999)}"]
+    ]
+
+def damage_items(n):
+    batch = get_pools().batch(n)
+    codes = batch.integers(10000, 99999).tolist()
+    descs = batch.draw("catch_phrase")
+    issues = batch.choice(ISSUES)
+    severities = batch.choice(["Low", "Medium", "High"])
+    qtys = batch.integers(1, 20).tolist()
+    actions = batch.choice(ACTIONS)
+    return [
+        [f"ITEM-{codes[i]}", descs[i], issues[i], severities[i], qtys[i], actions[i]]
+        for i in range(n)
+    ]
+
+DAMAGE_REPORT_SPEC = {
+    "destination": f"{GCS_PATH}/{{filename}}",
+    "margins": 30,
+    "sections": [
+        {"kind": "title", "text": "Non‑Conformance / Damage Report"},
+        {"kind": "spacer", "height": 12},
+        {"kind": "fields", "rows": damage_header, "widths": [130, 320], "grid": 0.4},
+        {"kind": "spacer", "height": 12},
+        {"kind": "table", "batch": damage_items, "count": [5, 12], "wrap": [1],
+         "header_background": "orange", "font_size": 8, "valign": "TOP",
+         "columns": ["Item Code", "Description", "Issue", "Severity", "Qty Affected", "Action Required"],
+         "widths": [70, 130, 90, 60, 60, 100]},
+        {"kind": "spacer", "height": 18},
+        {"kind": "heading", "text": "Inspector Notes"},
+        {"kind": "paragraph", "generate": lambda: fake.paragraph(nb_sentences=3)},
+    ],
+}
+
+DAMAGE_REPORT_PLAN = compile_spec(DAMAGE_REPORT_SPEC)
 
 def generate_damage_report(filename):
-    styles = getSampleStyleSheet()
-    wrap = ParagraphStyle("wrap", fontSize=8, leading=10)
+    DAMAGE_REPORT_PLAN.build(filename)
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-        elements = []
-
-        elements.append(Paragraph("Non‑Conformance / Damage Report", styles["Title"]))
-        elements.append(Spacer(1, 12))
-
-        # Header Info
-        header = [
-            ["Report Date", datetime.now().strftime("%Y-%m-%d")],
-            ["Reported By", fake.name()],
-            ["Department", random.choice(["Receiving", "Inventory", "Shipping", "Quality Control"])],
-            ["Reference No.", f"NC-{random.randint(10000,99999)}"]
-        ]
-        t_header = Table(header, colWidths=[130, 320])
-        t_header.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-        ]))
-        elements.append(t_header)
-        elements.append(Spacer(1, 12))
-
-        # Damaged Items Table
-        data = [["Item Code", "Description", "Issue", "Severity", "Qty Affected", "Action Required"]]
-        issues = ["Physical Damage", "Quantity Mismatch", "Packaging Tear", "Expired Item", "Incorrect Label"]
-        actions = ["Return to Supplier", "Repack", "Dispose", "Re-inspect", "Hold in Quarantine"]
-
-        for _ in range(random.randint(5, 12)):
-            row = [
-                f"ITEM-{random.randint(10000,99999)}",
-                Paragraph(fake.catch_phrase(), wrap),
-                random.choice(issues),
-                random.choice(["Low", "Medium", "High"]),
-                random.randint(1, 20),
-                random.choice(actions)
-            ]
-            data.append(row)
-
-        table = Table(data, colWidths=[70, 130, 90, 60, 60, 100])
-        table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (-1,0), colors.orange),
-            ('FONTSIZE', (0,0), (-1,-1), 8),
-            ('VALIGN', (0,0), (-1,-1), 'TOP')
-        ]))
-        elements.append(table)
-
-        # Notes
-        elements.append(Spacer(1, 18))
-        elements.append(Paragraph("Inspector Notes", styles["Heading2"]))
-        elements.append(Paragraph(fake.paragraph(nb_sentences=3), styles["Normal"]))
-
-        doc.build(elements)
-
-        upload_to_gcs(BUCKET_NAME, tmp.name, f"{GCS_PATH}/{filename}")
-
-# === Generate 150 Reports ===
+# === Generate and upload 250 documents ===
 if __name__ == "__main__":
-    for i in range(250):
-        generate_damage_report(f"non_conformance_report_{i+1}.pdf")
+    run_cli([(generate_damage_report, f"non_conformance_report_{i+1}.pdf") for i in range(250)], STORAGE_URI)
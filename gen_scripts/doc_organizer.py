@@ -2,38 +2,111 @@
 """
 GCS Document Organizer
 Sorts documents in GCS bucket healthcare folder into pdf and txt subfolders
-while keeping original files intact.
+while keeping original files intact. Any storage URI understood by
+storage_backends (gs://, file://, memory://) can stand in for the bucket.
+With a listing manifest (--manifest), reruns only process new or changed
+sources. CSV, XLSX, DOCX, JSON and HTML files are converted to text (or
+PDF) by the converters registry; byte-identical sources are converted once
+and the result copied to every target. --dry-run writes the plan and a
+cost estimate as JSON instead of running it. Runs report a progress line
+with rolling throughput every few seconds; --metrics exports counters and
+per-operation latency histograms as JSON lines, and --quiet drops the
+per-file lines, which slow very large runs down.
 """
 
 import os
-import io
-import tempfile
+import json
+import argparse
+import multiprocessing
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from google.cloud import storage
-import pandas as pd
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
+from converters import (convert_bytes, convert_in_chunks, convert_object, get_converter, install_registry,
+                        registry)
+from listing_manifest import ListingManifest, checksums, content_key, same_content
+from name_index import NameIndex
+from organizer_plan import plan_run
+from retry import call_with_retry
+from run_metrics import RunMetrics
+from storage_backends import open_backend
+
+COPY_WORKERS = 32
+COPY_BATCH = 100  # GCS accepts at most 100 calls per batch request
+CONVERT_IN_MEMORY_BYTES = 8 * 1024 * 1024
+CONVERT_WORKERS = os.cpu_count() or 1
 
 class GCSDocumentOrganizer:
-    def __init__(self, bucket_name):
+    def __init__(self, bucket_name, workers=COPY_WORKERS, batch_size=COPY_BATCH, manifest_path=None,
+                 dedup_report=None, convert_workers=CONVERT_WORKERS, to_pdf=False, name_index=None,
+                 metrics_path=None, quiet=False):
         self.bucket_name = bucket_name
-        self.client = storage.Client()
-        self.bucket = self.client.bucket(bucket_name)
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.convert_workers = max(0, convert_workers)
+        self.to_pdf = to_pdf
+        self._convert_pool = None
+        self.manifest = ListingManifest(manifest_path) if manifest_path else None
+        self.names = NameIndex(name_index)
+        if self.manifest is not None:
+            self.names.seed({name: entry["target"] for name, entry in self.manifest.previous.items()})
+        self.dedup_report = dedup_report
+        self._conversions = {}
+        self._contents = defaultdict(list)
+        self.stats = {}
+        self.metrics = RunMetrics(metrics_path)
+        self.quiet = quiet
+        self._stats_lock = threading.Lock()
+        self.storage_uri = bucket_name if "://" in bucket_name else f"gs://{bucket_name}"
+        self.storage = open_backend(self.storage_uri)
+        if self.storage_uri.startswith("memory://"):
+            # Worker processes cannot see this process's memory store
+            self.convert_workers = 0
+        # Sources downloaded or converting at once, so they cannot pile up
+        # in memory while the conversion processes are busy
+        self._convert_slots = threading.BoundedSemaphore(max(1, self.convert_workers) * 2)
         self.healthcare_folder = "Healthcare/"
         self.pdf_folder = f"{self.healthcare_folder}pdf/"
         self.txt_folder = f"{self.healthcare_folder}txt/"
 
     def list_healthcare_files(self):
-        blobs = self.bucket.list_blobs(prefix=self.healthcare_folder)
-        return [blob for blob in blobs if not blob.name.endswith('/')]
+        """
+        Yield the files under the healthcare folder page by page as the
+        listing arrives, instead of holding the whole listing in memory.
+        Each page fetch is timed as a 'list' operation.
+        """
+        for page in self.metrics.timed_iter('list', self.storage.list_pages(prefix=self.healthcare_folder)):
+            for blob in page:
+                if not blob.name.endswith('/'):
+                    yield blob
+
+    def list_targets(self):
+        """
+        Names and checksums of the existing outputs in the pdf and txt
+        folders, not whole blobs, so the index stays small however many
+        outputs there are. Page fetches are timed as 'list_targets'.
+        """
+        return {
+            blob.name: checksums(blob)
+            for folder in (self.pdf_folder, self.txt_folder)
+            for page in self.metrics.timed_iter('list_targets', self.storage.list_pages(prefix=folder))
+            for blob in page
+        }
+
+    def _log(self, message):
+        # Per-file lines; errors are always printed
+        if not self.quiet:
+            print(message)
 
     def get_file_extension(self, filename):
         return Path(filename).suffix.lower()
 
-    def generate_sorted_filename(self, original_path, target_folder):
+    def generate_sorted_filename(self, original_path, target_folder, source=None):
+        """
+        Flattened target path for original_path, reserved in the name index
+        for source (default: original_path). If another source already
+        holds the flattened name, this one gets a hash-suffixed variant.
+        """
         filename = Path(original_path).name
         relative_path = original_path.replace(self.healthcare_folder, "", 1)
         path_parts = Path(relative_path).parts
@@ -43,109 +116,442 @@ class GCSDocumentOrganizer:
             name_without_ext = Path(original_filename).stem
             extension = Path(original_filename).suffix
             filename = f"{folder_prefix}_{name_without_ext}{extension}"
-        return f"{target_folder}{filename}"
+        return self.names.reserve(source or original_path, f"{target_folder}{filename}")
+
+    def _run_conversion(self, convert, *args):
+        """
+        Run a conversion on the process pool while organize_documents is
+        running, otherwise on the calling thread.
+        """
+        if self._convert_pool is None:
+            return convert(*args)
+        return self._convert_pool.submit(convert, *args).result()
 
-    def csv_to_txt(self, csv_content, output_path):
+    def _stream_conversion(self, converter, source_blob, output_path):
+        # CPU-bound converters go to the process pool, the rest stay on
+        # this I/O thread
+        pooled = converter.cpu_bound and self._convert_pool is not None
+        run = self._run_conversion if converter.cpu_bound else (lambda convert, *args: convert(*args))
+        # The converter passed in already decided text or PDF (CSVs stay
+        # text under --to-pdf); workers look it up again by that decision
+        to_pdf = converter.target_extension == '.pdf'
+        if source_blob.size <= CONVERT_IN_MEMORY_BYTES or (pooled and converter.chunked is None):
+            # Small files, and large ones the pool can only take whole: one
+            # download and one plain upload on this thread
+            with self.metrics.timed('download', source_blob.size):
+                data = self.storage.read_bytes(source_blob.name)
+            with self.metrics.timed('convert', len(data)):
+                output = run(convert_bytes, converter.extension, to_pdf, data)
+            with self.metrics.timed('upload', len(output)):
+                self.storage.put(output_path, output, content_type=converter.content_type)
+            return
+        # Large files stream from source through the converter to the
+        # target, so their download and upload are timed as the conversion
+        with self.metrics.timed('convert', source_blob.size):
+            if not pooled:
+                convert_object(self.storage, converter.extension, to_pdf, source_blob.name, output_path)
+                return
+            # Reader and writer stay on this thread; only chunks cross
+            # to the pool
+            with self.storage.open_read(source_blob.name) as source, \
+                    self.storage.open_write(output_path, content_type=converter.content_type) as out:
+                convert_in_chunks(converter.chunked, source, out, self._convert_pool.submit)
+
+    def convert_file(self, source_blob, output_path, converter):
         """
-        Convert CSV content to plain TXT and upload to GCS
+        Convert a stored file with its registered converter and upload the
+        result, retrying the whole conversion on failure.
         """
+        kind = f"{converter.extension[1:].upper()} to {converter.target_extension[1:].upper()}"
         try:
-            df = pd.read_csv(io.StringIO(csv_content))
-            text_data = df.to_string(index=False)
-            blob = self.bucket.blob(output_path)
-            blob.upload_from_string(text_data, content_type='text/plain')
-            print(f"✓ Converted CSV to TXT: {output_path}")
+            call_with_retry(self._stream_conversion, converter, source_blob, output_path,
+                            label=f"convert {source_blob.name}")
+            self._log(f"✓ Converted {kind}: {output_path}")
+            return True
         except Exception as e:
-            print(f"✗ Error converting CSV to TXT {output_path}: {str(e)}")
+            print(f"✗ Error converting {kind} {output_path}: {str(e)}")
+            return False
+
+    def csv_to_txt(self, source_blob, output_path):
+        """
+        Convert a CSV object to plain TXT and upload it, streaming it in row
+        chunks so memory stays bounded whatever the file size. Cell values
+        are written as they appear in the CSV, with line breaks escaped.
+        """
+        return self.convert_file(source_blob, output_path, get_converter('.csv'))
 
     def copy_file_to_target(self, source_blob, target_path):
         try:
-            self.bucket.copy_blob(source_blob, self.bucket, target_path)
-            print(f"✓ Copied: {source_blob.name} -> {target_path}")
+            with self.metrics.timed('copy', source_blob.size):
+                call_with_retry(self.storage.copy, source_blob.name, target_path,
+                                label=f"copy {source_blob.name}")
+            self._log(f"✓ Copied: {source_blob.name} -> {target_path}")
             return True
         except Exception as e:
             print(f"✗ Error copying {source_blob.name}: {str(e)}")
             return False
 
     def ensure_folders_exist(self):
-        pdf_folder_blob = self.bucket.blob(f"{self.pdf_folder}")
-        txt_folder_blob = self.bucket.blob(f"{self.txt_folder}")
         print(f"Target folders will be created: {self.pdf_folder} and {self.txt_folder}")
         print("All files will be flattened (no subfolders in output)")
 
+    def plan_file(self, blob):
+        """
+        The action ('copy' or 'convert'), target path and stats key for one
+        source file.
+        """
+        file_ext = self.get_file_extension(blob.name)
+        if file_ext == '.pdf':
+            return 'copy', self.generate_sorted_filename(blob.name, self.pdf_folder), 'pdf_copied'
+        if file_ext == '.txt':
+            return 'copy', self.generate_sorted_filename(blob.name, self.txt_folder), 'txt_copied'
+        converter = self.converter_for(blob)
+        if converter is not None:
+            # ✅ CSV (and other registered types) converted to TXT
+            output_name = blob.name.rsplit('.', 1)[0] + converter.target_extension
+            folder = self.pdf_folder if converter.target_extension == '.pdf' else self.txt_folder
+            key = 'csv_converted' if file_ext == '.csv' else 'documents_converted'
+            return 'convert', self.generate_sorted_filename(output_name, folder, source=blob.name), key
+        # For other files, copy to PDF folder as-is
+        return 'copy', self.generate_sorted_filename(blob.name, self.pdf_folder), 'other_converted'
+
+    def converter_for(self, blob):
+        # CSVs stay text (they feed the txt/ folder); --to-pdf applies to
+        # the document converters
+        return get_converter(blob.name, self.to_pdf and self.get_file_extension(blob.name) != '.csv')
+
+    def is_up_to_date(self, blob, action, target_path, listed):
+        """
+        Incremental mode: whether target_path already holds this version of
+        blob, per the listing manifest or, for plain copies, because the
+        target's checksum matches the source's.
+        """
+        target = listed.get(target_path)
+        if self.manifest.is_done(blob, target_path, target):
+            return True
+        return action == 'copy' and target is not None and same_content(blob, target)
+
+    def _done(self, blob, target_path):
+        if self.manifest is not None:
+            self.manifest.record(blob, target_path)
+
+    def _count(self, key, blob=None):
+        """
+        Count one finished file under key, in the stats and the metrics;
+        only files actually copied or converted count towards throughput.
+        """
+        with self._stats_lock:
+            self.stats[key] += 1
+        self.metrics.count(key)
+        # Skips and errors moved nothing; keep them out of the throughput
+        if key not in ('skipped', 'errors'):
+            self.metrics.file_done(blob.size if blob is not None else 0)
+
+    def _copied(self, blob, key):
+        self._count(key, blob)
+        if key == 'other_converted':
+            self._log(f"  Note: {self.get_file_extension(blob.name)} file moved to PDF folder without conversion")
+
+    def _copy_batch(self, batch):
+        """
+        Server-side copy a batch of (blob, target_path, stats key) in one
+        request, falling back to individually retried copies if it fails.
+        """
+        try:
+            with self.metrics.timed('copy', sum(blob.size for blob, _, _ in batch)):
+                self.storage.copy_many([(blob.name, target_path) for blob, target_path, _ in batch])
+        except Exception as e:
+            print(f"↻ Batch of {len(batch)} copies failed ({e}); copying one at a time")
+            for blob, target_path, key in batch:
+                if self.copy_file_to_target(blob, target_path):
+                    self._copied(blob, key)
+                    self._done(blob, target_path)
+                else:
+                    self._count('errors', blob)
+            return
+        for blob, target_path, key in batch:
+            self._log(f"✓ Copied: {blob.name} -> {target_path}")
+            self._copied(blob, key)
+            self._done(blob, target_path)
+
+    def _convert(self, blob, target_path, key, group=None):
+        with self._convert_slots:
+            converted = self.convert_file(blob, target_path, self.converter_for(blob))
+        self._count(key if converted else 'errors', blob)
+        if converted:
+            self._done(blob, target_path)
+        if group is not None:
+            group['converted'] = converted
+
+    def _fan_out(self, group):
+        """
+        Copy one conversion's output to the targets of its byte-identical
+        duplicates, or convert them individually if that conversion failed.
+        """
+        duplicates = group['duplicates']
+        if not group['converted']:
+            for blob, target_path in duplicates:
+                self._convert(blob, target_path, group['key'])
+            return
+        for start in range(0, len(duplicates), self.batch_size):
+            batch = duplicates[start:start + self.batch_size]
+            try:
+                with self.metrics.timed('copy', group['blob'].size * len(batch)):
+                    self.storage.copy_many([(group['target'], target_path) for _, target_path in batch])
+                copied = [True] * len(batch)
+            except Exception as e:
+                print(f"↻ Batch of {len(batch)} copies failed ({e}); copying one at a time")
+                copied = []
+                for _, target_path in batch:
+                    try:
+                        with self.metrics.timed('copy', group['blob'].size):
+                            call_with_retry(self.storage.copy, group['target'], target_path,
+                                            label=f"copy {group['target']}")
+                        copied.append(True)
+                    except Exception as e:
+                        print(f"✗ Error copying {group['target']}: {str(e)}")
+                        copied.append(False)
+            for (blob, target_path), ok in zip(batch, copied):
+                if ok:
+                    self._log(f"✓ Copied conversion of identical file: {group['target']} -> {target_path}")
+                    self._count('conversions_reused', blob)
+                    self._done(blob, target_path)
+                else:
+                    self._count('errors', blob)
+
+    def write_dedup_report(self, path):
+        """
+        JSON report of every group of byte-identical source files seen this
+        run, with what the duplicates cost.
+        """
+        converted = {content for _, content in self._conversions}
+        groups = [
+            {
+                "size": size,
+                "checksum": checksum,
+                "converted_once": (size, checksum) in converted,
+                "files": [{"source": source, "target": target} for source, target in files],
+            }
+            for (size, checksum), files in sorted(self._contents.items()) if len(files) > 1
+        ]
+        report = {
+            "duplicate_groups": len(groups),
+            "redundant_files": sum(len(group["files"]) - 1 for group in groups),
+            "redundant_bytes": sum(group["size"] * (len(group["files"]) - 1) for group in groups),
+            "groups": groups,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Dedup report: {report['duplicate_groups']} groups, "
+              f"{report['redundant_files']} redundant files -> {path}")
+
+    def _submit(self, pool, fn, *args):
+        self._in_flight.acquire()
+        pool.submit(fn, *args).add_done_callback(self._task_done)
+
+    def _task_done(self, future):
+        """
+        Release the task's slot and report anything it raised, which the
+        per-file handlers did not already count.
+        """
+        self._in_flight.release()
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            print(f"✗ Unexpected error in organizer task: {error!r}")
+            self._count('errors')
+
+    def _organize(self, files, listed):
+        """
+        Plan every listed file and run its copy or conversion on the I/O
+        thread pool, then copy shared conversions to duplicate targets.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="organizer") as pool:
+            batch = []
+            found = 0
+            for blob in files:
+                found += 1
+                self._log(f"\nProcessing: {blob.name} (Extension: {self.get_file_extension(blob.name)})")
+                try:
+                    action, target_path, key = self.plan_file(blob)
+                except Exception as e:
+                    print(f"✗ Unexpected error processing {blob.name}: {str(e)}")
+                    self._count('errors', blob)
+                    continue
+                if self.manifest is not None and self.is_up_to_date(blob, action, target_path, listed):
+                    self._log(f"= Unchanged: {target_path}")
+                    self._count('skipped', blob)
+                    self._done(blob, target_path)
+                    continue
+                content = content_key(blob)
+                if self.dedup_report and content is not None:
+                    self._contents[content].append((blob.name, target_path))
+                if action == 'convert':
+                    # Same bytes through the same converter give the same output
+                    content = (self.get_file_extension(blob.name), content) if content is not None else None
+                    group = self._conversions.get(content) if content is not None else None
+                    if group is not None:
+                        self._log(f"= Identical to {group['blob'].name}; converting once")
+                        group['duplicates'].append((blob, target_path))
+                        continue
+                    if content is not None:
+                        group = self._conversions[content] = {
+                            'blob': blob, 'target': target_path, 'key': key, 'duplicates': [], 'converted': False,
+                        }
+                    self._submit(pool, self._convert, blob, target_path, key, group)
+                    continue
+                batch.append((blob, target_path, key))
+                if len(batch) == self.batch_size:
+                    self._submit(pool, self._copy_batch, batch)
+                    batch = []
+            if batch:
+                self._submit(pool, self._copy_batch, batch)
+        print(f"\nFound {found} files to process")
+
+        # === Copy each unique conversion to its duplicates' targets ===
+        groups = [group for group in self._conversions.values() if group['duplicates']]
+        if groups:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="organizer") as pool:
+                for group in groups:
+                    self._submit(pool, self._fan_out, group)
+
+    def dry_run(self, plan_path):
+        """
+        Write the plan a run would carry out, with collisions and a cost
+        estimate, to plan_path as JSON without copying or converting.
+        """
+        print(f"Planning document organization in: {self.storage_uri}")
+        plan = plan_run(self)
+        with open(plan_path, "w", encoding="utf-8") as f:
+            json.dump(plan, f, indent=2)
+        summary = plan["summary"]
+        print(f"Files listed: {summary['listed']}")
+        print(f"To copy: {summary['copy']} ({summary['bytes_copied']} bytes)")
+        print(f"To convert: {summary['convert']} ({summary['bytes_converted']} bytes)")
+        print(f"Identical conversions to reuse: {summary['reuse']}")
+        print(f"Unchanged, skipped: {summary['skip']}")
+        print(f"Target name collisions: {summary['collisions']}")
+        print(f"Estimated wall time: {summary['estimated_seconds']}s")
+        print(f"Plan written to {plan_path}")
+        return plan
+
     def organize_documents(self):
-        print(f"Starting document organization in bucket: {self.bucket_name}")
+        print(f"Starting document organization in: {self.storage_uri}")
         print(f"Healthcare folder: {self.healthcare_folder}")
 
         self.ensure_folders_exist()
-        files = self.list_healthcare_files()
-        print(f"Found {len(files)} files to process")
+        self.metrics.start()
+        # Outputs live under Healthcare/ too. The listing streams while
+        # copies land, so it would see this run's own outputs; they are
+        # never sources
+        outputs = (self.pdf_folder, self.txt_folder)
+        files = (blob for blob in self.list_healthcare_files() if not blob.name.startswith(outputs))
+        listed = {}
+        if self.manifest is not None:
+            # Index the existing outputs as targets
+            listed = self.list_targets()
+            print(f"Incremental mode: {len(self.manifest.previous)} sources in {self.manifest.path}, "
+                  f"{len(listed)} existing targets")
+        print(f"Copying with {self.workers} workers, up to {self.batch_size} copies per request")
+        print(f"Converting CPU-bound formats in {self.convert_workers or 'no'} worker processes")
 
-        stats = {
+        self.stats = {
             'pdf_copied': 0,
             'txt_copied': 0,
             'csv_converted': 0,
             'other_converted': 0,
+            'documents_converted': 0,
+            'conversions_reused': 0,
+            'skipped': 0,
             'errors': 0
         }
+        self._conversions = {}
+        self._contents = defaultdict(list)
 
-        for blob in files:
-            file_ext = self.get_file_extension(blob.name)
-            print(f"\nProcessing: {blob.name} (Extension: {file_ext})")
-
-            try:
-                if file_ext == '.pdf':
-                    target_path = self.generate_sorted_filename(blob.name, self.pdf_folder)
-                    if self.copy_file_to_target(blob, target_path):
-                        stats['pdf_copied'] += 1
-                    else:
-                        stats['errors'] += 1
-
-                elif file_ext == '.txt':
-                    target_path = self.generate_sorted_filename(blob.name, self.txt_folder)
-                    if self.copy_file_to_target(blob, target_path):
-                        stats['txt_copied'] += 1
-                    else:
-                        stats['errors'] += 1
-
-                elif file_ext == '.csv':
-                    # ✅ CSV converted to TXT instead of PDF
-                    csv_content = blob.download_as_text()
-                    original_name = blob.name
-                    txt_name = original_name.rsplit('.', 1)[0] + '.txt'
-                    target_path = self.generate_sorted_filename(txt_name, self.txt_folder)
-                    self.csv_to_txt(csv_content, target_path)
-                    stats['csv_converted'] += 1
-
-                else:
-                    # For other files, copy to PDF folder as-is
-                    target_path = self.generate_sorted_filename(blob.name, self.pdf_folder)
-                    if self.copy_file_to_target(blob, target_path):
-                        stats['other_converted'] += 1
-                        print(f"  Note: {file_ext} file moved to PDF folder without conversion")
-                    else:
-                        stats['errors'] += 1
+        # === Fan copies and conversions out over a bounded thread pool ===
+        # Threads do the listing, copies, downloads and uploads; CSV parsing
+        # and formatting run in the conversion process pool
+        self._in_flight = threading.BoundedSemaphore(self.workers * 2)
+        if self.convert_workers:
+            # Spawned, not forked: workers start from an I/O thread while
+            # others may hold locks (gcs_session's, for one) a fork would copy
+            self._convert_pool = ProcessPoolExecutor(max_workers=self.convert_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"),
+                                                     initializer=install_registry, initargs=(registry(),))
+        try:
+            self._organize(files, listed)
+        finally:
+            if self._convert_pool is not None:
+                self._convert_pool.shutdown()
+                self._convert_pool = None
 
-            except Exception as e:
-                print(f"✗ Unexpected error processing {blob.name}: {str(e)}")
-                stats['errors'] += 1
+        if self.manifest is not None:
+            self.manifest.save()
+        self.names.save()
+        if self.names.collisions:
+            print(f"\n{len(self.names.collisions)} flattened name collisions resolved with hash suffixes")
+        if self.dedup_report:
+            self.write_dedup_report(self.dedup_report)
 
+        stats = self.stats
         print("\n" + "="*50)
         print("ORGANIZATION COMPLETE!")
         print("="*50)
         print(f"PDF files copied: {stats['pdf_copied']}")
         print(f"TXT files copied: {stats['txt_copied']}")
         print(f"CSV files converted to TXT: {stats['csv_converted']}")
+        print(f"Other documents converted: {stats['documents_converted']}")
+        print(f"Identical files copied from one conversion: {stats['conversions_reused']}")
         print(f"Other files moved: {stats['other_converted']}")
+        print(f"Unchanged files skipped: {stats['skipped']}")
         print(f"Errors encountered: {stats['errors']}")
         print(f"Total files processed: {sum(stats.values())}")
+
+        # === Throughput and latency ===
+        summary = self.metrics.finish()
+        print(f"\nElapsed: {summary['elapsed_seconds']}s, {summary['files_per_second']} files/s, "
+              f"{summary['mb_per_second']} MB/s")
+        for operation, histogram in summary['operations'].items():
+            print(f"  {operation}: {histogram['count']} calls, p50 {histogram['p50_seconds']}s, "
+                  f"p90 {histogram['p90_seconds']}s, max {histogram['max_seconds']}s")
+        if self.metrics.path:
+            print(f"Metrics written to {self.metrics.path}")
         print("\nOriginal files remain intact in their original locations.")
         print("All output files are flattened in pdf/ and txt/ folders (no subfolders).")
 
 def main():
-    BUCKET_NAME = "dummy-dromos-documents"
-    organizer = GCSDocumentOrganizer(BUCKET_NAME)
-    organizer.organize_documents()
+    parser = argparse.ArgumentParser(description="Sort Healthcare/ documents into flat pdf/ and txt/ folders")
+    parser.add_argument("storage", nargs="?", default="gs://dummy-dromos-documents",
+                        help="bucket or storage URI (gs://, file://, memory://)")
+    parser.add_argument("--workers", type=int, default=COPY_WORKERS,
+                        help="concurrent copy/convert requests")
+    parser.add_argument("--batch-size", type=int, default=COPY_BATCH,
+                        help="server-side copies sent per batch request")
+    parser.add_argument("--manifest", default=None,
+                        help="local listing manifest; reruns only process new or changed files")
+    parser.add_argument("--dedup-report", default=None,
+                        help="write a JSON report of byte-identical source files")
+    parser.add_argument("--convert-workers", type=int, default=CONVERT_WORKERS,
+                        help="processes for CPU-bound conversions (0 = convert on the I/O threads)")
+    parser.add_argument("--to-pdf", action="store_true",
+                        help="render converted XLSX/DOCX/JSON/HTML documents as PDFs in pdf/")
+    parser.add_argument("--dry-run", nargs="?", const="organizer_plan.json", default=None, metavar="PLAN",
+                        help="write the action plan and cost estimate as JSON instead of running")
+    parser.add_argument("--name-index", default=None,
+                        help="JSON file of source -> target names, so collision suffixes stay stable")
+    parser.add_argument("--metrics", default=None, metavar="JSONL",
+                        help="write progress snapshots and latency histograms as JSON lines")
+    parser.add_argument("--quiet", action="store_true",
+                        help="print only errors and the periodic progress line, not every file")
+    args = parser.parse_args()
+    organizer = GCSDocumentOrganizer(args.storage, workers=args.workers, batch_size=args.batch_size,
+                                     manifest_path=args.manifest, dedup_report=args.dedup_report,
+                                     convert_workers=args.convert_workers, to_pdf=args.to_pdf,
+                                     name_index=args.name_index, metrics_path=args.metrics,
+                                     quiet=args.quiet)
+    if args.dry_run:
+        organizer.dry_run(args.dry_run)
+    else:
+        organizer.organize_documents()
 
 if __name__ == "__main__":
     main()
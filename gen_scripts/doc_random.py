@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Document Random
+The random source generators draw their values from while building a
+document: rng.randint, rng.choice, rng.uniform, ... in place of the global
+random module. The corpus runner reseeds it for every document
+(seed_document), so a document's draws depend only on its seed.
+
+The global random module is shared with everything else in the process,
+uploader threads' retry jitter and client libraries included; a draw made
+there between two of a document's draws would change its bytes.
+"""
+
+import random
+
+rng = random.Random()
+
+
+def seed_rng(seed):
+    rng.seed(seed)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Document Spec Engine
+Compiles declarative document specs (dicts, or YAML files) into reusable
+layout plans. Column widths, table styles and paragraph styles are built
+once per document type; each document then only fills in its data.
+
+A spec looks like:
+
+    {
+        "destination": "Warehouse/GRN/{filename}",
+        "margins": [40, 40, 40, 30],          # right, left, top, bottom
+        "sections": [
+            {"kind": "title", "text": "Goods Received Note (GRN)"},
+            {"kind": "fields", "rows": grn_metadata, "widths": [130, 300]},
+            {"kind": "heading", "text": "Items Received"},
+            {"kind": "table", "columns": [...], "widths": [...],
+             "row": grn_item, "count": [3, 6], "wrap": [0]},
+            {"kind": "table", "columns": [...], "widths": [...],
+             "batch": count_items, "count": [20, 35]},
+            {"kind": "paragraph", "generate": notes},
+        ],
+    }
+
+Section kinds: title, spacer, heading, paragraph, fields (label/value
+table), table (header row plus generated rows). A table draws its rows
+either one at a time from "row" or all at once from "batch", which is
+called with the row count; see value_pools. Callables may be given
+by name and resolved from the functions mapping passed to compile_spec.
+"""
+
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, Spacer
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+
+from doc_random import rng
+from pdf_buffer import new_pdf_buffer
+from style_registry import count_reuse, get_stylesheet, paragraph_style, style_stats, table_style
+from upload_queue import queue_upload
+
+
+class SpecError(ValueError):
+    pass
+
+
+def _color(name):
+    color = getattr(colors, name, None)
+    if color is None:
+        raise SpecError(f"Unknown color: {name}")
+    return color
+
+
+def _resolve(value, functions):
+    if callable(value):
+        return value
+    if isinstance(value, str) and value in functions:
+        return functions[value]
+    raise SpecError(f"Cannot resolve generator: {value!r}")
+
+
+def _margins(margins):
+    if isinstance(margins, (int, float)):
+        margins = [margins] * 4
+    right, left, top, bottom = margins
+    return dict(rightMargin=right, leftMargin=left, topMargin=top, bottomMargin=bottom)
+
+
+class _Flowable:
+    def __init__(self, make):
+        self.make = make
+
+    def emit(self, elements):
+        elements.append(self.make())
+
+
+class _Grid:
+    def __init__(self, section, functions, wrap_style, header):
+        self.header = [list(section["columns"])] if header else []
+        self.widths = section["widths"]
+        self.wrap = set(section.get("wrap", []))
+        self.wrap_style = wrap_style
+        if header:
+            if "batch" in section:
+                self.batch = _resolve(section["batch"], functions)
+            else:
+                row = _resolve(section["row"], functions)
+                self.batch = lambda n: [row() for _ in range(n)]
+            self.count = section.get("count", [1, 1])
+        else:
+            self.rows = _resolve(section["rows"], functions)
+
+        commands = [('GRID', (0,0), (-1,-1), section.get("grid", 0.5), colors.grey)]
+        if header:
+            commands.append(('BACKGROUND', (0,0), (-1,0), _color(section.get("header_background", "lightblue"))))
+        else:
+            commands.append(('BACKGROUND', (0,0), (0,-1), _color(section.get("label_background", "lightgrey"))))
+        if "font_size" in section:
+            commands.append(('FONTSIZE', (0,0), (-1,-1), section["font_size"]))
+        if "valign" in section:
+            commands.append(('VALIGN', (0,0), (-1,-1), section["valign"]))
+        commands.extend(tuple(command) for command in section.get("style", []))
+        self.style = table_style(commands)
+
+    def _cells(self, row):
+        return [Paragraph(str(cell), self.wrap_style) if i in self.wrap else cell
+                for i, cell in enumerate(row)]
+
+    def emit(self, elements):
+        if self.header:
+            rows = [self._cells(row) for row in self.batch(rng.randint(*self.count))]
+        else:
+            rows = [self._cells(row) for row in self.rows()]
+        table = Table(self.header + rows, colWidths=self.widths)
+        table.setStyle(self.style)
+        elements.append(table)
+
+
+class LayoutPlan:
+    def __init__(self, spec, functions=None):
+        functions = functions or {}
+        self.destination = spec["destination"]
+        self.pagesize = A4
+        self.margins = _margins(spec.get("margins", 30))
+        before = style_stats()
+        self.styles = get_stylesheet()
+        self.wrap_style = paragraph_style("wrap", fontSize=8, leading=10)
+        self.sections = [self._compile(section, functions) for section in spec["sections"]]
+        after = style_stats()
+        # Lookups the plan made once; each render reuses them all
+        self.style_lookups = sum(after[key] - before[key] for key in ("hits", "misses"))
+
+    def _compile(self, section, functions):
+        kind = section.get("kind")
+        if kind == "title":
+            style = self.styles["Title"]
+            return _Flowable(lambda: Paragraph(section["text"], style))
+        if kind == "spacer":
+            height = section["height"]
+            return _Flowable(lambda: Spacer(1, height))
+        if kind == "heading":
+            style = self.styles[section.get("style", "Heading2")]
+            return _Flowable(lambda: Paragraph(section["text"], style))
+        if kind == "paragraph":
+            style = self.styles[section.get("style", "Normal")]
+            if "generate" in section:
+                generate = _resolve(section["generate"], functions)
+                return _Flowable(lambda: Paragraph(generate(), style))
+            return _Flowable(lambda: Paragraph(section["text"], style))
+        if kind == "fields":
+            return _Grid(section, functions, self.wrap_style, header=False)
+        if kind == "table":
+            return _Grid(section, functions, self.wrap_style, header=True)
+        raise SpecError(f"Unknown section kind: {kind!r}")
+
+    def render(self):
+        pdf = new_pdf_buffer()
+        doc = SimpleDocTemplate(pdf, pagesize=self.pagesize, **self.margins)
+        count_reuse(self.style_lookups)
+        elements = []
+        for section in self.sections:
+            section.emit(elements)
+        doc.build(elements)
+        return pdf
+
+    def build(self, filename):
+        queue_upload(self.render(), self.destination.format(filename=filename))
+
+
+def compile_spec(spec, functions=None):
+    return LayoutPlan(spec, functions)
+
+
+def load_spec(path, functions):
+    """
+    Compile a YAML spec file; generator names resolve through functions.
+    """
+    try:
+        import yaml
+    except ImportError as e:
+        raise SpecError("YAML specs need PyYAML installed (pip install pyyaml)") from e
+    with open(path, encoding="utf-8") as f:
+        return compile_spec(yaml.safe_load(f), functions)
@@ -1,78 +1,72 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, Spacer
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
 from datetime import datetime
+from corpus_runner import run_cli
+from doc_random import rng
+from manifest import annotate
+from pdf_buffer import new_pdf_buffer
+from style_registry import get_stylesheet, paragraph_style, table_style
+from upload_queue import queue_upload
 
 # === Setup ===
 fake = Faker()
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 CATEGORY = "Financial_Documents"
 SUBTYPES = ["Balance Sheet", "Income Statement", "Cash Flow Statement"]
 
-# === Upload Function ===
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
-
 # === Generate Document ===
 def generate_financial_statement_file(filename):
-    styles = getSampleStyleSheet()
-    wrap_style = ParagraphStyle("wrap", fontSize=8, leading=10)
+    styles = get_stylesheet()
+    wrap_style = paragraph_style("wrap", fontSize=8, leading=10)
     normal = styles["Normal"]
 
-    subtype = random.choice(SUBTYPES)
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4)
-        elements = []
-
-        # === Title ===
-        elements.append(Paragraph(f"{subtype}", styles["Title"]))
-        elements.append(Spacer(1, 12))
-
-        # === Metadata ===
-        meta = [
-            ["Company", fake.company()],
-            ["Report Type", subtype],
-            ["Fiscal Year Ending", fake.date_this_decade().strftime("%Y-%m-%d")],
-            ["Prepared By", fake.name()],
-        ]
-        meta_table = Table(meta, colWidths=[150, 330])
-        meta_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-        ]))
-        elements.append(meta_table)
-        elements.append(Spacer(1, 16))
-
-        # === Statement Type Logic ===
-        if subtype == "Balance Sheet":
-            elements += generate_balance_sheet(normal)
-        elif subtype == "Income Statement":
-            elements += generate_income_statement(normal)
-        elif subtype == "Cash Flow Statement":
-            elements += generate_cashflow_statement(normal)
-
-        # === Summary ===
-        elements.append(Spacer(1, 16))
-        elements.append(Paragraph("Summary Notes", styles["Heading2"]))
-        elements.append(Paragraph(fake.paragraph(nb_sentences=4), normal))
-
-        doc.build(elements)
-
-        upload_to_gcs(
-            BUCKET_NAME,
-            tmp.name,
-            f"{CATEGORY}/{subtype.replace(' ', '_')}/{filename}"
-        )
+    subtype = rng.choice(SUBTYPES)
+    annotate(subtype=subtype)
+
+    pdf = new_pdf_buffer()
+    doc = SimpleDocTemplate(pdf, pagesize=A4)
+    elements = []
+
+    # === Title ===
+    elements.append(Paragraph(f"{subtype}", styles["Title"]))
+    elements.append(Spacer(1, 12))
+
+    # === Metadata ===
+    meta = [
+        ["Company", fake.company()],
+        ["Report Type", subtype],
+        ["Fiscal Year Ending", fake.date_this_decade().strftime("%Y-%m-%d")],
+        ["Prepared By", fake.name()],
+    ]
+    meta_table = Table(meta, colWidths=[150, 330])
+    meta_table.setStyle(table_style([
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
+    ]))
+    elements.append(meta_table)
+    elements.append(Spacer(1, 16))
+
+    # === Statement Type Logic ===
+    if subtype == "Balance Sheet":
+        elements += generate_balance_sheet(normal)
+    elif subtype == "Income Statement":
+        elements += generate_income_statement(normal)
+    elif subtype == "Cash Flow Statement":
+        elements += generate_cashflow_statement(normal)
+
+    # === Summary ===
+    elements.append(Spacer(1, 16))
+    elements.append(Paragraph("Summary Notes", styles["Heading2"]))
+    elements.append(Paragraph(fake.paragraph(nb_sentences=4), normal))
+
+    doc.build(elements)
+
+    queue_upload(
+        pdf,
+        f"{CATEGORY}/{subtype.replace(' ', '_')}/{filename}"
+    )
 
 # === Subtype Content Builders ===
 def generate_balance_sheet(style):
@@ -153,11 +147,11 @@ def generate_cashflow_statement(style):
 
 # === Helpers ===
 def random_amount():
-    return f"${round(random.uniform(1000, 250000), 2):,.2f}"
+    return f"${round(rng.uniform(1000, 250000), 2):,.2f}"
 
 def financial_table(data):
     t = Table(data, colWidths=[300, 150])
-    t.setStyle(TableStyle([
+    t.setStyle(table_style([
         ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
         ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
         ('FONTSIZE', (0,0), (-1,-1), 9),
@@ -166,7 +160,6 @@ def financial_table(data):
     ]))
     return t
 
-# === Main Runner ===
+# === Generate and upload 300 documents ===
 if __name__ == "__main__":
-    for i in range(300):
-        generate_financial_statement_file(f"financial_statement_{i+1}.pdf")
+    run_cli([(generate_financial_statement_file, f"financial_statement_{i+1}.pdf") for i in range(300)], STORAGE_URI)
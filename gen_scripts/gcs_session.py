@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+GCS Session
+One long-lived storage client per process, backed by a bounded HTTP
+connection pool, shared by the generator uploads and the organizer.
+Batched requests get a client per thread over the same pool, since a
+client collects every request made while one of its batches is open.
+"""
+
+import os
+import threading
+
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import storage
+from requests.adapters import HTTPAdapter
+
+POOL_SIZE = int(os.environ.get("GCS_POOL_SIZE", "32"))
+
+_lock = threading.Lock()
+_owner_pid = None
+_client = None
+_buckets = {}
+_local = threading.local()
+
+
+def _build_client(pool_size):
+    credentials, project = google.auth.default(scopes=storage.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    # pool_block: threads beyond pool_size wait for a free connection
+    # instead of opening (and then discarding) extra ones
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return storage.Client(project=project, credentials=credentials, _http=session)
+
+
+def get_client():
+    """
+    Return this process's storage client, building it on first use.
+    A forked worker never reuses its parent's client or connections.
+    """
+    global _owner_pid, _client
+    with _lock:
+        if _client is None or _owner_pid != os.getpid():
+            _client = _build_client(POOL_SIZE)
+            _buckets.clear()
+            _owner_pid = os.getpid()
+        return _client
+
+
+def get_bucket(bucket_name):
+    client = get_client()
+    with _lock:
+        bucket = _buckets.get(bucket_name)
+        if bucket is None:
+            bucket = _buckets[bucket_name] = client.bucket(bucket_name)
+        return bucket
+
+
+def get_batch_client():
+    """
+    A client private to the calling thread that shares this process's
+    credentials and connection pool; use it for client.batch().
+    """
+    client = get_client()
+    if getattr(_local, "parent", None) is not client:
+        _local.client = storage.Client(project=client.project, credentials=client._credentials,
+                                       _http=client._http)
+        _local.parent = client
+    return _local.client
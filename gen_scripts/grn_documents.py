@@ -1,89 +1,58 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
-from datetime import datetime
+from corpus_runner import run_cli
+from doc_spec import compile_spec
+from value_pools import get_pools
 
 fake = Faker()
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 GCS_PATH = "Logistics Document Inventory (High‑Volume, High‑Velocity)/Warehouse & Inventory/Goods Received Notes (GRN)"
 
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
+def grn_metadata():
+    return [
+        ["GRN Number:", f"GRN-{fake.random_int(100000, 999999)}"],
+        ["Date Received:", fake.date_this_year().strftime("%Y-%m-%d")],
+        ["Warehouse Location:", fake.company() + " Warehouse"],
+        ["Supplier:", fake.company()],
+        ["PO Number:", f"PO-{fake.random_int(1000, 9999)}"]
+    ]
+
+def grn_items(n):
+    batch = get_pools().batch(n)
+    descs = batch.draw("bs")
+    codes = batch.integers(1000, 9999).tolist()
+    qty_ordered = batch.integers(10, 100)
+    qty_received = (qty_ordered - batch.integers(0, 5)).tolist()
+    units = batch.choice(["PCS", "CTN", "KG", "LTR"])
+    remarks = batch.choice(["OK", "Damaged", "Short", "Surplus"])
+    qty_ordered = qty_ordered.tolist()
+    return [
+        [descs[i].title(), f"ITEM-{codes[i]}", qty_ordered[i], qty_received[i], units[i], remarks[i]]
+        for i in range(n)
+    ]
+
+GRN_SPEC = {
+    "destination": f"{GCS_PATH}/{{filename}}",
+    "margins": [40, 40, 40, 30],
+    "sections": [
+        {"kind": "title", "text": "Goods Received Note (GRN)"},
+        {"kind": "spacer", "height": 12},
+        {"kind": "fields", "rows": grn_metadata, "widths": [130, 300]},
+        {"kind": "spacer", "height": 12},
+        {"kind": "heading", "text": "Items Received"},
+        {"kind": "table", "batch": grn_items, "count": [3, 6], "valign": "TOP",
+         "columns": ["Item Description", "Item Code", "Qty Ordered", "Qty Received", "Unit", "Remarks"],
+         "widths": [140, 80, 80, 80, 50, 80]},
+        {"kind": "spacer", "height": 18},
+        {"kind": "paragraph", "text": "Received By: ____________________        Date: ____________"},
+        {"kind": "paragraph", "text": "Verified By: _____________________       Signature: ________"},
+    ],
+}
+
+GRN_PLAN = compile_spec(GRN_SPEC)
 
 def generate_grn(filename):
-    styles = getSampleStyleSheet()
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=30)
-        elements = []
+    GRN_PLAN.build(filename)
 
-        elements.append(Paragraph("Goods Received Note (GRN)", styles["Title"]))
-        elements.append(Spacer(1, 12))
-
-        grn_number = f"GRN-{fake.random_int(100000, 999999)}"
-        date_received = fake.date_this_year().strftime("%Y-%m-%d")
-        warehouse = fake.company() + " Warehouse"
-        supplier = fake.company()
-        po_number = f"PO-{fake.random_int(1000, 9999)}"
-
-        metadata = [
-            ["GRN Number:", grn_number],
-            ["Date Received:", date_received],
-            ["Warehouse Location:", warehouse],
-            ["Supplier:", supplier],
-            ["PO Number:", po_number]
-        ]
-        meta_table = Table(metadata, colWidths=[130, 300])
-        meta_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-        ]))
-        elements.append(meta_table)
-        elements.append(Spacer(1, 12))
-
-        # Items received
-        elements.append(Paragraph("Items Received", styles["Heading2"]))
-        item_data = [["Item Description", "Item Code", "Qty Ordered", "Qty Received", "Unit", "Remarks"]]
-        for _ in range(random.randint(3, 6)):
-            desc = fake.bs().title()
-            code = f"ITEM-{fake.random_int(1000, 9999)}"
-            qty_ordered = random.randint(10, 100)
-            qty_received = qty_ordered - random.randint(0, 5)
-            unit = fake.random_element(["PCS", "CTN", "KG", "LTR"])
-            remark = fake.random_element(["OK", "Damaged", "Short", "Surplus"])
-            item_data.append([desc, code, qty_ordered, qty_received, unit, remark])
-
-        item_table = Table(item_data, colWidths=[140, 80, 80, 80, 50, 80])
-        item_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-        ]))
-        elements.append(item_table)
-        elements.append(Spacer(1, 18))
-
-        elements.append(Paragraph("Received By: ____________________        Date: ____________", styles["Normal"]))
-        elements.append(Paragraph("Verified By: _____________________       Signature: ________", styles["Normal"]))
-
-        doc.build(elements)
-
-        # Upload to GCS
-        upload_to_gcs(
-            BUCKET_NAME,
-            tmp.name,
-            f"{GCS_PATH}/{filename}"
-        )
-
-# === MAIN ===
+# === Generate and upload 300 documents ===
 if __name__ == "__main__":
-    for i in range(300):
-        print(f"📄 Generating GRN {i+1}")
-        generate_grn(f"grn_{i+1}.pdf")
+    run_cli([(generate_grn, f"grn_{i+1}.pdf") for i in range(300)], STORAGE_URI)
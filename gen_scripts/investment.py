@@ -1,32 +1,26 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, Spacer
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
-from datetime import datetime
+from corpus_clock import now
+from corpus_runner import run_cli
+from doc_random import rng
+from manifest import annotate
+from pdf_buffer import new_pdf_buffer
+from style_registry import get_stylesheet, table_style
+from upload_queue import queue_upload
 
 # === Setup ===
 fake = Faker()
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 CATEGORY = "Financial_Documents"
 SUBTYPES = ["Share Certificate", "Investment Report", "Stock Purchase Agreement"]
 
-# === Upload Function ===
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
-
 # === Document Generators ===
 def generate_share_certificate(style):
     holder = fake.name()
     company = fake.company()
-    shares = random.randint(100, 10000)
+    shares = rng.randint(100, 10000)
     certificate_id = fake.uuid4()
     return [
         Paragraph("Share Certificate", style["Title"]),
@@ -34,7 +28,7 @@ def generate_share_certificate(style):
         Paragraph(f"This certifies that <b>{holder}</b> is the registered owner of <b>{shares} ordinary shares</b> in <b>{company}</b>.", style["Normal"]),
         Spacer(1, 12),
         Paragraph(f"Certificate ID: {certificate_id}", style["Normal"]),
-        Paragraph(f"Issued Date: {datetime.now().strftime('%Y-%m-%d')}", style["Normal"]),
+        Paragraph(f"Issued Date: {now().strftime('%Y-%m-%d')}", style["Normal"]),
         Spacer(1, 24),
         Paragraph("Authorized Signatory: ___________________________", style["Normal"]),
         Paragraph("Company Seal: _________________________________", style["Normal"]),
@@ -42,12 +36,12 @@ def generate_share_certificate(style):
 
 def generate_investment_report(style):
     rows = [["Investment", "Amount", "Return (%)", "Status"]]
-    for _ in range(random.randint(5, 8)):
+    for _ in range(rng.randint(5, 8)):
         rows.append([
             fake.company(),
-            f"${random.randint(5000, 500000):,}",
-            f"{round(random.uniform(2, 15), 2)}%",
-            random.choice(["Active", "Exited", "Pending"])
+            f"${rng.randint(5000, 500000):,}",
+            f"{round(rng.uniform(2, 15), 2)}%",
+            rng.choice(["Active", "Exited", "Pending"])
         ])
     return [
         Paragraph("Quarterly Investment Report", style["Title"]),
@@ -55,7 +49,7 @@ def generate_investment_report(style):
         Paragraph(f"Report Prepared For: {fake.name()}", style["Normal"]),
         Paragraph(f"Prepared By: {fake.company()}", style["Normal"]),
         Spacer(1, 12),
-        Table(rows, colWidths=[200, 100, 100, 100], style=TableStyle([
+        Table(rows, colWidths=[200, 100, 100, 100], style=table_style([
             ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
             ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
             ('FONTSIZE', (0,0), (-1,-1), 9),
@@ -69,13 +63,13 @@ def generate_investment_report(style):
 def generate_stock_purchase_agreement(style):
     buyer = fake.name()
     seller = fake.name()
-    shares = random.randint(100, 1000)
-    price = round(random.uniform(10, 100), 2)
+    shares = rng.randint(100, 1000)
+    price = round(rng.uniform(10, 100), 2)
     total = f"${shares * price:,.2f}"
     return [
         Paragraph("Stock Purchase Agreement", style["Title"]),
         Spacer(1, 12),
-        Paragraph(f"This agreement is made on <b>{datetime.now().strftime('%B %d, %Y')}</b> between <b>{seller}</b> (the “Seller”) and <b>{buyer}</b> (the “Buyer”).", style["Normal"]),
+        Paragraph(f"This agreement is made on <b>{now().strftime('%B %d, %Y')}</b> between <b>{seller}</b> (the “Seller”) and <b>{buyer}</b> (the “Buyer”).", style["Normal"]),
         Spacer(1, 12),
         Paragraph(f"The Seller agrees to sell <b>{shares}</b> shares at <b>${price}</b> per share, totaling <b>{total}</b>.", style["Normal"]),
         Spacer(1, 12),
@@ -87,47 +81,46 @@ def generate_stock_purchase_agreement(style):
 
 # === Main Document Builder ===
 def generate_investment_document_file(filename):
-    styles = getSampleStyleSheet()
+    styles = get_stylesheet()
     normal = styles["Normal"]
 
-    subtype = random.choice(SUBTYPES)
+    subtype = rng.choice(SUBTYPES)
+    annotate(subtype=subtype)
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4)
-        elements = []
+    pdf = new_pdf_buffer()
+    doc = SimpleDocTemplate(pdf, pagesize=A4)
+    elements = []
 
-        # Metadata
-        meta = [
-            ["Document Type", subtype],
-            ["Entity", fake.company()],
-            ["Prepared For", fake.name()],
-            ["Date", datetime.now().strftime("%Y-%m-%d")],
-        ]
-        meta_table = Table(meta, colWidths=[150, 330])
-        meta_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-        ]))
-        elements.append(meta_table)
-        elements.append(Spacer(1, 16))
+    # Metadata
+    meta = [
+        ["Document Type", subtype],
+        ["Entity", fake.company()],
+        ["Prepared For", fake.name()],
+        ["Date", now().strftime("%Y-%m-%d")],
+    ]
+    meta_table = Table(meta, colWidths=[150, 330])
+    meta_table.setStyle(table_style([
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
+    ]))
+    elements.append(meta_table)
+    elements.append(Spacer(1, 16))
 
-        # Subtype Content
-        if subtype == "Share Certificate":
-            elements += generate_share_certificate(styles)
-        elif subtype == "Investment Report":
-            elements += generate_investment_report(styles)
-        elif subtype == "Stock Purchase Agreement":
-            elements += generate_stock_purchase_agreement(styles)
+    # Subtype Content
+    if subtype == "Share Certificate":
+        elements += generate_share_certificate(styles)
+    elif subtype == "Investment Report":
+        elements += generate_investment_report(styles)
+    elif subtype == "Stock Purchase Agreement":
+        elements += generate_stock_purchase_agreement(styles)
 
-        doc.build(elements)
+    doc.build(elements)
 
-        upload_to_gcs(
-            BUCKET_NAME,
-            tmp.name,
-            f"{CATEGORY}/Investment_Documents/{subtype.replace(' ', '_')}/{filename}"
-        )
+    queue_upload(
+        pdf,
+        f"{CATEGORY}/Investment_Documents/{subtype.replace(' ', '_')}/{filename}"
+    )
 
-# === Run Batch Generation ===
+# === Generate and upload 300 documents ===
 if __name__ == "__main__":
-    for i in range(300):
-        generate_investment_document_file(f"investment_doc_{i+1}.pdf")
+    run_cli([(generate_investment_document_file, f"investment_doc_{i+1}.pdf") for i in range(300)], STORAGE_URI)
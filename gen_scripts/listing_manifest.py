@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Listing Manifest
+Persisted record of what the organizer has already done: for each source
+object its generation, MD5/CRC32C and the target it was written to. With
+it, a rerun only copies or converts sources that are new or have changed
+since, so its cost follows the change set rather than the bucket size.
+
+While a run is going, the manifest is checkpointed every
+CHECKPOINT_SECONDS, so a run that dies partway keeps what it finished.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+CHECKPOINT_SECONDS = 30.0
+
+# All the organizer keeps of an existing target: enough for same_content()
+Checksums = namedtuple("Checksums", "md5_hash crc32c")
+
+
+def same_version(entry, info):
+    """
+    Whether a manifest entry describes the same object version as info:
+    by generation where the store has one, else by checksum.
+    """
+    for field in ("generation", "md5_hash", "crc32c"):
+        if entry.get(field) is not None and getattr(info, field) is not None:
+            return entry[field] == getattr(info, field)
+    return False
+
+
+def same_content(info, other):
+    """
+    Whether two stored objects hold the same bytes, judged by checksum.
+    """
+    if info.md5_hash and other.md5_hash:
+        return info.md5_hash == other.md5_hash
+    if info.crc32c and other.crc32c:
+        return info.crc32c == other.crc32c
+    return False
+
+
+def checksums(info):
+    return Checksums(info.md5_hash, info.crc32c)
+
+
+def content_key(info):
+    """
+    (size, checksum) identifying an object's bytes, or None when the store
+    reports no checksum.
+    """
+    checksum = info.md5_hash or info.crc32c
+    return (info.size, checksum) if checksum else None
+
+
+class ListingManifest:
+    def __init__(self, path, checkpoint_seconds=CHECKPOINT_SECONDS, clock=time.monotonic):
+        self.path = path
+        self.previous = {}
+        self.entries = {}
+        self.checkpoint_seconds = checkpoint_seconds
+        self.clock = clock
+        self._checkpointed = clock()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.previous[entry["name"]] = entry
+
+    def is_done(self, info, target_path, target_info):
+        """
+        Whether source info was already written to target_path and neither
+        has changed: the manifest holds this source version and its target
+        still exists.
+        """
+        entry = self.previous.get(info.name)
+        return (target_info is not None and entry is not None
+                and entry["target"] == target_path and same_version(entry, info))
+
+    def record(self, info, target_path):
+        """
+        Record a finished source, checkpointing the manifest if one is due.
+        """
+        with self._lock:
+            self.entries[info.name] = {
+                "name": info.name,
+                "generation": info.generation,
+                "md5_hash": info.md5_hash,
+                "crc32c": info.crc32c,
+                "target": target_path,
+            }
+            now = self.clock()
+            if now - self._checkpointed < self.checkpoint_seconds:
+                return
+            self._checkpointed = now
+            # Sources this run has not reached yet keep their old entries
+            entries = {**self.previous, **self.entries}
+        self._write(entries)
+
+    def save(self):
+        """
+        Write the entries recorded this run, replacing the previous
+        manifest atomically. Sources that failed or have disappeared are
+        left out, so the next run retries or forgets them.
+        """
+        with self._lock:
+            entries = dict(self.entries)
+        self._write(entries)
+
+    def _write(self, entries):
+        partial = f"{self.path}.partial"
+        with self._write_lock:
+            with open(partial, "w", encoding="utf-8") as f:
+                for name in sorted(entries):
+                    f.write(json.dumps(entries[name], sort_keys=True) + "\n")
+            os.replace(partial, self.path)
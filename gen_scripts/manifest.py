@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Corpus Manifest
+One JSONL record per stored document: corpus seed, document type, index,
+derived seed, subtype, destination key, size and MD5. The corpus runner
+tags each document it builds, generators add their own fields with
+annotate(), and every upload made while a document is being built is
+recorded against it (upload_record()). A manifest is enough to rebuild
+any single document with the seed it was first built from, and to find
+documents whose stored copy has gone missing or no longer matches its
+checksum.
+
+The same records double as a run checkpoint: append_records() adds each
+finished chunk to a local state file, and stored_objects() verifies any
+number of records against a single bulk listing of their common prefix.
+"""
+
+import json
+import os
+import posixpath
+
+_current = None
+
+
+def begin_document(**fields):
+    """
+    Mark the start of a document build; uploads queued from now on are
+    recorded with these fields.
+    """
+    global _current
+    _current = dict(fields)
+
+
+def end_document():
+    global _current
+    _current = None
+
+
+def annotate(**fields):
+    """
+    Add fields (e.g. subtype) to the record of the document being built.
+    No-op outside a corpus run.
+    """
+    if _current is not None:
+        _current.update(fields)
+
+
+def current_document():
+    return _current
+
+
+def upload_record(document, info):
+    """
+    The manifest record for one stored object of document.
+    """
+    return dict(document, key=info.name, size=info.size, md5=info.md5_hash)
+
+
+def read_manifest(path):
+    """
+    Records from a manifest or checkpoint file; a later record for the same
+    document and key replaces an earlier one. A torn last line (from a run
+    killed mid-append) is ignored.
+    """
+    if not os.path.exists(path):
+        return []
+    records = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[(record["index"], record["key"])] = record
+    return list(records.values())
+
+
+def write_manifest(path, records):
+    """
+    Rewrite the manifest atomically, so an interrupted run never leaves a
+    truncated one behind.
+    """
+    partial = f"{path}.partial"
+    with open(partial, "w", encoding="utf-8") as f:
+        for record in sorted(records, key=lambda r: (r["index"], r["key"])):
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+    os.replace(partial, path)
+
+
+def append_records(path, records):
+    """
+    Append records to a checkpoint file and force them to disk, so a run
+    killed right after still knows they are done. A torn last line left by
+    an earlier run is ended first, so it cannot swallow the next record.
+    """
+    if not records:
+        return
+    with open(path, "a+b") as f:
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        for record in records:
+            f.write((json.dumps(record, sort_keys=True) + "\n").encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def stored_objects(storage, keys):
+    """
+    ObjectInfo for every stored object under the keys' common directory,
+    from one bulk listing instead of a stat per key.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    prefix = posixpath.commonprefix(keys)
+    prefix = prefix[:prefix.rfind("/") + 1]
+    return {info.name: info for info in storage.list(prefix)}
+
+
+def is_intact(record, info):
+    """
+    Whether a stored object still matches its manifest record.
+    """
+    if info is None:
+        return False
+    if record.get("md5") and info.md5_hash:
+        return record["md5"] == info.md5_hash
+    return record["size"] == info.size
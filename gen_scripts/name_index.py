@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Name Index
+Reservation index for the organizer's flattened target names. Flattening
+joins folder parts with "_", so Healthcare/a_b/c.pdf and Healthcare/a/b_c.pdf
+both want pdf/a_b_c.pdf. The first source to reserve a name keeps it; a
+later source gets the name with a short hash of its own path appended,
+which is the same on every run. A set of taken names and a source -> target
+mapping keep each lookup constant-time; the mapping can be saved so names
+stay stable across runs.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import threading
+
+SUFFIX_LENGTH = 8
+
+
+def suffixed(target, source, length=SUFFIX_LENGTH):
+    """
+    target with a hash of source inserted before its extension.
+    """
+    stem, extension = posixpath.splitext(target)
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:length]
+    return f"{stem}_{digest}{extension}"
+
+
+def is_variant(name, target, source):
+    """
+    Whether name is target itself or one of source's suffixed variants.
+    """
+    if name == target:
+        return True
+    stem, extension = posixpath.splitext(target)
+    name_stem, name_extension = posixpath.splitext(name)
+    suffix = name_stem[len(stem) + 1:]
+    return (name_extension == extension and name_stem.startswith(stem + "_")
+            and len(suffix) >= SUFFIX_LENGTH
+            and hashlib.sha1(source.encode("utf-8")).hexdigest().startswith(suffix))
+
+
+class NameIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self.targets = {}
+        self.taken = set()
+        self.collisions = []
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.targets = json.load(f)
+            self.taken.update(self.targets.values())
+
+    def seed(self, mapping):
+        """
+        Adopt source -> target assignments made by an earlier run (e.g.
+        from the listing manifest) without overriding saved ones.
+        """
+        with self._lock:
+            for source, target in mapping.items():
+                if source not in self.targets and target not in self.taken:
+                    self.targets[source] = target
+                    self.taken.add(target)
+
+    def reserve(self, source, target):
+        """
+        The target name source should be written to: target itself unless
+        another source already holds it, else a hash-suffixed variant.
+        """
+        with self._lock:
+            assigned = self.targets.get(source)
+            if assigned is not None and is_variant(assigned, target, source):
+                return assigned
+            candidate, length = target, SUFFIX_LENGTH
+            while candidate in self.taken:
+                candidate = suffixed(target, source, length)
+                length += 4
+            if candidate != target:
+                self.collisions.append({"source": source, "wanted": target, "target": candidate})
+            self.targets[source] = candidate
+            self.taken.add(candidate)
+            return candidate
+
+    def save(self):
+        if not self.path:
+            return
+        partial = f"{self.path}.partial"
+        with self._lock, open(partial, "w", encoding="utf-8") as f:
+            json.dump(self.targets, f, indent=0, sort_keys=True)
+        os.replace(partial, self.path)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Organizer Plan
+Dry run for GCSDocumentOrganizer: works out from one streamed listing what
+a run would do to every file (copy, convert, reuse an identical file's
+conversion, or skip as unchanged), which flattened target names collide
+and the hash-suffixed names the name index gives them,
+how many bytes would move and roughly how long it would take at the
+organizer's concurrency. Nothing is copied or converted.
+
+The time estimate is a simple model: every API round trip costs
+REQUEST_SECONDS, bytes move at TRANSFER_MB_PER_SECOND per stream, and
+CPU-bound conversions run at CONVERT_MB_PER_SECOND per process. I/O is
+spread over the organizer's threads and conversions over its processes.
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from listing_manifest import checksums, content_key
+from storage_backends import LIST_PAGE_SIZE
+
+REQUEST_SECONDS = 0.05
+TRANSFER_MB_PER_SECOND = 50.0
+CONVERT_MB_PER_SECOND = 20.0
+
+MB = 1024 * 1024
+
+
+def estimate_seconds(listed, copies, conversions, organizer):
+    """
+    Rough wall time for a run: listing, then copy batches and conversion
+    transfers across the I/O threads, overlapped with CPU-bound
+    conversion work across the conversion processes.
+    """
+    listing = math.ceil(listed / LIST_PAGE_SIZE) * REQUEST_SECONDS
+    io_seconds = math.ceil(copies / organizer.batch_size) * REQUEST_SECONDS
+    cpu_seconds = 0.0
+    for size, cpu_bound in conversions:
+        # download and upload, taking the output to be about the input's size
+        io_seconds += 2 * REQUEST_SECONDS + 2 * size / MB / TRANSFER_MB_PER_SECOND
+        if cpu_bound:
+            cpu_seconds += size / MB / CONVERT_MB_PER_SECOND
+    processes = organizer.convert_workers or 1
+    return listing + max(io_seconds / organizer.workers, cpu_seconds / processes)
+
+
+def plan_run(organizer):
+    """
+    The plan organize_documents would carry out, as a JSON-ready dict.
+    """
+    outputs = (organizer.pdf_folder, organizer.txt_folder)
+    listed, stored, planned = 0, {}, []
+    for blob in organizer.list_healthcare_files():
+        listed += 1
+        if blob.name.startswith(outputs):
+            # Existing outputs are targets, never sources
+            stored[blob.name] = checksums(blob)
+            continue
+        try:
+            planned.append((blob, *organizer.plan_file(blob)))
+        except Exception as e:
+            planned.append((blob, 'error', None, str(e)))
+
+    actions, targets, conversions = [], defaultdict(list), {}
+    counts = defaultdict(int)
+    bytes_copied = bytes_converted = 0
+    copy_requests, convert_costs = 0, []
+    for blob, action, target_path, key in planned:
+        entry = {"source": blob.name, "size": blob.size, "target": target_path}
+        if action == 'error':
+            entry.update(action="error", error=key, target=None)
+        elif (organizer.manifest is not None
+              and organizer.is_up_to_date(blob, action, target_path, stored)):
+            entry["action"] = "skip"
+        elif action == 'convert':
+            converter = organizer.converter_for(blob)
+            content = content_key(blob)
+            content = (organizer.get_file_extension(blob.name), content) if content is not None else None
+            entry["converter"] = converter.extension
+            if content is not None and content in conversions:
+                entry.update(action="reuse", reuses=conversions[content])
+                copy_requests += 1
+            else:
+                if content is not None:
+                    conversions[content] = target_path
+                entry["action"] = "convert"
+                bytes_converted += blob.size
+                convert_costs.append((blob.size, converter.cpu_bound and organizer.convert_workers > 0))
+        else:
+            entry["action"] = "copy"
+            bytes_copied += blob.size
+            copy_requests += 1
+        counts[entry["action"]] += 1
+        if entry["target"] is not None:
+            targets[entry["target"]].append(blob.name)
+        actions.append(entry)
+
+    # The name index already resolved clashes; report them from there.
+    # Any target still shared here would be a bug in the reservation.
+    collisions = list(organizer.names.collisions) + [
+        {"target": target, "sources": sources}
+        for target, sources in sorted(targets.items()) if len(sources) > 1
+    ]
+    seconds = estimate_seconds(listed, copy_requests, convert_costs, organizer)
+    return {
+        "storage": organizer.storage_uri,
+        "planned_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "incremental": organizer.manifest is not None,
+        "concurrency": {
+            "workers": organizer.workers,
+            "batch_size": organizer.batch_size,
+            "convert_workers": organizer.convert_workers,
+        },
+        "summary": {
+            "listed": listed,
+            "copy": counts["copy"],
+            "convert": counts["convert"],
+            "reuse": counts["reuse"],
+            "skip": counts["skip"],
+            "error": counts["error"],
+            "collisions": len(collisions),
+            "bytes_copied": bytes_copied,
+            "bytes_converted": bytes_converted,
+            "estimated_seconds": round(seconds, 1),
+        },
+        "assumptions": {
+            "request_seconds": REQUEST_SECONDS,
+            "transfer_mb_per_second": TRANSFER_MB_PER_SECOND,
+            "convert_mb_per_second": CONVERT_MB_PER_SECOND,
+        },
+        "collisions": collisions,
+        "actions": actions,
+    }
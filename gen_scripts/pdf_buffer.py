@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+PDF Buffer
+In-memory targets for SimpleDocTemplate so rendered PDFs go straight from
+memory to the uploader. With a spill threshold set, documents that outgrow
+it roll over to an anonymous temp file that is removed once closed.
+"""
+
+import io
+import tempfile
+
+_settings = {"spill_bytes": None}
+
+
+def configure_pdf_buffers(spill_bytes=None):
+    _settings["spill_bytes"] = spill_bytes or None
+
+
+def new_pdf_buffer():
+    spill_bytes = _settings["spill_bytes"]
+    if spill_bytes:
+        return tempfile.SpooledTemporaryFile(max_size=spill_bytes, suffix=".pdf")
+    return io.BytesIO()
+
+
+def buffer_size(buffer):
+    """
+    Size of a rendered buffer without copying its contents.
+    """
+    if isinstance(buffer, io.BytesIO):
+        return buffer.getbuffer().nbytes
+    position = buffer.tell()
+    size = buffer.seek(0, io.SEEK_END)
+    buffer.seek(position)
+    return size
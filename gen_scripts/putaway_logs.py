@@ -1,83 +1,56 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
-import os
+from corpus_runner import run_cli
+from doc_spec import compile_spec
+from value_pools import get_pools
 
 fake = Faker()
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 GCS_PATH = "Logistics Document Inventory (High‑Volume, High‑Velocity)/Warehouse & Inventory/Put‑away & Location Assignment Logs"
 
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
+def putaway_metadata():
+    return [
+        ["Log ID", f"PA-{fake.random_int(1000, 9999)}"],
+        ["Warehouse", fake.company() + " Warehouse"],
+        ["Supervisor", fake.name()],
+        ["Date", fake.date_this_year().strftime("%Y-%m-%d")]
+    ]
+
+def putaway_items(n):
+    batch = get_pools().batch(n)
+    codes = batch.integers(10000, 99999).tolist()
+    words = batch.draw("word")
+    color_names = batch.draw("color_name")
+    qtys = batch.integers(5, 100).tolist()
+    zones = batch.choice(["A", "B", "C", "D"])
+    zone_numbers = batch.integers(1, 5).tolist()
+    bins = batch.integers(100, 999).tolist()
+    times = batch.draw("time", pattern="%H:%M")
+    rows = []
+    for i in range(n):
+        zone = f"{zones[i]}{zone_numbers[i]}"
+        rows.append([f"SKU-{codes[i]}", f"{words[i].capitalize()} - {color_names[i]}", qtys[i], zone,
+                     f"{zone}-{bins[i]}", times[i]])
+    return rows
+
+PUTAWAY_SPEC = {
+    "destination": f"{GCS_PATH}/{{filename}}",
+    "margins": [40, 40, 40, 30],
+    "sections": [
+        {"kind": "title", "text": "Put‑away & Location Assignment Log"},
+        {"kind": "spacer", "height": 12},
+        {"kind": "fields", "rows": putaway_metadata, "widths": [120, 330]},
+        {"kind": "spacer", "height": 12},
+        {"kind": "table", "batch": putaway_items, "count": [6, 12], "valign": "TOP",
+         "columns": ["Item Code", "Description", "Quantity", "Storage Zone", "Bin/Location", "Put-away Time"],
+         "widths": [80, 140, 60, 70, 100, 70]},
+    ],
+}
+
+PUTAWAY_PLAN = compile_spec(PUTAWAY_SPEC)
 
 def generate_putaway_log(filename):
-    styles = getSampleStyleSheet()
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=30)
-        elements = []
+    PUTAWAY_PLAN.build(filename)
 
-        elements.append(Paragraph("Put‑away & Location Assignment Log", styles["Title"]))
-        elements.append(Spacer(1, 12))
-
-        # Metadata
-        log_id = f"PA-{fake.random_int(1000, 9999)}"
-        warehouse = fake.company() + " Warehouse"
-        supervisor = fake.name()
-        date = fake.date_this_year().strftime("%Y-%m-%d")
-
-        metadata = [
-            ["Log ID", log_id],
-            ["Warehouse", warehouse],
-            ["Supervisor", supervisor],
-            ["Date", date]
-        ]
-        meta_table = Table(metadata, colWidths=[120, 330])
-        meta_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey)
-        ]))
-        elements.append(meta_table)
-        elements.append(Spacer(1, 12))
-
-        # Table Header
-        data = [["Item Code", "Description", "Quantity", "Storage Zone", "Bin/Location", "Put-away Time"]]
-        for _ in range(random.randint(6, 12)):
-            code = f"SKU-{fake.random_int(10000, 99999)}"
-            desc = fake.word().capitalize() + " - " + fake.color_name()
-            qty = random.randint(5, 100)
-            zone = random.choice(["A", "B", "C", "D"]) + str(random.randint(1, 5))
-            location = f"{zone}-{random.randint(100, 999)}"
-            time = fake.time(pattern="%H:%M")
-            data.append([code, desc, qty, zone, location, time])
-
-        table = Table(data, colWidths=[80, 140, 60, 70, 100, 70])
-        table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-            ('VALIGN', (0,0), (-1,-1), 'TOP')
-        ]))
-        elements.append(table)
-
-        doc.build(elements)
-
-        # Upload
-        upload_to_gcs(
-            BUCKET_NAME,
-            tmp.name,
-            f"{GCS_PATH}/{filename}"
-        )
-
-# === Generate and upload 150 logs ===
+# === Generate and upload 300 documents ===
 if __name__ == "__main__":
-    for i in range(300):
-        file_name = f"putaway_log_{i+1}.pdf"
-        generate_putaway_log(file_name)
+    run_cli([(generate_putaway_log, f"putaway_log_{i+1}.pdf") for i in range(300)], STORAGE_URI)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Retry
+Jittered exponential backoff for storage requests, shared by the upload
+queue and the organizer's copy engine. Only transient failures are
+retried; a missing object or a file that will not parse fails at once.
+"""
+
+import random
+import time
+
+try:
+    from google.api_core import exceptions as gcs_errors
+except ImportError:  # local and in-memory storage only
+    gcs_errors = None
+try:
+    import requests
+except ImportError:
+    requests = None
+
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 0.5
+
+# Private, so jitter drawn on uploader threads never touches the random
+# state a document is being built from
+_jitter = random.Random()
+
+
+def is_transient(error):
+    """
+    Whether a failed request is worth retrying: throttling (429), server
+    errors (5xx) and dropped or timed-out connections.
+    """
+    if gcs_errors is not None and isinstance(error, gcs_errors.GoogleAPICallError):
+        return isinstance(error, (gcs_errors.TooManyRequests, gcs_errors.ServerError))
+    if requests is not None and isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def call_with_retry(fn, *args, label, attempts=MAX_ATTEMPTS, backoff=BACKOFF_SECONDS):
+    """
+    Call fn(*args), retrying transient failures with jittered exponential
+    backoff. Other errors, and the last one once attempts are exhausted,
+    are re-raised.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(*args)
+        except Exception as e:
+            if attempt == attempts or not is_transient(e):
+                raise
+            delay = backoff * 2 ** (attempt - 1) * _jitter.uniform(0.5, 1.5)
+            print(f"↻ Retrying {label} in {delay:.1f}s (attempt {attempt}): {e}")
+            time.sleep(delay)
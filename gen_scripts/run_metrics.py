@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Run Metrics
+Counters, per-operation latency histograms and rolling throughput for the
+organizer. Operations (list, copy, download, convert, upload) are timed
+with RunMetrics.timed(); every finished file is reported with file_done(),
+which feeds a rolling files/s and MB/s window and prints a progress line
+at most once every PROGRESS_SECONDS, instead of one line per file. With a
+path, progress snapshots and a final summary are written as JSON lines.
+
+Histogram buckets double from 1 ms, so percentiles are upper bounds
+accurate to a factor of two, at a fixed cost per sample.
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+PROGRESS_SECONDS = 5.0
+WINDOW_SECONDS = 30.0
+BUCKET_BOUNDS = tuple(0.001 * 2 ** i for i in range(18))  # 1 ms .. ~131 s
+
+MB = 1024 * 1024
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+
+    def add(self, seconds, nbytes=0):
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.bytes += nbytes
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the given fraction of samples.
+        """
+        if not self.count:
+            return 0.0
+        rank, seen = fraction * self.count, 0
+        for bound, n in zip(BUCKET_BOUNDS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        buckets = {f"le_{bound:g}": n for bound, n in zip(BUCKET_BOUNDS, self.buckets) if n}
+        if self.buckets[-1]:
+            buckets["inf"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "p50_seconds": round(self.percentile(0.5), 6),
+            "p90_seconds": round(self.percentile(0.9), 6),
+            "p99_seconds": round(self.percentile(0.99), 6),
+            "max_seconds": round(self.max, 6),
+            "bytes": self.bytes,
+            "buckets": buckets,
+        }
+
+
+class RunMetrics:
+    def __init__(self, path=None, progress_seconds=PROGRESS_SECONDS, window_seconds=WINDOW_SECONDS,
+                 clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.progress_seconds = progress_seconds
+        self.window_seconds = window_seconds
+        self.counters = defaultdict(int)
+        self.histograms = defaultdict(LatencyHistogram)
+        self.files = 0
+        self.bytes = 0
+        self._window = deque()
+        self._lock = threading.Lock()
+        self._out = None
+        self.started = self._last_progress = self.clock()
+
+    def start(self):
+        """
+        Reset the clock and open the JSONL export, if any.
+        """
+        self.started = self._last_progress = self.clock()
+        if self.path:
+            self._out = open(self.path, "w", encoding="utf-8")
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def observe(self, operation, seconds, nbytes=0):
+        with self._lock:
+            self.histograms[operation].add(seconds, nbytes)
+
+    @contextmanager
+    def timed(self, operation, nbytes=0):
+        """
+        Time the block as one operation; failed attempts are timed too,
+        under "<operation>_failed".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(f"{operation}_failed", time.perf_counter() - start)
+            raise
+        self.observe(operation, time.perf_counter() - start, nbytes)
+
+    def timed_iter(self, operation, iterable):
+        """
+        Yield from iterable, timing each step (e.g. a paged listing, where
+        the slow steps are the page fetches).
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(operation, time.perf_counter() - start)
+            yield item
+
+    def file_done(self, nbytes=0):
+        """
+        Record a finished file and print a progress line if one is due.
+        """
+        now = self.clock()
+        with self._lock:
+            self.files += 1
+            self.bytes += nbytes
+            self._window.append((now, nbytes))
+            if now - self._last_progress < self.progress_seconds:
+                return
+            self._last_progress = now
+            snapshot = self._snapshot(now, "progress")
+        self._emit(snapshot)
+        print(f"… {snapshot['files']} files, {snapshot['files_per_second']:.1f} files/s, "
+              f"{snapshot['mb_per_second']:.2f} MB/s, {snapshot['counters'].get('errors', 0)} errors")
+
+    def _snapshot(self, now, kind):
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+        span = min(self.window_seconds, now - self.started) or 1e-9
+        return {
+            "type": kind,
+            "elapsed_seconds": round(now - self.started, 3),
+            "files": self.files,
+            "bytes": self.bytes,
+            "files_per_second": round(len(self._window) / span, 3),
+            "mb_per_second": round(sum(n for _, n in self._window) / MB / span, 3),
+            "counters": dict(self.counters),
+        }
+
+    def _emit(self, record):
+        if self._out is not None:
+            with self._lock:
+                self._out.write(json.dumps(record, sort_keys=True) + "\n")
+                self._out.flush()
+
+    def summary(self):
+        """
+        Totals, average throughput and every operation's histogram.
+        """
+        now = self.clock()
+        with self._lock:
+            record = self._snapshot(now, "summary")
+            elapsed = (now - self.started) or 1e-9
+            record["files_per_second"] = round(self.files / elapsed, 3)
+            record["mb_per_second"] = round(self.bytes / MB / elapsed, 3)
+            record["operations"] = {name: h.summary() for name, h in sorted(self.histograms.items())}
+        return record
+
+    def finish(self):
+        """
+        Write the final summary and close the export.
+        """
+        record = self.summary()
+        self._emit(record)
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        return record
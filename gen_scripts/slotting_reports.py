@@ -1,86 +1,65 @@
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer, PageBreak
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from google.cloud import storage
 from faker import Faker
-import tempfile
-import random
-from datetime import datetime
+from corpus_clock import now
+from corpus_runner import run_cli
+from doc_random import rng
+from doc_spec import compile_spec
+from value_pools import get_pools
 
 fake = Faker()
 
-BUCKET_NAME = "dummy-dromos-documents"
+STORAGE_URI = "gs://dummy-dromos-documents"
 GCS_PATH = "Logistics Document Inventory (High‑Volume, High‑Velocity)/Warehouse & Inventory/Slotting & Layout Analysis Reports"
 
-def upload_to_gcs(bucket_name, source_path, destination_blob_name):
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_filename(source_path)
-    print(f"✅ Uploaded: gs://{bucket_name}/{destination_blob_name}")
+def slotting_metadata():
+    return [
+        ["Warehouse", fake.company()],
+        ["Report ID", f"SLOT-{rng.randint(1000, 9999)}"],
+        ["Generated On", now().strftime("%Y-%m-%d %H:%M")],
+        ["Analyst", fake.name()],
+        ["Zone Analyzed", fake.random_element(["Zone A", "Bulk Storage", "Fast Pick Area", "Receiving Dock"])],
+    ]
 
-def generate_slotting_layout_report(filename):
-    styles = getSampleStyleSheet()
-    wrap_style = ParagraphStyle("wrap", fontSize=8, leading=10)
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        doc = SimpleDocTemplate(tmp.name, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-        elements = []
-
-        elements.append(Paragraph("Slotting & Layout Analysis Report", styles["Title"]))
-        elements.append(Spacer(1, 12))
-
-        # Report Metadata
-        meta = [
-            ["Warehouse", fake.company()],
-            ["Report ID", f"SLOT-{random.randint(1000, 9999)}"],
-            ["Generated On", datetime.now().strftime("%Y-%m-%d %H:%M")],
-            ["Analyst", fake.name()],
-            ["Zone Analyzed", fake.random_element(["Zone A", "Bulk Storage", "Fast Pick Area", "Receiving Dock"])],
-        ]
-        meta_table = Table(meta, colWidths=[150, 330])
-        meta_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-        ]))
-        elements.append(meta_table)
-        elements.append(Spacer(1, 12))
+def slotting_items(n):
+    batch = get_pools().batch(n)
+    codes = batch.integers(1000, 9999).tolist()
+    descs = batch.draw("catch_phrase")
+    curr_rows, curr_bays = batch.choice(['A', 'B', 'C']), batch.integers(1, 20).tolist()
+    sugg_rows, sugg_bays = batch.choice(['A', 'B', 'C']), batch.integers(1, 20).tolist()
+    turns = batch.integers(1, 20).tolist()
+    freqs = batch.choice(["High", "Medium", "Low"])
+    reasons = batch.draw("sentence", nb_words=6)
+    return [
+        [f"SKU-{codes[i]}", descs[i], f"{curr_rows[i]}-{curr_bays[i]}", f"{sugg_rows[i]}-{sugg_bays[i]}",
+         turns[i], freqs[i], reasons[i]]
+        for i in range(n)
+    ]
 
-        # Slotting Table
-        slot_data = [["Item Code", "Description", "Current Slot", "Suggested Slot", "Turns/Month", "Pick Freq", "Reason for Change"]]
-        for _ in range(random.randint(12, 20)):
-            code = f"SKU-{random.randint(1000,9999)}"
-            desc = Paragraph(fake.catch_phrase(), wrap_style)
-            curr_slot = f"{random.choice(['A', 'B', 'C'])}-{random.randint(1,20)}"
-            sugg_slot = f"{random.choice(['A', 'B', 'C'])}-{random.randint(1,20)}"
-            turns = random.randint(1, 20)
-            freq = fake.random_element(["High", "Medium", "Low"])
-            reason = Paragraph(fake.sentence(nb_words=6), wrap_style)
-            slot_data.append([code, desc, curr_slot, sugg_slot, turns, freq, reason])
+SLOTTING_SPEC = {
+    "destination": f"{GCS_PATH}/{{filename}}",
+    "margins": 30,
+    "sections": [
+        {"kind": "title", "text": "Slotting & Layout Analysis Report"},
+        {"kind": "spacer", "height": 12},
+        {"kind": "fields", "rows": slotting_metadata, "widths": [150, 330]},
+        {"kind": "spacer", "height": 12},
+        {"kind": "table", "batch": slotting_items, "count": [12, 20], "wrap": [1, 6],
+         "grid": 0.4, "font_size": 8, "valign": "TOP",
+         "columns": ["Item Code", "Description", "Current Slot", "Suggested Slot", "Turns/Month", "Pick Freq", "Reason for Change"],
+         "widths": [60, 140, 70, 70, 60, 60, 100]},
+        {"kind": "spacer", "height": 20},
+        {"kind": "heading", "text": "Layout Notes"},
+        {"kind": "paragraph", "generate": lambda: fake.paragraph(nb_sentences=4)},
+        {"kind": "spacer", "height": 12},
+        {"kind": "heading", "text": "Recommendations"},
+        {"kind": "paragraph", "generate": lambda: fake.paragraph(nb_sentences=3)},
+    ],
+}
 
-        slot_table = Table(slot_data, colWidths=[60, 140, 70, 70, 60, 60, 100])
-        slot_table.setStyle(TableStyle([
-            ('GRID', (0,0), (-1,-1), 0.4, colors.grey),
-            ('BACKGROUND', (0,0), (-1,0), colors.lightblue),
-            ('FONTSIZE', (0,0), (-1,-1), 8),
-            ('VALIGN', (0,0), (-1,-1), 'TOP')
-        ]))
-        elements.append(slot_table)
-        elements.append(Spacer(1, 20))
+SLOTTING_PLAN = compile_spec(SLOTTING_SPEC)
 
-        # Layout Summary
-        elements.append(Paragraph("Layout Notes", styles["Heading2"]))
-        elements.append(Paragraph(fake.paragraph(nb_sentences=4), styles["Normal"]))
-        elements.append(Spacer(1, 12))
-        elements.append(Paragraph("Recommendations", styles["Heading2"]))
-        elements.append(Paragraph(fake.paragraph(nb_sentences=3), styles["Normal"]))
-
-        doc.build(elements)
-
-        upload_to_gcs(BUCKET_NAME, tmp.name, f"{GCS_PATH}/{filename}")
+def generate_slotting_layout_report(filename):
+    SLOTTING_PLAN.build(filename)
 
-# === Generate 150 reports ===
+# === Generate and upload 300 documents ===
 if __name__ == "__main__":
-    for i in range(300):
-        generate_slotting_layout_report(f"slotting_layout_report_{i+1}.pdf")
+    run_cli([(generate_slotting_layout_report, f"slotting_layout_report_{i+1}.pdf") for i in range(300)], STORAGE_URI)
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Storage Backends
+Interchangeable object stores selected by URI, so the generators and the
+organizer can run against GCS, a local directory tree, an in-process
+memory store or a null sink:
+
+    gs://bucket            Google Cloud Storage
+    file:///data/corpus    local directory (a bare path works too)
+    memory://name          in-memory store, shared within one process
+    null://                discards everything; for render benchmarks
+"""
+
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+
+from pdf_buffer import buffer_size
+
+LIST_PAGE_SIZE = 1000
+HASH_READ_BYTES = 1024 * 1024
+# Only the object fields ObjectInfo carries, plus the paging token
+LIST_FIELDS = "items(name,size,md5Hash,crc32c,generation,contentType),nextPageToken"
+
+
+@dataclass
+class ObjectInfo:
+    name: str
+    size: int = 0
+    md5_hash: Optional[str] = None
+    crc32c: Optional[str] = None
+    generation: Optional[int] = None
+    content_type: Optional[str] = None
+
+
+def md5_base64(data) -> str:
+    """
+    MD5 digest in the base64 form GCS reports for md5_hash.
+    """
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+def _read_source(source) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        source.seek(0)
+        return source.read()
+    return Path(source).read_bytes()
+
+
+def _content_type(key, content_type):
+    return content_type or mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+class StorageBackend:
+    scheme = ""
+
+    def display(self, key) -> str:
+        return f"{self.scheme}://{key}"
+
+    def put(self, key, source, content_type=None) -> ObjectInfo:
+        """
+        Store a path, bytes, or readable buffer under key.
+        """
+        raise NotImplementedError
+
+    def list(self, prefix="") -> Iterator[ObjectInfo]:
+        """
+        Lazily yield the objects under prefix; callers should not assume
+        the whole listing is in memory.
+        """
+        raise NotImplementedError
+
+    def list_pages(self, prefix="") -> Iterator[list]:
+        """
+        The same listing a page (a list of up to LIST_PAGE_SIZE objects) at
+        a time; for remote backends each page is one request.
+        """
+        page = []
+        for info in self.list(prefix):
+            page.append(info)
+            if len(page) == LIST_PAGE_SIZE:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def stat(self, key) -> Optional[ObjectInfo]:
+        raise NotImplementedError
+
+    def read_bytes(self, key) -> bytes:
+        with self.open_read(key) as f:
+            return f.read()
+
+    def open_read(self, key):
+        raise NotImplementedError
+
+    def open_write(self, key, content_type=None):
+        raise NotImplementedError
+
+    def copy(self, source_key, target_key):
+        with self.open_read(source_key) as src, self.open_write(target_key) as dst:
+            shutil.copyfileobj(src, dst)
+
+    def copy_many(self, pairs):
+        """
+        Copy each (source_key, target_key) pair. Backends with a batch API
+        send them together; an error means any of the copies may have
+        failed.
+        """
+        for source_key, target_key in pairs:
+            self.copy(source_key, target_key)
+
+
+class GCSBackend(StorageBackend):
+    scheme = "gs"
+
+    def __init__(self, bucket_name):
+        self.bucket_name = bucket_name
+
+    @property
+    def bucket(self):
+        # Imported lazily so the other backends run without the GCS client
+        # libraries; looked up per call so forked workers get their own client
+        from gcs_session import get_bucket
+        return get_bucket(self.bucket_name)
+
+    def display(self, key):
+        return f"gs://{self.bucket_name}/{key}"
+
+    @staticmethod
+    def _info(blob):
+        return ObjectInfo(name=blob.name, size=blob.size or 0, md5_hash=blob.md5_hash,
+                          crc32c=blob.crc32c, generation=blob.generation,
+                          content_type=blob.content_type)
+
+    def put(self, key, source, content_type=None):
+        blob = self.bucket.blob(key)
+        content_type = _content_type(key, content_type)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            blob.upload_from_string(bytes(source), content_type=content_type)
+        elif hasattr(source, "read"):
+            source.seek(0)
+            blob.upload_from_file(source, size=buffer_size(source), content_type=content_type)
+        else:
+            blob.upload_from_filename(source, content_type=content_type)
+        return self._info(blob)
+
+    def list(self, prefix=""):
+        for page in self.list_pages(prefix):
+            yield from page
+
+    def list_pages(self, prefix=""):
+        blobs = self.bucket.list_blobs(prefix=prefix, page_size=LIST_PAGE_SIZE, fields=LIST_FIELDS)
+        for page in blobs.pages:
+            yield [self._info(blob) for blob in page]
+
+    def stat(self, key):
+        blob = self.bucket.get_blob(key)
+        return self._info(blob) if blob is not None else None
+
+    def read_bytes(self, key):
+        return self.bucket.blob(key).download_as_bytes()
+
+    def open_read(self, key):
+        return self.bucket.blob(key).open("rb")
+
+    def open_write(self, key, content_type=None):
+        # BlobWriter.flush() raises unless told to ignore it, and text
+        # wrappers flush their buffer when they finish
+        return self.bucket.blob(key).open("wb", content_type=_content_type(key, content_type),
+                                          ignore_flush=True)
+
+    def copy(self, source_key, target_key):
+        # rewrite rather than copy_blob: large or cross-class objects need
+        # several calls, and rewrite hands back a token to continue with
+        bucket = self.bucket
+        source, target = bucket.blob(source_key), bucket.blob(target_key)
+        token, _, _ = target.rewrite(source)
+        while token is not None:
+            token, _, _ = target.rewrite(source, token=token)
+
+    def copy_many(self, pairs):
+        from gcs_session import get_batch_client
+        client = get_batch_client()
+        bucket = client.bucket(self.bucket_name)
+        with client.batch():
+            for source_key, target_key in pairs:
+                bucket.copy_blob(bucket.blob(source_key), bucket, target_key)
+
+
+# Local file MD5s by absolute path, reused while size and mtime hold, so
+# listing a directory tree does not read every file again
+_local_digests = {}
+_local_digests_lock = threading.Lock()
+
+
+def _file_md5(path, stat, data=None):
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    key = os.path.abspath(path)
+    with _local_digests_lock:
+        cached = _local_digests.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    if data is None:
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_READ_BYTES), b""):
+                digest.update(block)
+        md5 = base64.b64encode(digest.digest()).decode("ascii")
+    else:
+        md5 = md5_base64(data)
+    with _local_digests_lock:
+        _local_digests[key] = (stamp, md5)
+    return md5
+
+
+class _LocalWriter(io.FileIO):
+    """
+    Writes to <path>.partial and moves it into place on close; leaving a
+    with block by an exception deletes it instead, so a failed write never
+    leaves a truncated target.
+    """
+    def __init__(self, path):
+        self._target = path
+        self._partial = path.with_name(path.name + ".partial")
+        super().__init__(self._partial, "wb")
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            os.replace(self._partial, self._target)
+
+    def discard(self):
+        if not self.closed:
+            super().close()
+        self._partial.unlink(missing_ok=True)
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+class LocalBackend(StorageBackend):
+    scheme = "file"
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, key):
+        return self.root / key
+
+    def display(self, key):
+        return str(self._path(key))
+
+    def _info(self, path, data=None):
+        stat = path.stat()
+        return ObjectInfo(name=path.relative_to(self.root).as_posix(), size=stat.st_size,
+                          md5_hash=_file_md5(path, stat, data),
+                          content_type=mimetypes.guess_type(path.name)[0])
+
+    def put(self, key, source, content_type=None):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".partial")
+        data = None
+        if isinstance(source, (str, os.PathLike)):
+            shutil.copyfile(source, partial)
+        else:
+            data = _read_source(source)
+            partial.write_bytes(data)
+        os.replace(partial, path)
+        return self._info(path, data)
+
+    def list(self, prefix=""):
+        directory = self._path(prefix) if not prefix or prefix.endswith("/") else self._path(prefix).parent
+        if not directory.is_dir():
+            return
+        for path in sorted(directory.rglob("*")):
+            name = path.relative_to(self.root).as_posix()
+            if path.is_file() and name.startswith(prefix) and not name.endswith(".partial"):
+                yield self._info(path)
+
+    def stat(self, key):
+        path = self._path(key)
+        return self._info(path) if path.is_file() else None
+
+    def open_read(self, key):
+        return open(self._path(key), "rb")
+
+    def open_write(self, key, content_type=None):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return _LocalWriter(path)
+
+    def copy(self, source_key, target_key):
+        target = self._path(target_key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self._path(source_key), target)
+
+
+class _MemoryWriter(io.BytesIO):
+    def __init__(self, store, key, content_type):
+        super().__init__()
+        self._store, self._key, self._content_type = store, key, content_type
+
+    def close(self):
+        if not self.closed:
+            self._store.put(self._key, self.getvalue(), self._content_type)
+        super().close()
+
+    def __exit__(self, exc_type, exc, tb):
+        # Store nothing if the with block failed
+        if exc_type is not None:
+            io.BytesIO.close(self)
+        else:
+            self.close()
+
+
+class MemoryBackend(StorageBackend):
+    scheme = "memory"
+
+    def __init__(self, name=""):
+        self.name = name
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def display(self, key):
+        return f"memory://{self.name}/{key}"
+
+    def put(self, key, source, content_type=None):
+        data = _read_source(source)
+        info = ObjectInfo(name=key, size=len(data), md5_hash=md5_base64(data),
+                          content_type=_content_type(key, content_type))
+        with self._lock:
+            self.objects[key] = (data, info)
+        return info
+
+    def list(self, prefix=""):
+        with self._lock:
+            infos = [info for key, (_, info) in sorted(self.objects.items()) if key.startswith(prefix)]
+        yield from infos
+
+    def stat(self, key):
+        with self._lock:
+            entry = self.objects.get(key)
+        return entry[1] if entry else None
+
+    def read_bytes(self, key):
+        with self._lock:
+            entry = self.objects.get(key)
+        if entry is None:
+            raise FileNotFoundError(self.display(key))
+        return entry[0]
+
+    def open_read(self, key):
+        return io.BytesIO(self.read_bytes(key))
+
+    def open_write(self, key, content_type=None):
+        return _MemoryWriter(self, key, content_type)
+
+    def copy(self, source_key, target_key):
+        self.put(target_key, self.read_bytes(source_key))
+
+
+class NullBackend(StorageBackend):
+    scheme = "null"
+
+    def __init__(self):
+        self.objects_written = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+    def put(self, key, source, content_type=None):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            size = len(source)
+        elif hasattr(source, "read"):
+            size = buffer_size(source)
+        else:
+            size = os.path.getsize(source)
+        with self._lock:
+            self.objects_written += 1
+            self.bytes_written += size
+        return ObjectInfo(name=key, size=size)
+
+    def list(self, prefix=""):
+        return iter(())
+
+    def stat(self, key):
+        return None
+
+    def open_read(self, key):
+        raise FileNotFoundError(self.display(key))
+
+    def open_write(self, key, content_type=None):
+        return _MemoryWriter(self, key, content_type)
+
+    def copy(self, source_key, target_key):
+        raise FileNotFoundError(self.display(source_key))
+
+
+_memory_stores = {}
+
+
+def open_backend(uri) -> StorageBackend:
+    parsed = urlparse(str(uri))
+    if parsed.scheme == "gs":
+        return GCSBackend(parsed.netloc)
+    if parsed.scheme == "memory":
+        return _memory_stores.setdefault(parsed.netloc, MemoryBackend(parsed.netloc))
+    if parsed.scheme == "null":
+        return NullBackend()
+    if parsed.scheme == "file":
+        return LocalBackend(parsed.netloc + parsed.path)
+    if parsed.scheme == "":
+        return LocalBackend(uri)
+    raise ValueError(f"Unsupported storage URI: {uri}")
+
+
+_settings = {"uri": None}
+_lock = threading.Lock()
+_owner_pid = None
+_default_backend = None
+
+
+def configure_storage(uri):
+    global _default_backend
+    with _lock:
+        _settings["uri"] = uri
+        _default_backend = None
+
+
+def get_storage() -> StorageBackend:
+    """
+    The backend selected with configure_storage(), opened once per process.
+    """
+    global _owner_pid, _default_backend
+    with _lock:
+        if _settings["uri"] is None:
+            raise RuntimeError("No storage configured; call configure_storage(uri) first")
+        if _default_backend is None or _owner_pid != os.getpid():
+            _default_backend = open_backend(_settings["uri"])
+            _owner_pid = os.getpid()
+        return _default_backend
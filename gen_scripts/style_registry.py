@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Style Registry
+Process-wide cache of the reportlab sample stylesheet, ParagraphStyles and
+TableStyles. Each style is built once and then shared read-only by every
+document a process renders; hit/miss counters show how much rebuilding
+the cache saves in a run. Styles a compiled layout plan resolved once and
+reuses on every render never reach the cache, so they are counted apart,
+as "reused".
+"""
+
+import threading
+from collections import Counter
+
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+
+_lock = threading.Lock()
+_stylesheet = None
+_paragraph_styles = {}
+_table_styles = {}
+_stats = Counter()
+
+
+def get_stylesheet():
+    """
+    The shared sample stylesheet. Treat it as read-only; register custom
+    styles with paragraph_style() rather than styles.add().
+    """
+    global _stylesheet
+    with _lock:
+        if _stylesheet is None:
+            _stylesheet = getSampleStyleSheet()
+            _stats["misses"] += 1
+        else:
+            _stats["hits"] += 1
+        return _stylesheet
+
+
+def paragraph_style(name, **attributes):
+    key = (name, tuple(sorted(attributes.items())))
+    with _lock:
+        style = _paragraph_styles.get(key)
+        if style is None:
+            style = _paragraph_styles[key] = ParagraphStyle(name, **attributes)
+            _stats["misses"] += 1
+        else:
+            _stats["hits"] += 1
+        return style
+
+
+def table_style(commands):
+    key = tuple(tuple(command) for command in commands)
+    with _lock:
+        style = _table_styles.get(key)
+        if style is None:
+            style = _table_styles[key] = TableStyle(commands)
+            _stats["misses"] += 1
+        else:
+            _stats["hits"] += 1
+        return style
+
+
+def count_reuse(n):
+    """
+    Count n styles resolved once up front and reused by a document (e.g. a
+    compiled LayoutPlan), which never passes through the lookups.
+    """
+    with _lock:
+        _stats["reused"] += n
+
+
+def style_stats():
+    with _lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "reused": _stats["reused"]}
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Upload Queue
+Bounded producer/consumer stage between PDF rendering and storage uploads.
+Renderers hand finished files or PDF buffers to queue_upload() and carry
+on; a pool of uploader threads drains the queue, retrying failed uploads
+with exponential backoff, and releases each buffer once it is done.
+Uploads queued while an UploadGroup is open (the corpus runner opens one
+per chunk) are counted against it, and the group hands back their
+manifest records as soon as the last of them lands, without the renderer
+waiting for it.
+"""
+
+import os
+import queue
+import threading
+
+from manifest import current_document, upload_record
+from retry import BACKOFF_SECONDS, MAX_ATTEMPTS, call_with_retry
+from storage_backends import get_storage
+
+UPLOAD_THREADS = 8
+MAX_PENDING = 32
+
+_STOP = object()
+
+
+class UploadError(RuntimeError):
+    pass
+
+
+def store_object(source, key):
+    storage = get_storage()
+    info = storage.put(key, source)
+    print(f"✅ Uploaded: {storage.display(key)}")
+    return info
+
+
+class UploadGroup:
+    """
+    A set of uploads tracked together. Uploads queued while the group is
+    open count against it; once it is closed and every one of them has
+    finished, on_done(records, failures) is called, from the uploader
+    thread that finished last (or from close() if nothing is pending).
+    """
+    def __init__(self, on_done):
+        self.on_done = on_done
+        self.records = []
+        self.failures = []
+        self._pending = 1  # held by the open group until close()
+        self._lock = threading.Lock()
+
+    def _add(self):
+        with self._lock:
+            self._pending += 1
+
+    def _finish(self, record=None, failure=None):
+        with self._lock:
+            if record is not None:
+                self.records.append(record)
+            if failure is not None:
+                self.failures.append(failure)
+            self._pending -= 1
+            done = self._pending == 0
+        if done:
+            self.on_done(sorted(self.records, key=lambda r: (r["index"], r["key"])), self.failures)
+
+    def close(self):
+        global _current_group
+        if _current_group is self:
+            _current_group = None
+        self._finish()
+
+
+class UploadQueue:
+    def __init__(self, upload=store_object, threads=UPLOAD_THREADS, max_pending=MAX_PENDING,
+                 max_attempts=MAX_ATTEMPTS, backoff=BACKOFF_SECONDS):
+        self.upload = upload
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._failures = []
+        self._failures_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._drain, name=f"uploader-{i}", daemon=True)
+            for i in range(threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, source, key, document=None, group=None):
+        """
+        Queue one upload. Blocks only while max_pending uploads are already
+        waiting, which keeps rendering from running unboundedly ahead.
+        """
+        if group is not None:
+            group._add()
+        self._queue.put((source, key, document, group))
+
+    def _drain(self):
+        while True:
+            args = self._queue.get()
+            if args is _STOP:
+                self._queue.task_done()
+                return
+            source, key, document, group = args
+            record = failure = None
+            try:
+                info = call_with_retry(self.upload, source, key, label=f"upload {key}",
+                                       attempts=self.max_attempts, backoff=self.backoff)
+                if document is not None and info is not None:
+                    record = upload_record(document, info)
+            except Exception as e:
+                print(f"✗ Upload failed for {key}: {e}")
+                failure = (key, e)
+                if group is None:
+                    with self._failures_lock:
+                        self._failures.append(failure)
+            finally:
+                if hasattr(source, "close"):
+                    source.close()
+                if group is not None:
+                    group._finish(record, failure)
+                self._queue.task_done()
+
+    def join(self):
+        """
+        Wait until every queued upload has finished, then raise UploadError
+        if any of them failed after exhausting its retries.
+        """
+        self._queue.join()
+        with self._failures_lock:
+            failures, self._failures = self._failures, []
+        if failures:
+            names = ", ".join(name for name, _ in failures)
+            raise UploadError(f"{len(failures)} upload(s) failed: {names}")
+
+    def close(self):
+        self.join()
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_settings = {"threads": UPLOAD_THREADS, "max_pending": MAX_PENDING}
+_lock = threading.Lock()
+_owner_pid = None
+_default_queue = None
+_current_group = None
+
+
+def configure_uploads(threads=UPLOAD_THREADS, max_pending=MAX_PENDING):
+    _settings.update(threads=threads, max_pending=max_pending)
+
+
+def get_upload_queue():
+    global _owner_pid, _default_queue
+    with _lock:
+        if _default_queue is None or _owner_pid != os.getpid():
+            _default_queue = UploadQueue(**_settings)
+            _owner_pid = os.getpid()
+        return _default_queue
+
+
+def open_group(on_done):
+    """
+    Start an UploadGroup that every queue_upload() until its close()
+    counts against.
+    """
+    global _current_group
+    _current_group = UploadGroup(on_done)
+    return _current_group
+
+
+def queue_upload(source, key):
+    document = current_document()
+    get_upload_queue().submit(source, key, dict(document) if document is not None else None,
+                              _current_group)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Value Pools
+Pre-generated pools of Faker values with vectorized NumPy sampling, for
+generators that fill dozens of table rows per document. Calling Faker's
+providers once per cell is a large share of generation time; instead each
+provider fills a pool once per process and rows are drawn from it by index
+a whole batch at a time.
+
+Pools are seeded from the pool seed and the provider name, so every worker
+process builds identical pools. Draws come from a NumPy generator seeded
+off doc_random, which the corpus runner reseeds for every document, so
+batches stay reproducible for a given corpus seed.
+"""
+
+import threading
+import zlib
+from datetime import date
+
+import numpy as np
+from faker import Faker
+
+from doc_random import rng
+
+POOL_SIZE = 4096
+POOL_SEED = 0
+
+_settings = {"size": POOL_SIZE, "seed": POOL_SEED}
+_lock = threading.Lock()
+_pools = None
+
+
+class ValuePools:
+    def __init__(self, size=POOL_SIZE, seed=POOL_SEED):
+        self.size = size
+        self.seed = seed
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def values(self, provider, **kwargs):
+        """
+        The pool for a Faker provider (and its arguments), built on first use.
+        """
+        key = (provider, tuple(sorted(kwargs.items())))
+        with self._lock:
+            pool = self._values.get(key)
+            if pool is None:
+                fake = Faker()
+                fake.seed_instance(zlib.crc32(f"{self.seed}:{key}".encode("utf-8")))
+                generate = getattr(fake, provider)
+                pool = self._values[key] = [generate(**kwargs) for _ in range(self.size)]
+            return pool
+
+    def batch(self, n):
+        return RowBatch(self, n, np.random.default_rng(rng.getrandbits(64)))
+
+
+class RowBatch:
+    """
+    Column-at-a-time draws for n table rows. Each method returns one value
+    per row, as plain Python values ready for a reportlab Table.
+    """
+    def __init__(self, pools, n, rng):
+        self.pools = pools
+        self.n = n
+        self.rng = rng
+
+    def draw(self, provider, **kwargs):
+        pool = self.pools.values(provider, **kwargs)
+        return [pool[i] for i in self.rng.integers(0, len(pool), self.n)]
+
+    def choice(self, options, p=None):
+        return [options[i] for i in self.rng.choice(len(options), self.n, p=p)]
+
+    def integers(self, low, high):
+        """
+        Inclusive on both ends, like random.randint.
+        """
+        return self.rng.integers(low, high + 1, self.n)
+
+    def amounts(self, low, high, decimals=2):
+        """
+        Uniform in [low, high), rounded to decimals places.
+        """
+        return np.round(self.rng.uniform(low, high, self.n), decimals)
+
+    def dates(self, start, end, fmt="%Y-%m-%d"):
+        """
+        Days uniform between start and end inclusive, formatted with fmt.
+        """
+        start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+        days = start + self.rng.integers(0, (end - start).astype(int) + 1, self.n)
+        return [d.strftime(fmt) for d in days.astype(date)]
+
+    def fractions(self):
+        """
+        Uniform in [0, 1), e.g. to scale another column row by row.
+        """
+        return self.rng.random(self.n)
+
+
+def configure_pools(size=POOL_SIZE, seed=POOL_SEED):
+    global _pools
+    with _lock:
+        _settings.update(size=size, seed=seed)
+        _pools = None
+
+
+def get_pools():
+    global _pools
+    with _lock:
+        if _pools is None:
+            _pools = ValuePools(**_settings)
+        return _pools
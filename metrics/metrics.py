@@ -1,12 +1,24 @@
-import difflib
+import hashlib
 import re
-from dataclasses import dataclass
-from typing import Dict, Tuple, List
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass
+from itertools import accumulate
+from typing import Dict, Tuple, List, Sequence
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import statistics
 from tabulate import tabulate
 
+# Bump whenever a change to the metrics would change their values, so
+# cached results from the old code are not reused. Note each bump here:
+#   1: Levenshtein CER/WER over shared-vocabulary tokens
+METRICS_VERSION = 1
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 @dataclass
 class OCRQualityMetrics:
     character_accuracy: float = 0.0
@@ -20,9 +32,228 @@ class OCRQualityMetrics:
     deletion_errors: int = 0
     substitution_errors: int = 0
 
+# === Tokenization ===
+# Each document is lowered and split once. The character metric reads the
+# normalized text; words and lines become integer codes from a vocabulary
+# shared by the pair, so the word and line alignments compare ints.
+@dataclass
+class TokenizedText:
+    chars: str
+    words: array
+    lines: array
+
+def tokenize(text: str, vocabulary: Dict[str, int]) -> TokenizedText:
+    words, lines, normalized = array('I'), array('I'), []
+    for line in text.lower().splitlines():
+        line_words = line.split()
+        if not line_words:
+            continue
+        for word in line_words:
+            words.append(vocabulary.setdefault(word, len(vocabulary)))
+        joined = " ".join(line_words)
+        lines.append(vocabulary.setdefault(joined, len(vocabulary)))
+        normalized.append(joined)
+    # Same text as normalize_text: every whitespace run becomes one space
+    return TokenizedText(" ".join(normalized), words, lines)
+
+# === Edit distance (Myers/Hyyrö bit-parallel Levenshtein) ===
+# Sequences are strings or token lists. One column of the DP matrix is kept
+# as two bit vectors (Python ints), so a whole column advances in a handful
+# of big-int operations per symbol of the other sequence.
+DP_CELLS = 4096  # below this many cells, count operations with a plain DP
+
+def _columns(pattern: Sequence, text: Sequence) -> Tuple[int, int]:
+    """Vertical +1/-1 delta vectors of the last DP column of pattern vs text."""
+    m = len(pattern)
+    mask = (1 << m) - 1
+    peq: Dict = {}
+    for i, symbol in enumerate(pattern):
+        peq[symbol] = peq.get(symbol, 0) | (1 << i)
+    vp, vn = mask, 0
+    for symbol in text:
+        eq = peq.get(symbol, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = (vn | ~(xh | vp)) & mask
+        hn = vp & xh
+        hp = (hp << 1) | 1
+        hn <<= 1
+        vp = (hn | ~(xv | hp)) & mask
+        vn = hp & xv & mask
+    return vp, vn
+
+def _last_column(pattern: Sequence, text: Sequence) -> List[int]:
+    """Distances from every prefix of pattern to all of text."""
+    m = len(pattern)
+    if m == 0:
+        return [len(text)]
+    vp, vn = _columns(pattern, text)
+    up, down = bin(vp)[2:].zfill(m)[::-1], bin(vn)[2:].zfill(m)[::-1]
+    return list(accumulate((int(u) - int(d) for u, d in zip(up, down)), initial=len(text)))
+
+def _trim(a: Sequence, b: Sequence) -> Tuple[Sequence, Sequence]:
+    """Drop the common prefix and suffix, which never cost an edit."""
+    start, limit = 0, min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < limit - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    return a[start:len(a) - end], b[start:len(b) - end]
+
+def levenshtein(a: Sequence, b: Sequence) -> int:
+    a, b = _trim(a, b)
+    # The Python loop runs over the shorter sequence, the big ints span the longer
+    if len(a) < len(b):
+        a, b = b, a
+    if not a:
+        return len(b)
+    return _last_column(a, b)[-1]
+
+def _dp_operations(ref: Sequence, hyp: Sequence) -> Tuple[int, int, int]:
+    n = len(hyp)
+    rows = [list(range(n + 1))]
+    for i, r in enumerate(ref, 1):
+        prev, row = rows[-1], [i]
+        for j, h in enumerate(hyp, 1):
+            row.append(min(prev[j - 1] + (r != h), prev[j] + 1, row[j - 1] + 1))
+        rows.append(row)
+    ins = dels = subs = 0
+    i, j = len(ref), n
+    while i or j:
+        if i and j and rows[i][j] == rows[i - 1][j - 1] + (ref[i - 1] != hyp[j - 1]):
+            subs += ref[i - 1] != hyp[j - 1]
+            i, j = i - 1, j - 1
+        elif i and rows[i][j] == rows[i - 1][j] + 1:
+            dels += 1
+            i -= 1
+        else:
+            ins += 1
+            j -= 1
+    return ins, dels, subs
+
+def edit_operations(ref: Sequence, hyp: Sequence) -> Tuple[int, int, int]:
+    """
+    Insertions, deletions and substitutions turning ref into hyp along one
+    minimal alignment; they sum to levenshtein(ref, hyp). Hirschberg's
+    split over bit-parallel columns keeps memory linear.
+    """
+    ref, hyp = _trim(ref, hyp)
+    if not ref or not hyp:
+        return len(hyp), len(ref), 0
+    if len(ref) * len(hyp) <= DP_CELLS or len(hyp) == 1:
+        return _dp_operations(ref, hyp)
+    mid = len(hyp) // 2
+    forward = _last_column(ref, hyp[:mid])
+    backward = _last_column(ref[::-1], hyp[mid:][::-1])
+    split = min(range(len(ref) + 1), key=lambda i: forward[i] + backward[len(ref) - i])
+    left = edit_operations(ref[:split], hyp[:mid])
+    right = edit_operations(ref[split:], hyp[mid:])
+    return left[0] + right[0], left[1] + right[1], left[2] + right[2]
+
+# === Anchored alignment for long documents ===
+# N-grams found exactly once in each text pin the alignment down; only the
+# stretches between consecutive anchors are aligned. The anchored distance
+# is never below the full one; anchor_error() measures the gap.
+ANCHOR_CHARS = 32
+ANCHOR_TOKENS = 6
+ANCHOR_MIN_CELLS = 10 ** 8  # "auto" alignment anchors above this many DP cells
+
+def _unique_grams(seq: Sequence, n: int) -> Dict:
+    gram = (lambda i: seq[i:i + n]) if isinstance(seq, str) else (lambda i: tuple(seq[i:i + n]))
+    counts = Counter(gram(i) for i in range(len(seq) - n + 1))
+    return {gram(i): i for i in range(len(seq) - n + 1) if counts[gram(i)] == 1}
+
+def find_anchors(ref: Sequence, hyp: Sequence, n: int) -> List[Tuple[int, int]]:
+    """
+    Start positions (i, j) of non-overlapping n-grams unique to and shared
+    by ref and hyp, increasing in both texts.
+    """
+    in_hyp = _unique_grams(hyp, n)
+    matches = sorted((i, in_hyp[g]) for g, i in _unique_grams(ref, n).items() if g in in_hyp)
+    # Longest run of matches increasing in j as well (patience sorting)
+    tails, tail_index, previous = [], [], [None] * len(matches)
+    for k, (_, j) in enumerate(matches):
+        slot = bisect_left(tails, j)
+        previous[k] = tail_index[slot - 1] if slot else None
+        if slot == len(tails):
+            tails.append(j)
+            tail_index.append(k)
+        else:
+            tails[slot], tail_index[slot] = j, k
+    chain, k = [], tail_index[-1] if tail_index else None
+    while k is not None:
+        chain.append(matches[k])
+        k = previous[k]
+    anchors, end_i, end_j = [], 0, 0
+    for i, j in reversed(chain):
+        if i >= end_i and j >= end_j:
+            anchors.append((i, j))
+            end_i, end_j = i + n, j + n
+    return anchors
+
+def anchored_segments(ref: Sequence, hyp: Sequence, n: int) -> List[Tuple[Sequence, Sequence]]:
+    """The (ref, hyp) stretches between anchors, which match exactly."""
+    segments, start_i, start_j = [], 0, 0
+    for i, j in find_anchors(ref, hyp, n):
+        segments.append((ref[start_i:i], hyp[start_j:j]))
+        start_i, start_j = i + n, j + n
+    segments.append((ref[start_i:], hyp[start_j:]))
+    return [(a, b) for a, b in segments if len(a) or len(b)]
+
+def _map_segments(fn, segments, workers: int):
+    if workers <= 1 or len(segments) <= 1:
+        return list(map(fn, *zip(*segments))) if segments else []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        refs, hyps = zip(*segments)
+        return list(pool.map(fn, refs, hyps, chunksize=max(1, len(segments) // (workers * 4))))
+
+def anchored_operations(ref: Sequence, hyp: Sequence, n: int, workers: int = 1) -> Tuple[int, int, int]:
+    """edit_operations summed over the segments between anchors."""
+    counts = _map_segments(edit_operations, anchored_segments(ref, hyp, n), workers)
+    return tuple(sum(c[k] for c in counts) for k in range(3)) if counts else (0, 0, 0)
+
+def anchored_levenshtein(ref: Sequence, hyp: Sequence, n: int, workers: int = 1) -> int:
+    return sum(_map_segments(levenshtein, anchored_segments(ref, hyp, n), workers))
+
+def anchor_error(ref: Sequence, hyp: Sequence, n: int = ANCHOR_CHARS) -> Dict:
+    """Anchored vs full distance for one pair: the error anchoring adds."""
+    full, anchored = levenshtein(ref, hyp), anchored_levenshtein(ref, hyp, n)
+    return {
+        "full_distance": full,
+        "anchored_distance": anchored,
+        "excess": anchored - full,
+        "excess_rate": error_rate(anchored - full, len(ref)),
+        "anchors": len(find_anchors(ref, hyp, n)),
+    }
+
+def error_rate(distance: int, reference_length: int) -> float:
+    if reference_length == 0:
+        return 0.0 if distance == 0 else 100.0
+    return distance / reference_length * 100
+
 class OCRQualityAssessor:
-    def __init__(self):
-        pass
+    def __init__(self, alignment: str = "full", segment_workers: int = 1):
+        # alignment: "full", "anchored", or "auto" (anchored for long pairs)
+        if alignment not in ("full", "anchored", "auto"):
+            raise ValueError(f"Unknown alignment mode: {alignment}")
+        self.alignment = alignment
+        self.segment_workers = segment_workers
+
+    def _anchored(self, ref: Sequence, hyp: Sequence) -> bool:
+        if self.alignment == "auto":
+            return len(ref) * len(hyp) > ANCHOR_MIN_CELLS
+        return self.alignment == "anchored"
+
+    def _operations(self, ref: Sequence, hyp: Sequence) -> Tuple[int, int, int]:
+        if self._anchored(ref, hyp):
+            return anchored_operations(ref, hyp, ANCHOR_CHARS, self.segment_workers)
+        return edit_operations(ref, hyp)
+
+    def _distance(self, ref: Sequence, hyp: Sequence) -> int:
+        if self._anchored(ref, hyp):
+            return anchored_levenshtein(ref, hyp, ANCHOR_TOKENS, self.segment_workers)
+        return levenshtein(ref, hyp)
 
     def load_file(self, file_path: str) -> str:
         return Path(file_path).read_text(encoding='utf-8').strip()
@@ -30,63 +261,162 @@ class OCRQualityAssessor:
     def normalize_text(self, text: str) -> str:
         return re.sub(r'\s+', ' ', text).strip().lower()
 
-    def calculate_character_accuracy(self, gt: str, ext: str) -> Tuple[float, int, int, int, int]:
-        gt_norm, ext_norm = self.normalize_text(gt), self.normalize_text(ext)
-        matcher = difflib.SequenceMatcher(None, gt_norm, ext_norm)
-        char_accuracy = matcher.ratio() * 100
-        opcodes = matcher.get_opcodes()
-        ins = sum(1 for op in opcodes if op[0] == 'insert')
-        dels = sum(1 for op in opcodes if op[0] == 'delete')
-        subs = sum(1 for op in opcodes if op[0] == 'replace')
-        return char_accuracy, 100-char_accuracy, ins, dels, subs
-
-    def calculate_word_accuracy(self, gt: str, ext: str) -> Tuple[float, float]:
-        gt_words = self.normalize_text(gt).split()
-        ext_words = self.normalize_text(ext).split()
-        matcher = difflib.SequenceMatcher(None, gt_words, ext_words)
-        acc = matcher.ratio() * 100
-        return acc, 100-acc
-
-    def calculate_line_accuracy(self, gt: str, ext: str) -> Tuple[float, float]:
-        gt_lines = [self.normalize_text(l) for l in gt.splitlines() if l.strip()]
-        ext_lines = [self.normalize_text(l) for l in ext.splitlines() if l.strip()]
-        matcher = difflib.SequenceMatcher(None, gt_lines, ext_lines)
-        acc = matcher.ratio() * 100
-        return acc, 100-acc
+    def tokenize_pair(self, gt: str, ext: str) -> Tuple[TokenizedText, TokenizedText]:
+        vocabulary: Dict[str, int] = {}
+        return tokenize(gt, vocabulary), tokenize(ext, vocabulary)
+
+    def _tokenized(self, gt, ext) -> Tuple[TokenizedText, TokenizedText]:
+        # The calculate_* methods take raw text or an already tokenized pair
+        if isinstance(gt, TokenizedText):
+            return gt, ext
+        return self.tokenize_pair(gt, ext)
+
+    def calculate_character_accuracy(self, gt, ext) -> Tuple[float, float, int, int, int]:
+        # CER = Levenshtein distance / ground-truth length; accuracy floors at 0
+        gt, ext = self._tokenized(gt, ext)
+        ins, dels, subs = self._operations(gt.chars, ext.chars)
+        cer = error_rate(ins + dels + subs, len(gt.chars))
+        return max(0.0, 100 - cer), cer, ins, dels, subs
+
+    def calculate_word_accuracy(self, gt, ext) -> Tuple[float, float]:
+        gt, ext = self._tokenized(gt, ext)
+        wer = error_rate(self._distance(gt.words, ext.words), len(gt.words))
+        return max(0.0, 100 - wer), wer
+
+    def calculate_line_accuracy(self, gt, ext) -> Tuple[float, float]:
+        gt, ext = self._tokenized(gt, ext)
+        ler = error_rate(self._distance(gt.lines, ext.lines), len(gt.lines))
+        return max(0.0, 100 - ler), ler
 
     def assess_pair(self, gt_file: str, ocr_file: str) -> Dict:
-        gt, ext = self.load_file(gt_file), self.load_file(ocr_file)
+        gt, ext = self.tokenize_pair(self.load_file(gt_file), self.load_file(ocr_file))
 
         char_acc, cer, ins, dels, subs = self.calculate_character_accuracy(gt, ext)
         word_acc, wer = self.calculate_word_accuracy(gt, ext)
         line_acc, ler = self.calculate_line_accuracy(gt, ext)
 
-        return {
-            "file": Path(gt_file).name,
-            "character_accuracy": char_acc,
-            "character_error_rate": cer,
-            "word_accuracy": word_acc,
-            "word_error_rate": wer,
-            "line_accuracy": line_acc,
-            "line_error_rate": ler,
-            "insertion_errors": ins,
-            "deletion_errors": dels,
-            "substitution_errors": subs
-        }
+        metrics = OCRQualityMetrics(
+            character_accuracy=char_acc,
+            character_error_rate=cer,
+            word_accuracy=word_acc,
+            word_error_rate=wer,
+            line_accuracy=line_acc,
+            line_error_rate=ler,
+            edit_distance=ins + dels + subs,
+            insertion_errors=ins,
+            deletion_errors=dels,
+            substitution_errors=subs,
+        )
+        return {"file": Path(gt_file).name, **asdict(metrics)}
 
-def batch_assessment(ground_truth_dir: str, output_dir: str, report_file="quality_report.json"):
-    assessor = OCRQualityAssessor()
+# === Result cache ===
+class ResultCache:
+    """
+    Per-pair metric results on disk, keyed by the SHA-256 of the ground
+    truth and OCR files and METRICS_VERSION. Least recently used entries
+    are dropped once the cache exceeds max_bytes.
+    """
+    def __init__(self, path: str, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = self.misses = 0
+        if self.path.exists():
+            try:
+                self.entries.update(json.loads(self.path.read_text(encoding="utf-8")))
+            except (ValueError, OSError):
+                print(f"⚠️ Ignoring unreadable cache {self.path}")
+
+    @staticmethod
+    def key(gt_file: Path, ocr_file: Path, alignment: str = "full") -> str:
+        digests = [hashlib.sha256(Path(f).read_bytes()).hexdigest() for f in (gt_file, ocr_file)]
+        return f"{digests[0]}:{digests[1]}:{METRICS_VERSION}:{alignment}"
+
+    def get(self, key: str):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: Dict):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+
+    def save(self):
+        # Entries are kept oldest-access first; evict from the front
+        sizes = {key: len(json.dumps({key: value})) for key, value in self.entries.items()}
+        total = sum(sizes.values())
+        while self.entries and total > self.max_bytes:
+            key, _ = self.entries.popitem(last=False)
+            total -= sizes[key]
+        partial = self.path.with_name(self.path.name + ".partial")
+        partial.write_text(json.dumps(self.entries), encoding="utf-8")
+        os.replace(partial, self.path)
+
+_assessors: Dict[Tuple[str, int], OCRQualityAssessor] = {}
+
+def _assess_pair(gt_file: Path, ocr_file: Path, alignment: str = "full", segment_workers: int = 1) -> Dict:
+    # Runs in the pool's processes; one assessor per process and mode
+    key = (alignment, segment_workers)
+    if key not in _assessors:
+        _assessors[key] = OCRQualityAssessor(alignment, segment_workers)
+    return _assessors[key].assess_pair(gt_file, ocr_file)
+
+def assess_pairs(pairs: List[Tuple[Path, Path]], workers: int = 1, alignment: str = "full",
+                 segment_workers: int = 1):
+    """
+    Yield each pair's report in input order. With more than one worker the
+    pairs are scored in a process pool, in chunks, and each report is
+    yielded as soon as it and every report before it are done. Only a
+    serial run (workers=1) spreads one pair's anchored segments over
+    segment_workers processes instead.
+    """
+    modes = [alignment] * len(pairs)
+    if workers <= 1 or len(pairs) <= 1:
+        segments = [segment_workers] * len(pairs)
+        yield from map(_assess_pair, *zip(*pairs), modes, segments) if pairs else ()
+        return
+    chunksize = max(1, len(pairs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=min(workers, len(pairs))) as pool:
+        yield from pool.map(_assess_pair, *zip(*pairs), modes, chunksize=chunksize)
+
+def batch_assessment(ground_truth_dir: str, output_dir: str, report_file="quality_report.json",
+                     workers: int = 1, cache_file=None, cache_max_bytes: int = CACHE_MAX_BYTES,
+                     alignment: str = "full", segment_workers: int = 1):
     gt_dir, out_dir = Path(ground_truth_dir), Path(output_dir)
 
-    reports: List[Dict] = []
+    pairs: List[Tuple[Path, Path]] = []
     for gt_file in gt_dir.glob("*.md"):
         ocr_file = out_dir / gt_file.name.replace("ground_truth_", "")
         if ocr_file.exists():
-            report = assessor.assess_pair(gt_file, ocr_file)
-            reports.append(report)
+            pairs.append((gt_file, ocr_file))
         else:
             print(f"⚠️ No OCR output for {gt_file.name}")
 
+    # Only pairs whose files changed since a cached run are scored again
+    cache = ResultCache(cache_file, cache_max_bytes) if cache_file else None
+    keys = [ResultCache.key(*pair, alignment) for pair in pairs] if cache else [None] * len(pairs)
+    cached = [cache.get(key) if cache else None for key in keys]
+    todo = [pair for pair, result in zip(pairs, cached) if result is None]
+
+    # Reports come back in listing order, so the result matches a serial run
+    scored = assess_pairs(todo, workers, alignment, segment_workers)
+    reports: List[Dict] = []
+    for (gt_file, _), key, result in zip(pairs, keys, cached):
+        if result is None:
+            report = next(scored)
+            if cache:
+                cache.put(key, {k: v for k, v in report.items() if k != "file"})
+        else:
+            report = {"file": Path(gt_file).name, **result}
+        reports.append(report)
+    if cache:
+        cache.save()
+        print(f"🗃️ Cache: {cache.hits} reused, {cache.misses} scored")
+
     # Compute averages
     avg_report = {}
     if reports:
@@ -121,5 +451,47 @@ def batch_assessment(ground_truth_dir: str, output_dir: str, report_file="qualit
     print(f"\n💾 Report saved to {report_file}")
     return final_report
 
+def anchor_check(ground_truth_dir: str, output_dir: str) -> List[Dict]:
+    """Error bound of anchored alignment against full alignment, per pair."""
+    assessor = OCRQualityAssessor()
+    rows = []
+    for gt_file in sorted(Path(ground_truth_dir).glob("*.md")):
+        ocr_file = Path(output_dir) / gt_file.name.replace("ground_truth_", "")
+        if ocr_file.exists():
+            gt, ext = assessor.tokenize_pair(assessor.load_file(gt_file), assessor.load_file(ocr_file))
+            rows.append({"file": gt_file.name, **anchor_error(gt.chars, ext.chars)})
+    headers = ["File", "Anchors", "Full", "Anchored", "Excess", "Excess (% of GT)"]
+    table = [[r["file"], r["anchors"], r["full_distance"], r["anchored_distance"], r["excess"],
+              f"{r['excess_rate']:.3f}"] for r in rows]
+    print("\n⚓ Anchored vs full alignment:\n")
+    print(tabulate(table, headers=headers, tablefmt="pretty"))
+    return rows
+
 if __name__ == "__main__":
-    batch_assessment("ground_truth", "output_files")
+    import argparse
+    parser = argparse.ArgumentParser(description="Score OCR outputs against their ground truth")
+    parser.add_argument("ground_truth_dir", nargs="?", default="ground_truth")
+    parser.add_argument("output_dir", nargs="?", default="output_files")
+    parser.add_argument("--report", default="quality_report.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes scoring pairs in parallel (1 = serial)")
+    parser.add_argument("--cache", default=".quality_cache.json",
+                        help="per-pair result cache; unchanged pairs are not rescored")
+    parser.add_argument("--no-cache", action="store_true", help="score every pair")
+    parser.add_argument("--cache-max-bytes", type=int, default=CACHE_MAX_BYTES)
+    parser.add_argument("--alignment", choices=("full", "anchored", "auto"), default="auto",
+                        help="anchored aligns only between shared unique n-grams; auto does so for long pairs")
+    parser.add_argument("--segment-workers", type=int, default=1,
+                        help="processes aligning one anchored pair's segments (needs --workers 1)")
+    parser.add_argument("--anchor-check", action="store_true",
+                        help="print anchored vs full character distance per pair instead of a report")
+    args = parser.parse_args()
+    if args.segment_workers > 1 and args.workers > 1:
+        parser.error("--segment-workers only applies to a serial run (--workers 1)")
+    if args.anchor_check:
+        anchor_check(args.ground_truth_dir, args.output_dir)
+    else:
+        batch_assessment(args.ground_truth_dir, args.output_dir, args.report, workers=args.workers,
+                         cache_file=None if args.no_cache else args.cache,
+                         cache_max_bytes=args.cache_max_bytes, alignment=args.alignment,
+                         segment_workers=args.segment_workers)
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The scripts import their siblings by plain name, as when run from their folders
+ROOT = Path(__file__).resolve().parent.parent
+for folder in ("gen_scripts", "metrics"):
+    sys.path.insert(0, str(ROOT / folder))
@@ -0,0 +1,63 @@
+import random
+
+from metrics import anchored_levenshtein, anchored_operations, find_anchors, levenshtein
+
+
+def mutated(rng, text, edits):
+    chars = list(text)
+    for _ in range(edits):
+        i = rng.randrange(len(chars))
+        roll = rng.random()
+        if roll < 0.3:
+            del chars[i]
+        elif roll < 0.6:
+            chars.insert(i, "#")
+        else:
+            chars[i] = "@"
+    return "".join(chars)
+
+
+def random_text(rng, words=400):
+    vocabulary = ["".join(rng.choice("abcdefghij") for _ in range(rng.randint(2, 7))) for _ in range(300)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_find_anchors_are_unique_shared_and_increasing():
+    rng = random.Random(3)
+    ref = random_text(rng)
+    hyp = mutated(rng, ref, 30)
+    n = 12
+    anchors = find_anchors(ref, hyp, n)
+    assert anchors
+    for (i, j), (next_i, next_j) in zip(anchors, anchors[1:]):
+        assert next_i >= i + n and next_j >= j + n
+    for i, j in anchors:
+        gram = ref[i:i + n]
+        assert hyp[j:j + n] == gram
+        assert ref.count(gram) == 1 and hyp.count(gram) == 1
+
+
+def test_anchored_distance_bounds_full_distance():
+    rng = random.Random(4)
+    for _ in range(5):
+        ref = random_text(rng, 150)
+        hyp = mutated(rng, ref, rng.randint(0, 25))
+        full = levenshtein(ref, hyp)
+        anchored = anchored_levenshtein(ref, hyp, 12)
+        assert anchored >= full
+        assert sum(anchored_operations(ref, hyp, 12)) == anchored
+
+
+def test_anchored_matches_full_on_identical_and_empty_texts():
+    text = random_text(random.Random(5), 100)
+    assert anchored_levenshtein(text, text, 12) == 0
+    assert anchored_operations("", text, 12) == (len(text), 0, 0)
+
+
+def test_segment_workers_give_the_serial_result():
+    rng = random.Random(6)
+    ref = random_text(rng, 300)
+    hyp = mutated(rng, ref, 40)
+    assert anchored_levenshtein(ref, hyp, 12, workers=2) == anchored_levenshtein(ref, hyp, 12)
+    assert anchored_operations(ref, hyp, 12, workers=2) == anchored_operations(ref, hyp, 12)
+
@@ -0,0 +1,33 @@
+from metrics import assess_pairs, batch_assessment
+
+
+def write_pairs(folder, count):
+    gt_dir, out_dir = folder / "ground_truth", folder / "output_files"
+    gt_dir.mkdir()
+    out_dir.mkdir()
+    pairs = []
+    for i in range(count):
+        # Sizes vary so pool chunks finish out of order
+        text = " ".join(f"word{j}" for j in range((count - i) * 40))
+        gt_file, ocr_file = gt_dir / f"ground_truth_s{i}.md", out_dir / f"s{i}.md"
+        gt_file.write_text(text, encoding="utf-8")
+        ocr_file.write_text(text.replace("word1", "w0rd1"), encoding="utf-8")
+        pairs.append((gt_file, ocr_file))
+    return pairs
+
+
+def test_assess_pairs_yields_in_input_order(tmp_path):
+    pairs = write_pairs(tmp_path, 8)
+    serial = list(assess_pairs(pairs, workers=1))
+    parallel = list(assess_pairs(pairs, workers=3))
+    assert [report["file"] for report in parallel] == [gt.name for gt, _ in pairs]
+    assert parallel == serial
+
+
+def test_batch_report_matches_a_serial_run(tmp_path):
+    pairs = write_pairs(tmp_path, 6)
+    args = (str(tmp_path / "ground_truth"), str(tmp_path / "output_files"))
+    serial = batch_assessment(*args, report_file=str(tmp_path / "serial.json"), workers=1)
+    parallel = batch_assessment(*args, report_file=str(tmp_path / "parallel.json"), workers=3)
+    assert parallel == serial
+    assert len(serial["per_file"]) == len(pairs) + 1
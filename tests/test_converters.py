@@ -0,0 +1,92 @@
+import io
+
+import converters
+from storage_backends import GCSBackend
+
+
+class FlushRefusingWriter(io.BytesIO):
+    """Behaves like a GCS BlobWriter opened without ignore_flush."""
+    def flush(self):
+        raise io.UnsupportedOperation("Cannot flush without finalizing upload.")
+
+
+def convert(extension, data):
+    out = FlushRefusingWriter()
+    converters.get_converter(extension).convert(io.BytesIO(data), out)
+    return out.getvalue().decode("utf-8")
+
+
+def test_csv_to_text_does_not_flush_its_target():
+    assert convert(".csv", b"a,bb\n1,2\n333,4\n") == "  a bb\n  1  2\n333  4"
+
+
+def test_csv_to_text_keeps_multiline_cells_on_one_line():
+    assert convert(".csv", b'a,b\n"x\ny",2\n3,4') == "   a b\nx\\ny 2\n   3 4"
+    assert convert(".csv", b'a\n"p\r\nq"\n') == "     a\np\\r\\nq"
+
+
+def test_csv_to_text_streams_across_chunks(monkeypatch):
+    monkeypatch.setattr(converters, "CSV_CHUNK_ROWS", 2)
+    text = convert(".csv", b"n\n" + b"".join(b"%d\n" % i for i in range(5)))
+    assert text.splitlines() == ["n", "0", "1", "2", "3", "4"]
+
+
+def test_html_to_text_does_not_flush_its_target():
+    html = b"<html><head><style>p{}</style></head><body><p>One  two</p><div>three</div></body></html>"
+    assert convert(".html", html) == "One two\nthree"
+
+
+def test_json_to_text_does_not_flush_its_target():
+    assert convert(".json", b'{"a": [1]}') == '{\n  "a": [\n    1\n  ]\n}'
+
+
+def test_gcs_open_write_ignores_flush(monkeypatch):
+    opened = {}
+
+    class Blob:
+        def open(self, mode, **kwargs):
+            opened.update(kwargs, mode=mode)
+            return FlushRefusingWriter()
+
+    class Bucket:
+        def blob(self, key):
+            return Blob()
+
+    monkeypatch.setattr(GCSBackend, "bucket", Bucket())
+    backend = GCSBackend.__new__(GCSBackend)
+    backend.open_write("Healthcare/txt/a.txt", content_type="text/plain")
+    assert opened["mode"] == "wb"
+    assert opened["ignore_flush"] is True
+
+
+class Immediate:
+    """A finished future, for running chunked conversions inline."""
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+    def cancel(self):
+        pass
+
+
+def test_split_csv_cuts_only_between_records():
+    data = b'id,note\n1,"two\nlines"\n2,plain\n3,"x ""quoted""\n,"\n'
+    chunks = list(converters.split_csv(io.BytesIO(data), size=4))
+    assert all(chunk.startswith(b"id,note\n") for chunk in chunks)
+    assert b"".join(chunk[len(b"id,note\n"):] for chunk in chunks) == data[len(b"id,note\n"):]
+    assert len(chunks) == 3
+
+
+def test_chunked_csv_matches_whole_file_conversion(monkeypatch):
+    monkeypatch.setattr(converters, "CHUNK_BYTES", 64)
+    data = b"name,qty,note\n" + b"".join(b'item%d,%d,"line\n%s"\n' % (i, i * 37, b"x" * (i % 7))
+                                         for i in range(200))
+    assert len(list(converters.split_csv(io.BytesIO(data)))) > 10
+    out = io.BytesIO()
+    converters.convert_in_chunks(converters.CSV_CHUNKS, io.BytesIO(data), out,
+                                 lambda fn, *args: Immediate(fn(*args)), window=2)
+    text = out.getvalue().decode("utf-8")
+    assert text == convert(".csv", data)
+    assert len(text.splitlines()) == 201
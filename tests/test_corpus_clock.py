@@ -0,0 +1,37 @@
+from datetime import date, datetime
+
+import pytest
+from faker import Faker
+
+from corpus_clock import configure_clock, now, today
+
+
+@pytest.fixture
+def reference():
+    configure_clock("2020-03-15T10:30:00")
+    yield datetime(2020, 3, 15, 10, 30)
+    configure_clock(None)
+
+
+def test_now_and_today_read_the_reference(reference):
+    assert now() == reference
+    assert today() == date(2020, 3, 15)
+
+
+def test_faker_relative_dates_follow_the_reference(reference):
+    fake = Faker()
+    fake.seed_instance(1)
+    assert fake.date_this_year().year == 2020
+    assert fake.date_this_month() <= date(2020, 3, 15)
+    assert date(2020, 3, 15) < fake.future_date() <= date(2020, 4, 14)
+    fake.seed_instance(1)
+    first = fake.date_time_this_year()
+    fake.seed_instance(1)
+    assert fake.date_time_this_year() == first
+
+
+def test_faker_still_accepts_plain_dates(reference):
+    fake = Faker()
+    picked = fake.date_between(start_date=date(2019, 1, 1), end_date=datetime(2019, 2, 1))
+    assert type(picked) is date
+    assert date(2019, 1, 1) <= picked <= date(2019, 2, 1)
@@ -0,0 +1,116 @@
+import itertools
+
+import pytest
+
+from corpus_clock import configure_clock, now
+from corpus_runner import run_cli
+from doc_random import rng
+from manifest import read_manifest
+from storage_backends import configure_storage, open_backend
+from upload_queue import get_upload_queue, queue_upload
+
+_stores = itertools.count()
+DOCUMENTS = 9
+
+
+@pytest.fixture
+def store():
+    uri = f"memory://corpus-test-{next(_stores)}"
+    yield uri, open_backend(uri)
+    configure_storage(None)
+    configure_clock(None)
+
+
+def make_jobs(built, fail_at=None):
+    def build_note(filename):
+        index = int(filename.split("_")[1].split(".")[0])
+        # Let the previous document's uploads land first, so its chunk is
+        # checkpointed before this one starts
+        get_upload_queue().join()
+        if index == fail_at:
+            raise RuntimeError(f"killed at document {index}")
+        built.append(index)
+        queue_upload(f"{filename} {rng.random()} {now().isoformat()}".encode(), f"notes/{filename}")
+    return [(build_note, f"note_{i}.txt") for i in range(DOCUMENTS)]
+
+
+def run(uri, jobs, *args):
+    return run_cli(jobs, uri, ["--storage", uri, "--workers", "1", "--chunksize", "1", *args])
+
+
+def contents(backend):
+    return {info.name: backend.read_bytes(info.name) for info in backend.list("notes/")}
+
+
+def test_resume_builds_only_the_documents_not_checkpointed(store, tmp_path):
+    uri, backend = store
+    checkpoint = str(tmp_path / "state.jsonl")
+    built = []
+    with pytest.raises(RuntimeError, match="killed at document 5"):
+        run(uri, make_jobs(built, fail_at=5), "--seed", "5", "--checkpoint", checkpoint)
+    assert built == [0, 1, 2, 3, 4]
+    # Document 4 is stored, but the run may have died before recording it
+    recorded = sorted(record["index"] for record in read_manifest(checkpoint))
+    assert recorded in ([0, 1, 2, 3], [0, 1, 2, 3, 4])
+    # A run killed mid-append leaves a torn last line
+    with open(checkpoint, "a", encoding="utf-8") as f:
+        f.write('{"index": 8, "key": "notes/no')
+
+    rebuilt = []
+    remaining = [i for i in range(DOCUMENTS) if i not in recorded]
+    assert run(uri, make_jobs(rebuilt), "--checkpoint", checkpoint) == len(remaining)
+    assert rebuilt == remaining
+    assert sorted(record["index"] for record in read_manifest(checkpoint)) == list(range(DOCUMENTS))
+
+    fresh = f"memory://corpus-test-{next(_stores)}"
+    reference = read_manifest(checkpoint)[0]["reference_time"]
+    run(fresh, make_jobs([]), "--seed", "5", "--reference", reference)
+    assert contents(backend) == contents(open_backend(fresh))
+
+
+def test_resume_rebuilds_damaged_documents(store, tmp_path):
+    uri, backend = store
+    checkpoint = str(tmp_path / "state.jsonl")
+    run(uri, make_jobs([]), "--seed", "5", "--checkpoint", checkpoint)
+    original = contents(backend)
+    backend.put("notes/note_2.txt", b"overwritten")
+
+    rebuilt = []
+    run(uri, make_jobs(rebuilt), "--checkpoint", checkpoint)
+    assert rebuilt == [2]
+    assert contents(backend) == original
+
+
+def test_resume_rejects_another_seed_or_reference(store, tmp_path):
+    uri, _ = store
+    checkpoint = str(tmp_path / "state.jsonl")
+    run(uri, make_jobs([]), "--seed", "5", "--reference", "2024-01-01T00:00:00", "--checkpoint", checkpoint)
+    with pytest.raises(ValueError, match="corpus seed"):
+        run(uri, make_jobs([]), "--seed", "6", "--checkpoint", checkpoint)
+    with pytest.raises(ValueError, match="built as of"):
+        run(uri, make_jobs([]), "--reference", "2024-02-01T00:00:00", "--checkpoint", checkpoint)
+
+
+def test_repair_rebuilds_only_the_damaged_document(store, tmp_path):
+    uri, backend = store
+    manifest = str(tmp_path / "manifest.jsonl")
+    run(uri, make_jobs([]), "--seed", "5", "--manifest", manifest)
+    md5s = {record["key"]: record["md5"] for record in read_manifest(manifest)}
+    assert len(md5s) == DOCUMENTS
+    backend.put("notes/note_3.txt", b"corrupted")
+
+    rebuilt = []
+    assert run(uri, make_jobs(rebuilt), "--manifest", manifest, "--repair") == 1
+    assert rebuilt == [3]
+    assert {info.name: info.md5_hash for info in backend.list("notes/")} == md5s
+    assert {record["key"]: record["md5"] for record in read_manifest(manifest)} == md5s
+
+
+def test_repair_rejects_another_seed_or_reference(store, tmp_path):
+    uri, _ = store
+    manifest = str(tmp_path / "manifest.jsonl")
+    run(uri, make_jobs([]), "--seed", "5", "--reference", "2024-01-01T00:00:00", "--manifest", manifest)
+    with pytest.raises(ValueError, match="corpus seed"):
+        run(uri, make_jobs([]), "--seed", "6", "--manifest", manifest, "--repair")
+    with pytest.raises(ValueError, match="built as of"):
+        run(uri, make_jobs([]), "--reference", "2024-02-01T00:00:00", "--manifest", manifest, "--repair")
@@ -0,0 +1,271 @@
+import itertools
+import json
+import sys
+import threading
+
+import pytest
+
+import converters
+import doc_organizer
+import listing_manifest
+import storage_backends
+from doc_organizer import GCSDocumentOrganizer
+
+_stores = itertools.count()
+
+
+@pytest.fixture
+def organizer():
+    return GCSDocumentOrganizer(f"memory://organizer-test-{next(_stores)}", workers=2, quiet=True)
+
+
+def test_task_errors_are_logged_and_counted(organizer, monkeypatch, capsys):
+    organizer.storage.put("Healthcare/a/report.pdf", b"%PDF-1.4")
+
+    def broken(batch):
+        raise RuntimeError("batch lost")
+    monkeypatch.setattr(organizer, "_copy_batch", broken)
+    organizer.organize_documents()
+    assert organizer.stats["errors"] == 1
+    assert "batch lost" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("quiet", [False, True])
+def test_quiet_drops_the_per_file_lines(capsys, quiet):
+    organizer = GCSDocumentOrganizer(f"memory://organizer-test-{next(_stores)}", quiet=quiet)
+    organizer.storage.put("Healthcare/a/report.pdf", b"%PDF-1.4")
+    organizer.storage.put("Healthcare/a/table.csv", b"a,b\n1,2\n")
+    organizer.organize_documents()
+    out = capsys.readouterr().out
+    assert ("Processing: Healthcare/a/report.pdf" in out) is not quiet
+    assert ("✓ Copied: Healthcare/a/report.pdf" in out) is not quiet
+    assert ("✓ Converted CSV to TXT" in out) is not quiet
+    assert "ORGANIZATION COMPLETE!" in out
+
+
+def test_listing_is_timed_per_page(organizer, monkeypatch):
+    monkeypatch.setattr(storage_backends, "LIST_PAGE_SIZE", 2)
+    for i in range(5):
+        organizer.storage.put(f"Healthcare/a/{i}.pdf", b"%PDF-1.4")
+    organizer.organize_documents()
+    operations = organizer.metrics.summary()["operations"]
+    assert operations["list"]["count"] == 3
+    assert "list_targets" not in operations
+
+
+def test_target_index_is_timed_on_its_own(monkeypatch, tmp_path):
+    organizer = GCSDocumentOrganizer(f"memory://organizer-test-{next(_stores)}", quiet=True,
+                                     manifest_path=str(tmp_path / "listing.jsonl"))
+    organizer.storage.put("Healthcare/a/report.pdf", b"%PDF-1.4")
+    organizer.storage.put("Healthcare/pdf/old.pdf", b"%PDF-1.4")
+    organizer.organize_documents()
+    operations = organizer.metrics.summary()["operations"]
+    assert operations["list"]["count"] == 1
+    assert operations["list_targets"]["count"] == 1
+
+
+def test_incremental_run_skips_unchanged_sources(monkeypatch, tmp_path):
+    uri, manifest = f"memory://organizer-test-{next(_stores)}", str(tmp_path / "listing.jsonl")
+    first = GCSDocumentOrganizer(uri, quiet=True, manifest_path=manifest)
+    first.storage.put("Healthcare/a/report.pdf", b"%PDF-1.4")
+    first.storage.put("Healthcare/a/notes.txt", b"notes")
+    first.storage.put("Healthcare/a/table.csv", b"a,b\n1,2\n")
+    first.organize_documents()
+    assert first.stats["skipped"] == 0
+
+    rerun = GCSDocumentOrganizer(uri, quiet=True, manifest_path=manifest)
+    rerun.storage.put("Healthcare/a/notes.txt", b"notes, edited")
+    rerun.organize_documents()
+    assert rerun.stats["skipped"] == 2
+    assert rerun.stats["txt_copied"] == 1
+    assert rerun.storage.read_bytes("Healthcare/txt/a_notes.txt") == b"notes, edited"
+
+
+def test_manifest_is_checkpointed_during_the_run(monkeypatch, tmp_path):
+    uri, manifest = f"memory://organizer-test-{next(_stores)}", str(tmp_path / "listing.jsonl")
+    first = GCSDocumentOrganizer(uri, quiet=True, manifest_path=manifest, batch_size=1)
+    first.manifest.checkpoint_seconds = 0
+    for i in range(3):
+        first.storage.put(f"Healthcare/a/{i}.pdf", b"%%PDF-1.4 %d" % i)
+
+    def crash():
+        raise KeyboardInterrupt
+    # The run dies before its end-of-run manifest save
+    monkeypatch.setattr(first.manifest, "save", crash)
+    with pytest.raises(KeyboardInterrupt):
+        first.organize_documents()
+
+    rerun = GCSDocumentOrganizer(uri, quiet=True, manifest_path=manifest)
+    assert len(rerun.manifest.previous) == 3
+    rerun.organize_documents()
+    assert rerun.stats["skipped"] == 3
+    assert rerun.stats["pdf_copied"] == 0
+
+
+def test_checkpoint_keeps_entries_the_run_has_not_reached(tmp_path):
+    path = str(tmp_path / "listing.jsonl")
+    store = storage_backends.open_backend(f"memory://organizer-test-{next(_stores)}")
+    a, b = store.put("Healthcare/a.pdf", b"a"), store.put("Healthcare/b.pdf", b"b")
+    done = listing_manifest.ListingManifest(path)
+    done.record(a, "Healthcare/pdf/a.pdf")
+    done.record(b, "Healthcare/pdf/b.pdf")
+    done.save()
+
+    now = [0.0]
+    rerun = listing_manifest.ListingManifest(path, checkpoint_seconds=10, clock=lambda: now[0])
+    rerun.record(a, "Healthcare/pdf/a.pdf")
+    assert rerun.previous == listing_manifest.ListingManifest(path).previous
+    now[0] = 10.0
+    b_changed = store.put("Healthcare/b.pdf", b"b2")
+    rerun.record(b_changed, "Healthcare/pdf/b.pdf")
+    assert listing_manifest.ListingManifest(path).previous["Healthcare/b.pdf"]["md5_hash"] == b_changed.md5_hash
+    rerun.entries.pop("Healthcare/b.pdf")
+    rerun.save()
+    assert set(listing_manifest.ListingManifest(path).previous) == {"Healthcare/a.pdf"}
+
+
+def test_copy_is_up_to_date_when_target_matches_without_manifest_entry(tmp_path):
+    organizer = GCSDocumentOrganizer(f"memory://organizer-test-{next(_stores)}", quiet=True,
+                                     manifest_path=str(tmp_path / "listing.jsonl"))
+    source = organizer.storage.put("Healthcare/a/report.pdf", b"%PDF-1.4")
+    target = organizer.storage.put("Healthcare/pdf/a_report.pdf", b"%PDF-1.4")
+    listed = {target.name: target}
+    assert organizer.is_up_to_date(source, 'copy', target.name, listed)
+    assert not organizer.is_up_to_date(source, 'convert', target.name, listed)
+    organizer.storage.put("Healthcare/pdf/a_report.pdf", b"%PDF-1.5")
+    assert not organizer.is_up_to_date(source, 'copy', target.name,
+                                       {target.name: organizer.storage.stat(target.name)})
+
+
+def test_target_index_keeps_only_checksums(tmp_path):
+    organizer = GCSDocumentOrganizer(f"memory://organizer-test-{next(_stores)}", quiet=True,
+                                     manifest_path=str(tmp_path / "listing.jsonl"))
+    source = organizer.storage.put("Healthcare/a/report.pdf", b"%PDF-1.4")
+    target = organizer.storage.put("Healthcare/pdf/a_report.pdf", b"%PDF-1.4")
+    organizer.storage.put("Healthcare/txt/a_notes.txt", b"notes")
+    listed = organizer.list_targets()
+    assert listed == {
+        "Healthcare/pdf/a_report.pdf": listing_manifest.Checksums(target.md5_hash, None),
+        "Healthcare/txt/a_notes.txt": listing_manifest.Checksums(storage_backends.md5_base64(b"notes"), None),
+    }
+    assert organizer.is_up_to_date(source, 'copy', target.name, listed)
+
+
+def test_identical_sources_are_converted_once(organizer):
+    for folder in ("a", "b", "c"):
+        organizer.storage.put(f"Healthcare/{folder}/table.csv", b"a,b\n1,2\n")
+    organizer.storage.put("Healthcare/d/table.csv", b"a,b\n3,4\n")
+    organizer.organize_documents()
+    assert organizer.stats["csv_converted"] == 2
+    assert organizer.stats["conversions_reused"] == 2
+    outputs = {folder: organizer.storage.read_bytes(f"Healthcare/txt/{folder}_table.txt") for folder in "abcd"}
+    assert outputs["a"] == outputs["b"] == outputs["c"] != outputs["d"]
+
+
+def test_duplicates_are_converted_individually_when_the_first_conversion_fails(organizer, monkeypatch):
+    for folder in ("a", "b", "c"):
+        organizer.storage.put(f"Healthcare/{folder}/table.csv", b"a,b\n1,2\n")
+    convert_file = organizer.convert_file
+    failed = []
+
+    def fail_first(blob, target_path, converter):
+        if not failed:
+            failed.append(blob.name)
+            return False
+        return convert_file(blob, target_path, converter)
+    monkeypatch.setattr(organizer, "convert_file", fail_first)
+    organizer.organize_documents()
+    assert organizer.stats["errors"] == 1
+    assert organizer.stats["csv_converted"] == 2
+    assert organizer.stats["conversions_reused"] == 0
+    converted = {info.name for info in organizer.storage.list("Healthcare/txt/")}
+    assert len(converted) == 2
+
+
+class RefusingPool:
+    def submit(self, fn, *args):
+        raise AssertionError(f"{fn.__name__} was sent to the process pool")
+
+
+@pytest.mark.parametrize("size_limit", [1024, 4])
+def test_io_bound_converters_run_on_the_calling_thread(organizer, monkeypatch, size_limit):
+    threads = []
+
+    def note_to_text(source, out):
+        threads.append(threading.get_ident())
+        out.write(source.read().upper())
+    monkeypatch.setitem(converters._registry, ".note",
+                        converters.Converter(".note", note_to_text, cpu_bound=False))
+    monkeypatch.setattr(doc_organizer, "CONVERT_IN_MEMORY_BYTES", size_limit)
+    source = organizer.storage.put("Healthcare/a/memo.note", b"call back")
+    organizer._convert_pool = RefusingPool()
+    assert organizer.convert_file(source, "Healthcare/txt/a_memo.txt", organizer.converter_for(source))
+    assert threads == [threading.get_ident()]
+    assert organizer.storage.read_bytes("Healthcare/txt/a_memo.txt") == b"CALL BACK"
+
+
+def test_cheap_document_converters_are_not_cpu_bound():
+    for extension in (".json", ".html", ".htm", ".docx"):
+        assert not converters.get_converter(extension).cpu_bound
+    assert converters.get_converter(".csv").cpu_bound
+    assert converters.get_converter(".json", to_pdf=True).cpu_bound
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["doc_organizer.py", *args])
+    doc_organizer.main()
+
+
+def test_dry_run_writes_the_plan_without_touching_the_store(monkeypatch, tmp_path):
+    uri = f"memory://organizer-test-{next(_stores)}"
+    store = storage_backends.open_backend(uri)
+    store.put("Healthcare/a/b/c.pdf", b"%PDF-1.4 one")
+    store.put("Healthcare/a_b/c.pdf", b"%PDF-1.4 two")
+    store.put("Healthcare/x/table.csv", b"a,b\n1,2\n")
+    store.put("Healthcare/y/table.csv", b"a,b\n1,2\n")
+    before = {info.name: info.md5_hash for info in store.list()}
+
+    plan_path = tmp_path / "plan.json"
+    run_main(monkeypatch, uri, "--quiet", "--dry-run", str(plan_path))
+    assert {info.name: info.md5_hash for info in store.list()} == before
+
+    plan = json.loads(plan_path.read_text())
+    assert plan["storage"] == uri
+    assert plan["incremental"] is False
+    summary = plan["summary"]
+    assert {key: summary[key] for key in ("listed", "copy", "convert", "reuse", "skip", "error", "collisions")} == {
+        "listed": 4, "copy": 2, "convert": 1, "reuse": 1, "skip": 0, "error": 0, "collisions": 1}
+    assert summary["bytes_copied"] == 24
+    assert summary["bytes_converted"] == 8
+
+    actions = {entry["source"]: entry for entry in plan["actions"]}
+    assert actions["Healthcare/a/b/c.pdf"] == {
+        "source": "Healthcare/a/b/c.pdf", "size": 12, "target": "Healthcare/pdf/a_b_c.pdf", "action": "copy"}
+    suffixed = actions["Healthcare/a_b/c.pdf"]["target"]
+    assert suffixed.startswith("Healthcare/pdf/a_b_c_") and suffixed.endswith(".pdf")
+    assert actions["Healthcare/x/table.csv"] == {
+        "source": "Healthcare/x/table.csv", "size": 8, "target": "Healthcare/txt/x_table.txt",
+        "converter": ".csv", "action": "convert"}
+    assert actions["Healthcare/y/table.csv"]["action"] == "reuse"
+    assert actions["Healthcare/y/table.csv"]["reuses"] == "Healthcare/txt/x_table.txt"
+    assert plan["collisions"] == [
+        {"source": "Healthcare/a_b/c.pdf", "wanted": "Healthcare/pdf/a_b_c.pdf", "target": suffixed}]
+
+
+def test_dry_run_after_an_incremental_run_plans_skips(monkeypatch, tmp_path):
+    uri, manifest = f"memory://organizer-test-{next(_stores)}", str(tmp_path / "listing.jsonl")
+    store = storage_backends.open_backend(uri)
+    store.put("Healthcare/a/report.pdf", b"%PDF-1.4")
+    store.put("Healthcare/a/table.csv", b"a,b\n1,2\n")
+    run_main(monkeypatch, uri, "--quiet", "--manifest", manifest)
+    store.put("Healthcare/a/new.pdf", b"%PDF-1.5")
+
+    plan_path = tmp_path / "plan.json"
+    run_main(monkeypatch, uri, "--quiet", "--manifest", manifest, "--dry-run", str(plan_path))
+    plan = json.loads(plan_path.read_text())
+    assert plan["incremental"] is True
+    actions = {entry["source"]: entry["action"] for entry in plan["actions"]}
+    assert actions == {"Healthcare/a/new.pdf": "copy", "Healthcare/a/report.pdf": "skip",
+                       "Healthcare/a/table.csv": "skip"}
+    assert plan["summary"]["skip"] == 2
+    assert store.stat("Healthcare/pdf/a_new.pdf") is None
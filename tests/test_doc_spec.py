@@ -0,0 +1,73 @@
+import pytest
+
+from doc_spec import SpecError, compile_spec, load_spec
+from style_registry import paragraph_style, style_stats, table_style
+
+
+def spec(*sections):
+    return {"destination": "Test/{filename}", "sections": list(sections)}
+
+
+def table(**fields):
+    return {"kind": "table", "columns": ["Code", "Qty"], "widths": [100, 50], "count": [2, 2], **fields}
+
+
+def test_registry_builds_each_style_once():
+    before = style_stats()
+    first = paragraph_style("spec-test", fontSize=7)
+    assert paragraph_style("spec-test", fontSize=7) is first
+    assert paragraph_style("spec-test", fontSize=9) is not first
+    commands = [("GRID", (0, 0), (-1, -1), 0.25, "grey")]
+    assert table_style(commands) is table_style(list(commands))
+    after = style_stats()
+    assert after["misses"] - before["misses"] == 3
+    assert after["hits"] - before["hits"] == 2
+
+
+def test_rendering_counts_plan_styles_as_reused_not_hits():
+    plan = compile_spec(spec({"kind": "title", "text": "Report"}, table(row=lambda: ["A-1", 3])))
+    assert plan.style_lookups > 0
+    before = style_stats()
+    plan.render()
+    after = style_stats()
+    assert after["reused"] - before["reused"] == plan.style_lookups
+    assert after["hits"] == before["hits"]
+    assert after["misses"] == before["misses"]
+
+
+def test_unknown_section_kind_is_rejected():
+    with pytest.raises(SpecError, match="Unknown section kind: 'chart'"):
+        compile_spec(spec({"kind": "chart"}))
+
+
+def test_unknown_color_is_rejected():
+    with pytest.raises(SpecError, match="Unknown color: mauvish"):
+        compile_spec(spec(table(row=lambda: ["A-1", 3], header_background="mauvish")))
+
+
+def test_generators_resolve_by_name():
+    rows = []
+
+    def item():
+        rows.append(None)
+        return ["A-1", 3]
+    compile_spec(spec(table(row="item")), {"item": item}).render()
+    assert len(rows) == 2
+    with pytest.raises(SpecError, match="Cannot resolve generator: 'missing'"):
+        compile_spec(spec(table(row="missing")), {"item": item})
+
+
+def test_load_spec_compiles_a_yaml_file(tmp_path):
+    path = tmp_path / "note.yaml"
+    path.write_text(
+        "destination: Notes/{filename}\n"
+        "margins: [40, 40, 40, 30]\n"
+        "sections:\n"
+        "  - {kind: title, text: Note}\n"
+        "  - {kind: paragraph, generate: body}\n",
+        encoding="utf-8",
+    )
+    plan = load_spec(str(path), {"body": lambda: "Checked and stored."})
+    assert plan.destination == "Notes/{filename}"
+    assert plan.margins == {"rightMargin": 40, "leftMargin": 40, "topMargin": 40, "bottomMargin": 30}
+    assert plan.render().getvalue().startswith(b"%PDF")
@@ -0,0 +1,100 @@
+import random
+from array import array
+
+import pytest
+
+from metrics import OCRQualityAssessor, edit_operations, error_rate, levenshtein, tokenize
+
+
+def naive_levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        previous, row[0] = row[:], i
+        for j, y in enumerate(b, 1):
+            row[j] = min(previous[j - 1] + (x != y), previous[j] + 1, row[j - 1] + 1)
+    return row[-1]
+
+
+def random_pairs(make, count, max_length, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (make(rng, rng.randint(0, max_length)), make(rng, rng.randint(0, max_length)))
+
+
+def random_string(rng, n):
+    return "".join(rng.choice("abc ") for _ in range(n))
+
+
+def random_codes(rng, n):
+    return array("I", (rng.randrange(4) for _ in range(n)))
+
+
+@pytest.mark.parametrize("make", [random_string, random_codes])
+def test_levenshtein_matches_naive_dp(make):
+    for a, b in random_pairs(make, 500, 40, seed=1):
+        assert levenshtein(a, b) == naive_levenshtein(a, b)
+
+
+@pytest.mark.parametrize("make", [random_string, random_codes])
+def test_edit_operations_sum_to_distance_and_lengths(make):
+    # Long enough that the Hirschberg split runs, not just the plain DP
+    for a, b in random_pairs(make, 60, 150, seed=2):
+        ins, dels, subs = edit_operations(a, b)
+        assert ins + dels + subs == naive_levenshtein(a, b)
+        assert len(a) - dels + ins == len(b)
+
+
+def test_edge_cases():
+    assert levenshtein("", "") == 0
+    assert levenshtein("abc", "") == 3
+    assert edit_operations("", "ab") == (2, 0, 0)
+    assert edit_operations("ab", "") == (0, 2, 0)
+    assert edit_operations("kitten", "sitting") == (1, 0, 2)
+    assert levenshtein("x" * 200, "x" * 200) == 0
+
+
+def random_document(rng):
+    words = ["Alpha", "beta", "GAMMA", "delta", "beta"]
+    lines = []
+    for _ in range(rng.randint(0, 8)):
+        gaps = [rng.choice([" ", "  ", "\t", " \t "]) for _ in range(5)]
+        lines.append(rng.choice(["", "  "]) + "".join(rng.choice(words) + gap for gap in gaps[:rng.randint(0, 5)]))
+    return "\n".join(lines)
+
+
+def test_tokenize_interns_words_and_lines_across_the_pair():
+    vocabulary = {}
+    gt = tokenize("Total  due\n\nAmount Due", vocabulary)
+    ext = tokenize("amount due\ntotal\tdue ", vocabulary)
+    codes = vocabulary
+    assert list(gt.words) == [codes["total"], codes["due"], codes["amount"], codes["due"]]
+    assert list(ext.words) == [codes["amount"], codes["due"], codes["total"], codes["due"]]
+    assert list(gt.lines) == [codes["total due"], codes["amount due"]]
+    assert list(ext.lines) == [codes["amount due"], codes["total due"]]
+    assert len(set(vocabulary.values())) == len(vocabulary)
+
+
+def test_tokenized_metrics_match_the_string_metrics(tmp_path):
+    assessor = OCRQualityAssessor()
+    rng = random.Random(3)
+    for i in range(100):
+        gt, ext = random_document(rng), random_document(rng)
+        gt_tokens, ext_tokens = assessor.tokenize_pair(gt, ext)
+        assert gt_tokens.chars == assessor.normalize_text(gt)
+        assert ext_tokens.chars == assessor.normalize_text(ext)
+
+        gt_file, ocr_file = tmp_path / f"gt{i}.md", tmp_path / f"ocr{i}.md"
+        gt_file.write_text(gt, encoding="utf-8")
+        ocr_file.write_text(ext, encoding="utf-8")
+        result = assessor.assess_pair(str(gt_file), str(ocr_file))
+        gt, ext = gt.strip(), ext.strip()  # as load_file reads them
+        assert result["word_error_rate"] == assessor.calculate_word_accuracy(gt, ext)[1]
+        assert result["line_error_rate"] == assessor.calculate_line_accuracy(gt, ext)[1]
+        assert result["character_error_rate"] == assessor.calculate_character_accuracy(gt, ext)[1]
+
+        # The metrics as computed over strings before tokenization
+        gt_words, ext_words = assessor.normalize_text(gt).split(), assessor.normalize_text(ext).split()
+        gt_lines = [assessor.normalize_text(line) for line in gt.splitlines() if line.strip()]
+        ext_lines = [assessor.normalize_text(line) for line in ext.splitlines() if line.strip()]
+        assert result["word_error_rate"] == error_rate(levenshtein(gt_words, ext_words), len(gt_words))
+        assert result["line_error_rate"] == error_rate(levenshtein(gt_lines, ext_lines), len(gt_lines))
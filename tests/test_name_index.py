@@ -0,0 +1,52 @@
+import json
+
+from name_index import NameIndex, is_variant, suffixed
+
+
+def test_first_source_keeps_the_flat_name():
+    names = NameIndex()
+    first = names.reserve("Healthcare/a/b_c.pdf", "Healthcare/pdf/a_b_c.pdf")
+    second = names.reserve("Healthcare/a_b/c.pdf", "Healthcare/pdf/a_b_c.pdf")
+    assert first == "Healthcare/pdf/a_b_c.pdf"
+    assert second == suffixed("Healthcare/pdf/a_b_c.pdf", "Healthcare/a_b/c.pdf")
+    assert second.endswith(".pdf") and second != first
+    assert names.collisions == [{"source": "Healthcare/a_b/c.pdf", "wanted": first, "target": second}]
+
+
+def test_reserve_is_idempotent_per_source():
+    names = NameIndex()
+    names.reserve("x", "pdf/t.pdf")
+    target = names.reserve("y", "pdf/t.pdf")
+    assert names.reserve("y", "pdf/t.pdf") == target
+    assert len(names.collisions) == 1
+
+
+def test_suffix_grows_when_the_suffixed_name_is_taken():
+    names = NameIndex()
+    names.reserve("x", "pdf/t.pdf")
+    names.reserve("squatter", suffixed("pdf/t.pdf", "y"))
+    target = names.reserve("y", "pdf/t.pdf")
+    assert target == suffixed("pdf/t.pdf", "y", 12)
+    assert is_variant(target, "pdf/t.pdf", "y")
+
+
+def test_saved_names_are_stable_across_runs(tmp_path):
+    path = tmp_path / "names.json"
+    names = NameIndex(str(path))
+    names.reserve("x", "pdf/t.pdf")
+    target = names.reserve("y", "pdf/t.pdf")
+    names.save()
+    assert json.loads(path.read_text())["y"] == target
+
+    # Listed in the other order next time, y still keeps its suffixed name
+    rerun = NameIndex(str(path))
+    assert rerun.reserve("y", "pdf/t.pdf") == target
+    assert rerun.reserve("x", "pdf/t.pdf") == "pdf/t.pdf"
+
+
+def test_seed_does_not_override_saved_names():
+    names = NameIndex()
+    names.reserve("x", "pdf/t.pdf")
+    names.seed({"x": "pdf/other.pdf", "z": "pdf/z.pdf"})
+    assert names.targets["x"] == "pdf/t.pdf"
+    assert names.reserve("z", "pdf/z.pdf") == "pdf/z.pdf"
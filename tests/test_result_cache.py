@@ -0,0 +1,46 @@
+import metrics
+from metrics import ResultCache
+
+
+def write_pair(folder, gt, ocr):
+    gt_file, ocr_file = folder / "ground_truth_a.md", folder / "a.md"
+    gt_file.write_text(gt, encoding="utf-8")
+    ocr_file.write_text(ocr, encoding="utf-8")
+    return gt_file, ocr_file
+
+
+def test_key_changes_with_either_file_the_version_and_alignment(tmp_path, monkeypatch):
+    pair = write_pair(tmp_path, "ground truth", "ocr text")
+    key = ResultCache.key(*pair)
+    assert ResultCache.key(*pair) == key
+    assert ResultCache.key(*pair, "anchored") != key
+    pair[1].write_text("ocr text, corrected", encoding="utf-8")
+    changed = ResultCache.key(*pair)
+    assert changed != key
+    pair[0].write_text("ground truth, revised", encoding="utf-8")
+    revised = ResultCache.key(*pair)
+    assert revised != changed
+    monkeypatch.setattr(metrics, "METRICS_VERSION", metrics.METRICS_VERSION + 1)
+    assert ResultCache.key(*pair) != revised
+
+
+def test_saved_entries_are_reloaded(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = ResultCache(path)
+    cache.put("k", {"character_accuracy": 99.0})
+    cache.save()
+    reloaded = ResultCache(path)
+    assert reloaded.get("k") == {"character_accuracy": 99.0}
+    assert reloaded.get("missing") is None
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+
+def test_save_evicts_least_recently_used_entries(tmp_path):
+    path = tmp_path / "cache.json"
+    entry = len('{"a": {"v": 1}}')
+    cache = ResultCache(path, max_bytes=entry * 2)
+    for key in "abc":
+        cache.put(key, {"v": 1})
+    cache.get("a")
+    cache.save()
+    assert list(ResultCache(path).entries) == ["c", "a"]
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+import requests
+from google.api_core import exceptions as gcs_errors
+from pandas.errors import EmptyDataError
+
+from retry import call_with_retry
+
+
+def failing(*errors):
+    calls = []
+
+    def fn():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "done"
+    return fn, calls
+
+
+@pytest.mark.parametrize("error", [
+    gcs_errors.TooManyRequests("slow down"),
+    gcs_errors.ServiceUnavailable("try later"),
+    gcs_errors.InternalServerError("oops"),
+    requests.ConnectionError("reset"),
+    requests.Timeout("timed out"),
+])
+def test_transient_errors_are_retried(error):
+    fn, calls = failing(error, error)
+    assert call_with_retry(fn, label="test", backoff=0) == "done"
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("error", [
+    gcs_errors.NotFound("gone"),
+    FileNotFoundError("gone"),
+    NotADirectoryError("not a dir"),
+    EmptyDataError("no columns"),
+])
+def test_permanent_errors_fail_at_once(error):
+    fn, calls = failing(error)
+    with pytest.raises(type(error)):
+        call_with_retry(fn, label="test", backoff=0)
+    assert len(calls) == 1
+
+
+def test_last_transient_error_is_raised():
+    error = gcs_errors.ServiceUnavailable("down")
+    fn, calls = failing(*[error] * 3)
+    with pytest.raises(gcs_errors.ServiceUnavailable):
+        call_with_retry(fn, label="test", attempts=3, backoff=0)
+    assert len(calls) == 3
+
+
+def test_backoff_jitter_leaves_the_global_random_state_alone():
+    random.seed(1)
+    state = random.getstate()
+    fn, calls = failing(ConnectionError("reset"))
+    assert call_with_retry(fn, label="test", backoff=0) == "done"
+    assert random.getstate() == state
@@ -0,0 +1,90 @@
+import json
+
+from run_metrics import BUCKET_BOUNDS, MB, LatencyHistogram, RunMetrics
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_histogram_buckets_double_from_one_millisecond():
+    histogram = LatencyHistogram()
+    for seconds in (0.0005, 0.001, 0.0011, 0.002, 0.003, 1000.0):
+        histogram.add(seconds)
+    assert histogram.summary()["buckets"] == {"le_0.001": 2, "le_0.002": 2, "le_0.004": 1, "inf": 1}
+    assert BUCKET_BOUNDS[1] == 2 * BUCKET_BOUNDS[0]
+
+
+def test_histogram_percentiles_are_bucket_upper_bounds():
+    histogram = LatencyHistogram()
+    for _ in range(9):
+        histogram.add(0.0015)
+    histogram.add(0.05, nbytes=10)
+    summary = histogram.summary()
+    assert summary["p50_seconds"] == 0.002
+    assert summary["p90_seconds"] == 0.002
+    assert summary["p99_seconds"] == 0.05  # capped at the slowest sample
+    assert summary["max_seconds"] == 0.05
+    assert summary["bytes"] == 10
+    assert LatencyHistogram().percentile(0.5) == 0.0
+
+
+def test_throughput_is_averaged_over_the_rolling_window():
+    clock = Clock()
+    metrics = RunMetrics(progress_seconds=1000, window_seconds=10, clock=clock)
+    metrics.start()
+    clock.now += 20
+    for _ in range(4):
+        metrics.file_done(MB)  # outside the window by the time of the snapshot
+    clock.now += 15
+    for _ in range(5):
+        metrics.file_done(2 * MB)
+    snapshot = metrics._snapshot(clock.now, "progress")
+    assert snapshot["files"] == 9
+    assert snapshot["bytes"] == 14 * MB
+    assert snapshot["files_per_second"] == 0.5
+    assert snapshot["mb_per_second"] == 1.0
+
+
+def test_progress_line_is_rate_limited(capsys):
+    clock = Clock()
+    metrics = RunMetrics(progress_seconds=5, window_seconds=10, clock=clock)
+    metrics.start()
+    metrics.file_done(MB)
+    assert capsys.readouterr().out == ""
+    clock.now += 5
+    metrics.file_done(MB)
+    assert capsys.readouterr().out.startswith("… 2 files, 0.4 files/s, 0.40 MB/s, 0 errors")
+    clock.now += 4.9
+    metrics.file_done(MB)
+    assert capsys.readouterr().out == ""
+    clock.now += 0.1
+    metrics.file_done(MB)
+    assert capsys.readouterr().out.startswith("… 4 files")
+
+
+def test_snapshots_are_exported_as_json_lines(tmp_path, capsys):
+    clock = Clock()
+    path = tmp_path / "metrics.jsonl"
+    metrics = RunMetrics(str(path), progress_seconds=5, clock=clock)
+    metrics.start()
+    metrics.count("pdf_copied")
+    metrics.observe("copy", 0.003, nbytes=MB)
+    clock.now += 5
+    metrics.file_done(MB)
+    clock.now += 5
+    summary = metrics.finish()
+
+    progress, final = [json.loads(line) for line in path.read_text().splitlines()]
+    assert progress == {"type": "progress", "elapsed_seconds": 5.0, "files": 1, "bytes": MB,
+                        "files_per_second": 0.2, "mb_per_second": 0.2, "counters": {"pdf_copied": 1}}
+    assert final == summary
+    assert final["type"] == "summary"
+    assert final["elapsed_seconds"] == 10.0
+    assert final["files_per_second"] == 0.1
+    assert set(final["operations"]) == {"copy"}
+    assert final["operations"]["copy"]["buckets"] == {"le_0.004": 1}
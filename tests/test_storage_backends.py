@@ -0,0 +1,51 @@
+import pytest
+
+import storage_backends
+from storage_backends import LocalBackend, MemoryBackend, md5_base64
+
+
+@pytest.fixture(params=["local", "memory"])
+def backend(request, tmp_path):
+    return LocalBackend(tmp_path) if request.param == "local" else MemoryBackend("test")
+
+
+def test_open_write_stores_on_close(backend):
+    with backend.open_write("out/a.txt") as out:
+        out.write(b"hello")
+    assert backend.read_bytes("out/a.txt") == b"hello"
+    assert [info.name for info in backend.list("out/")] == ["out/a.txt"]
+
+
+def test_failed_open_write_leaves_no_target(backend):
+    with pytest.raises(RuntimeError):
+        with backend.open_write("out/a.txt") as out:
+            out.write(b"trunc")
+            raise RuntimeError("conversion failed")
+    assert backend.stat("out/a.txt") is None
+    assert list(backend.list("out/")) == []
+
+
+def test_local_listing_reuses_digests_until_a_file_changes(tmp_path, monkeypatch):
+    backend = LocalBackend(tmp_path)
+    backend.put("a.bin", b"one")
+    reads = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        reads.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    assert [info.md5_hash for info in backend.list()] == [md5_base64(b"one")]
+    assert reads == []
+
+    (tmp_path / "a.bin").write_bytes(b"changed")
+    assert [info.md5_hash for info in backend.list()] == [md5_base64(b"changed")]
+
+
+def test_list_pages_splits_the_listing(backend, monkeypatch):
+    monkeypatch.setattr(storage_backends, "LIST_PAGE_SIZE", 2)
+    for name in "abcde":
+        backend.put(f"out/{name}.txt", name.encode())
+    pages = [[info.name for info in page] for page in backend.list_pages("out/")]
+    assert pages == [["out/a.txt", "out/b.txt"], ["out/c.txt", "out/d.txt"], ["out/e.txt"]]
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from corpus_clock import configure_clock
+from corpus_runner import run_corpus
+from storage_backends import MemoryBackend, ObjectInfo, configure_storage
+from upload_queue import UploadError, UploadGroup, UploadQueue, queue_upload
+
+
+class Gate:
+    """An upload that waits until the test opens the gate."""
+    def __init__(self):
+        self.opened = threading.Event()
+        self.started = []
+
+    def __call__(self, source, key):
+        self.started.append(key)
+        assert self.opened.wait(5)
+        return ObjectInfo(name=key, size=len(source))
+
+
+def test_submit_blocks_once_max_pending_uploads_wait():
+    gate = Gate()
+    with UploadQueue(upload=gate, threads=1, max_pending=2) as uploads:
+        uploads.submit(b"0", "a/0")
+        while not gate.started:  # the uploader holds the first one
+            time.sleep(0.01)
+        uploads.submit(b"1", "a/1")
+        uploads.submit(b"2", "a/2")
+        blocked = threading.Thread(target=uploads.submit, args=(b"3", "a/3"))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+        gate.opened.set()
+        blocked.join(5)
+        assert not blocked.is_alive()
+    assert gate.started == ["a/0", "a/1", "a/2", "a/3"]
+
+
+def test_only_transient_errors_are_retried():
+    calls = {"a/flaky": 0, "a/broken": 0}
+
+    def upload(source, key):
+        calls[key] += 1
+        if key == "a/broken":
+            raise ValueError("bad object")
+        if calls[key] == 1:
+            raise ConnectionError("reset")
+        return ObjectInfo(name=key)
+
+    uploads = UploadQueue(upload=upload, threads=1, backoff=0)
+    uploads.submit(b"", "a/flaky")
+    uploads.submit(b"", "a/broken")
+    with pytest.raises(UploadError, match="1 upload\\(s\\) failed: a/broken"):
+        uploads.close()
+    assert calls == {"a/flaky": 2, "a/broken": 1}
+
+
+def test_group_reports_after_its_last_upload_once_closed():
+    gate = Gate()
+    done = []
+    with UploadQueue(upload=gate, threads=2) as uploads:
+        group = UploadGroup(lambda records, failures: done.append((records, failures)))
+        for index in (1, 0):
+            uploads.submit(b"pdf", f"a/{index}", {"index": index}, group)
+        group.close()
+        assert done == []
+        gate.opened.set()
+    assert len(done) == 1
+    records, failures = done[0]
+    assert [(record["index"], record["key"]) for record in records] == [(0, "a/0"), (1, "a/1")]
+    assert failures == []
+
+
+def test_empty_group_reports_on_close():
+    done = []
+    UploadGroup(lambda records, failures: done.append((records, failures))).close()
+    assert done == [([], [])]
+
+
+def build_with_a_bad_upload(filename):
+    queue_upload(b"fine", f"notes/{filename}")
+    queue_upload(b"refused", f"bad/{filename}")
+
+
+def test_failed_group_upload_fails_the_run(monkeypatch):
+    put = MemoryBackend.put
+
+    def refuse_bad_keys(self, key, source, content_type=None):
+        if key.startswith("bad/"):
+            raise ValueError("refused")
+        return put(self, key, source, content_type)
+    monkeypatch.setattr(MemoryBackend, "put", refuse_bad_keys)
+    try:
+        with pytest.raises(UploadError, match="1 upload\\(s\\) failed: bad/note.txt"):
+            run_corpus([(build_with_a_bad_upload, "note.txt")], "memory://upload-queue-test", workers=1, seed=1)
+    finally:
+        configure_storage(None)
+        configure_clock(None)